@@ -3,6 +3,7 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from backend.shared.auth import get_current_customer
+from backend.shared.utils.http_cache import ConditionalGet, http_cache, items_version, row_version
 from schemas.customer import CustomerProductResponse, CustomerProductListResponse
 from services.customer_service import CustomerService
 
@@ -11,7 +12,8 @@ router = APIRouter(prefix="/customers", tags=["customers"])
 
 @router.get("/my-items", response_model=CustomerProductListResponse)
 async def get_my_items(
-    current_customer: dict = Depends(get_current_customer)
+    current_customer: dict = Depends(get_current_customer),
+    cache: ConditionalGet = Depends(http_cache("private, no-cache"))
 ):
     """Get products associated with the current customer."""
     customer_id = current_customer["user_id"]
@@ -19,12 +21,14 @@ async def get_my_items(
     
     try:
         products = await service.get_customer_products(customer_id)
+        if cache.is_fresh(items_version(products, customer_id)):
+            return cache.not_modified()
         
-        return CustomerProductListResponse(
+        return cache.respond(CustomerProductListResponse(
             items=products,
             total=len(products),
             customer_id=customer_id
-        )
+        ))
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -37,7 +41,8 @@ async def get_my_items(
 @router.get("/my-items/{product_id}", response_model=CustomerProductResponse)
 async def get_my_item(
     product_id: int,
-    current_customer: dict = Depends(get_current_customer)
+    current_customer: dict = Depends(get_current_customer),
+    cache: ConditionalGet = Depends(http_cache("private, no-cache"))
 ):
     """Get specific product details for the current customer."""
     customer_id = current_customer["user_id"]
@@ -45,7 +50,9 @@ async def get_my_item(
     
     try:
         product = await service.get_customer_product_details(customer_id, product_id)
-        return product
+        if cache.is_fresh(row_version(product, customer_id)):
+            return cache.not_modified()
+        return cache.respond(product)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -60,7 +67,8 @@ async def search_my_items(
     name: Optional[str] = Query(None, description="Search by product name"),
     category: Optional[str] = Query(None, description="Filter by category"),
     brand: Optional[str] = Query(None, description="Filter by brand"),
-    current_customer: dict = Depends(get_current_customer)
+    current_customer: dict = Depends(get_current_customer),
+    cache: ConditionalGet = Depends(http_cache("private, no-cache"))
 ):
     """Search products for the current customer."""
     customer_id = current_customer["user_id"]
@@ -73,12 +81,14 @@ async def search_my_items(
             category=category,
             brand=brand
         )
+        if cache.is_fresh(items_version(products, customer_id)):
+            return cache.not_modified()
         
-        return CustomerProductListResponse(
+        return cache.respond(CustomerProductListResponse(
             items=products,
             total=len(products),
             customer_id=customer_id
-        )
+        ))
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -19,9 +19,10 @@ class CustomerService:
             # Call inventory service to get customer products
             response = await self.inventory_client.get(f"/api/v1/items/customer/{customer_id}")
             
-            # Convert response to our schema
+            # Convert response to our schema; the endpoint returns a bare list
+            items = response if isinstance(response, list) else response.get("items", [])
             products = []
-            for item in response.get("items", []):
+            for item in items:
                 products.append(CustomerProductResponse(**item))
             
             return products
@@ -1,10 +1,13 @@
 """Items API endpoints."""
 
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from backend.shared.database import get_db
+from backend.shared.utils.fieldsets import parse_fields
+from backend.shared.utils.http_cache import ConditionalGet, http_cache, row_version
+from backend.shared.utils.serialization import list_response
 from schemas.product import (
     ProductCreate,
     ProductUpdate,
@@ -40,9 +43,16 @@ async def get_items(
     max_quantity: int = Query(None, gt=0, description="Maximum quantity"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name,sku,price,quantity"),
+    db: Session = Depends(get_db),
+    cache: ConditionalGet = Depends(http_cache("public, no-cache"))
 ):
-    """Get items with filtering and pagination."""
+    """Get items with filtering and pagination.
+    
+    Answers 304 from the list's version alone when the client's copy is
+    current.
+    """
+    selected = parse_fields(fields, ProductResponse)
     filters = ProductFilter(
         name=name,
         category=category,
@@ -58,27 +68,36 @@ async def get_items(
     )
     
     service = ProductService(db)
-    products, total = service.get_products(filters)
+    total, version = service.get_products_version(filters)
+    if cache.is_fresh(version):
+        return cache.not_modified()
+    products = service.get_products_page(filters, fields=selected)
     
     pages = (total + size - 1) // size
     
-    return ProductListResponse(
-        items=products,
+    return cache.respond(list_response(
+        ProductListResponse,
+        products,
         total=total,
         page=page,
         size=size,
-        pages=pages
-    )
+        pages=pages,
+        fields=selected
+    ))
 
 
 @router.get("/{item_id}", response_model=ProductResponse)
 async def get_item(
     item_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    cache: ConditionalGet = Depends(http_cache("public, no-cache"))
 ):
     """Get item by ID."""
     service = ProductService(db)
-    return service.get_product(item_id)
+    product = service.get_product(item_id)
+    if cache.is_fresh(row_version(product)):
+        return cache.not_modified()
+    return cache.respond(product)
 
 
 @router.put("/{item_id}", response_model=ProductResponse)
@@ -105,11 +124,14 @@ async def delete_item(
 @router.get("/customer/{customer_id}", response_model=List[ProductResponse])
 async def get_customer_items(
     customer_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    cache: ConditionalGet = Depends(http_cache("private, no-cache"))
 ):
     """Get items associated with a customer."""
     service = ProductService(db)
-    return service.get_products_by_customer(customer_id)
+    if cache.is_fresh(service.get_products_by_customer_version(customer_id)):
+        return cache.not_modified()
+    return cache.respond(service.get_products_by_customer(customer_id))
 
 
 @router.patch("/{item_id}/quantity")
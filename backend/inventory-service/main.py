@@ -5,8 +5,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
+from backend.shared.compression import setup_compression
 from backend.shared.config import settings
-from backend.shared.database import create_tables
+from backend.shared.monitoring import setup_metrics
+from backend.shared.tracing import setup_tracing
+from backend.shared.profiling import setup_profiling
+from backend.shared.database import create_tables, QueryStatsMiddleware
 from app.api.v1 import api_router
 
 # Configure logging
@@ -45,6 +49,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses with zstd, brotli or gzip, as the client accepts
+setup_compression(app)
+
+# Count queries per request, flagging slow and repeated ones
+app.add_middleware(QueryStatsMiddleware)
+
+# Expose Prometheus metrics at /metrics
+setup_metrics(app)
+
+# Trace requests, calls to other services and SQL statements
+setup_tracing(app)
+
+# Admin-only profiling of live workers at /debug/profile, or on SIGUSR2
+setup_profiling(app)
+
 # Include API routes
 app.include_router(api_router)
 
@@ -1,7 +1,7 @@
 """Product schemas for validation and serialization."""
 
 from typing import Optional, List
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 from datetime import datetime
 
 
@@ -23,10 +23,11 @@ class ProductBase(BaseModel):
     dimensions: Optional[str] = Field(None, max_length=100, description="Product dimensions")
     customer_id: Optional[str] = Field(None, max_length=100, description="Associated customer ID")
     
-    @validator('max_quantity')
-    def validate_max_quantity(cls, v, values):
+    @field_validator('max_quantity')
+    @classmethod
+    def validate_max_quantity(cls, v, info: ValidationInfo):
         """Validate max_quantity is greater than min_quantity."""
-        if v is not None and 'min_quantity' in values and v <= values['min_quantity']:
+        if v is not None and 'min_quantity' in info.data and v <= info.data['min_quantity']:
             raise ValueError('max_quantity must be greater than min_quantity')
         return v
 
@@ -62,8 +63,7 @@ class ProductResponse(ProductBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProductFilter(BaseModel):
@@ -81,10 +81,12 @@ class ProductFilter(BaseModel):
     page: int = Field(1, ge=1)
     size: int = Field(10, ge=1, le=100)
     
-    @validator('max_price')
-    def validate_max_price(cls, v, values):
+    @field_validator('max_price')
+    @classmethod
+    def validate_max_price(cls, v, info: ValidationInfo):
         """Validate max_price is greater than min_price."""
-        if v is not None and 'min_price' in values and values['min_price'] is not None and v <= values['min_price']:
+        min_price = info.data.get('min_price')
+        if v is not None and min_price is not None and v <= min_price:
             raise ValueError('max_price must be greater than min_price')
         return v
 
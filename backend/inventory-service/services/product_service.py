@@ -1,10 +1,12 @@
 """Product service business logic."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 from fastapi import HTTPException, status
 
+from backend.shared.utils.fieldsets import load_only_fields
+from backend.shared.utils.http_cache import Version, query_version
 from models.product import Product
 from schemas.product import ProductCreate, ProductUpdate, ProductFilter
 
@@ -26,7 +28,7 @@ class ProductService:
             )
         
         # Create new product
-        product = Product(**product_data.dict())
+        product = Product(**product_data.model_dump())
         self.db.add(product)
         self.db.commit()
         self.db.refresh(product)
@@ -42,8 +44,23 @@ class ProductService:
             )
         return product
     
-    def get_products(self, filters: ProductFilter) -> Tuple[List[Product], int]:
-        """Get products with filtering and pagination."""
+    def get_products_page(self, filters: ProductFilter, fields: Optional[Sequence[str]] = None) -> List[Product]:
+        """Get one page of products, without counting them."""
+        return self._page(self._filter_products(filters), filters, fields)
+    
+    def get_products_version(self, filters: ProductFilter) -> Tuple[int, Version]:
+        """Get the total and version of the filtered products in one aggregate query."""
+        return query_version(self._filter_products(filters), Product)
+    
+    def _page(self, query, filters: ProductFilter, fields: Optional[Sequence[str]]) -> List[Product]:
+        """Load one page of a filtered product query."""
+        if fields:
+            query = query.options(load_only_fields(Product, fields))
+        offset = (filters.page - 1) * filters.size
+        return query.offset(offset).limit(filters.size).all()
+    
+    def _filter_products(self, filters: ProductFilter):
+        """Build the product query for filters."""
         query = self.db.query(Product)
         
         # Apply filters
@@ -74,14 +91,7 @@ class ProductService:
         if filters.max_quantity is not None:
             query = query.filter(Product.quantity <= filters.max_quantity)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (filters.page - 1) * filters.size
-        products = query.offset(offset).limit(filters.size).all()
-        
-        return products, total
+        return query
     
     def update_product(self, product_id: int, product_data: ProductUpdate) -> Product:
         """Update product."""
@@ -99,7 +109,7 @@ class ProductService:
                 )
         
         # Update fields
-        update_data = product_data.dict(exclude_unset=True)
+        update_data = product_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(product, field, value)
         
@@ -116,9 +126,17 @@ class ProductService:
     
     def get_products_by_customer(self, customer_id: str) -> List[Product]:
         """Get products associated with a customer."""
+        return self._customer_products(customer_id).all()
+    
+    def get_products_by_customer_version(self, customer_id: str) -> Version:
+        """Get the version of a customer's product list."""
+        return query_version(self._customer_products(customer_id), Product)[1]
+    
+    def _customer_products(self, customer_id: str):
+        """Build the query for a customer's active products."""
         return self.db.query(Product).filter(
             and_(Product.customer_id == customer_id, Product.is_active == True)
-        ).all()
+        )
     
     def update_quantity(self, product_id: int, quantity_change: int) -> Product:
         """Update product quantity."""
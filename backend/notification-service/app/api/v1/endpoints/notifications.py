@@ -1,19 +1,32 @@
 """Notification API endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from backend.shared.database import get_db
 from backend.shared.auth import get_current_user
+from backend.shared.config import settings
+from backend.shared.utils.fieldsets import parse_fields
+from backend.shared.utils.pagination import next_cursor
+from backend.shared.utils.serialization import list_response
 from schemas.notification import (
     NotificationCreate, 
+    SystemNotificationCreate,
     NotificationUpdate, 
     NotificationResponse, 
     NotificationListResponse,
-    NotificationFilters
+    NotificationFilters,
+    NotificationBatchRequest,
+    NotificationPurgeRequest
 )
+from services.broker import get_broker
+from services.fanout import get_fanout_job
 from services.notification_service import NotificationService
+from services.retention import get_retention_stats
+from services.stream import notification_stream, parse_last_event_id
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
@@ -38,21 +51,90 @@ async def create_notification(
     return notification
 
 
+@router.post("/system", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+async def create_system_notification(
+    notification_data: SystemNotificationCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Send a notification to every active user."""
+    if current_user["role"] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    notification_service = NotificationService(db)
+    job = notification_service.create_system_notification(
+        title=notification_data.title,
+        message=notification_data.message,
+        notification_type=notification_data.type
+    )
+    
+    return job.to_dict()
+
+
+@router.get("/system/jobs/{job_id}", response_model=dict)
+async def get_system_notification_job(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get the progress of a system notification fan-out."""
+    if current_user["role"] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    job = get_fanout_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Fan-out job not found"
+        )
+    
+    return job.to_dict()
+
+
+@router.get("/retention/stats", response_model=dict)
+async def get_notification_retention_stats(
+    current_user: dict = Depends(get_current_user)
+):
+    """Get the retention policy and how much the purger has removed."""
+    if current_user["role"] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    
+    return get_retention_stats()
+
+
 @router.get("/", response_model=NotificationListResponse)
 async def get_notifications(
     user_id: int = Query(None, description="Filter by user ID (admin only)"),
     type: str = Query(None, description="Filter by notification type"),
     is_read: bool = Query(None, description="Filter by read status"),
-    page: int = Query(1, ge=1, description="Page number"),
+    since: Optional[datetime] = Query(None, description="Only notifications created after this time"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    page: int = Query(1, ge=1, description="Page number (ignored with cursor or since)"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,is_read,created_at"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
 ):
-    """Get notifications."""
+    """Get notifications, newest first.
+    
+    Page through with next_cursor rather than page numbers; keyset pages
+    skip counting the total.
+    """
+    selected = parse_fields(fields, NotificationResponse)
     filters = NotificationFilters(
         user_id=user_id,
         type=type,
         is_read=is_read,
+        since=since,
+        cursor=cursor,
         page=page,
         size=size
     )
@@ -61,23 +143,96 @@ async def get_notifications(
     
     # If user is admin/manager, they can see all notifications
     if current_user["role"] in ["admin", "manager"] and user_id is None:
-        notifications, total = notification_service.get_all_notifications(filters)
+        notifications, total = notification_service.get_all_notifications(filters, fields=selected)
     else:
         # Regular users can only see their own notifications
         filters.user_id = current_user["user_id"]
         notifications, total = notification_service.get_user_notifications(
             current_user["user_id"], 
-            filters
+            filters,
+            fields=selected
         )
     
-    pages = (total + size - 1) // size
+    pages = (total + size - 1) // size if total is not None else None
     
-    return NotificationListResponse(
-        items=notifications,
+    return list_response(
+        NotificationListResponse,
+        notifications,
         total=total,
         page=page,
         size=size,
-        pages=pages
+        pages=pages,
+        next_cursor=next_cursor(notifications, size),
+        fields=selected
+    )
+
+
+@router.post("/batch/read", response_model=dict)
+async def mark_notifications_as_read(
+    batch: NotificationBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Mark several of the current user's notifications as read."""
+    notification_service = NotificationService(db)
+    updated_count = notification_service.mark_many_as_read(int(current_user["user_id"]), batch.ids)
+    
+    return {"updated": updated_count}
+
+
+@router.post("/batch/delete", response_model=dict)
+async def delete_notifications(
+    batch: NotificationBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Delete several of the current user's notifications."""
+    notification_service = NotificationService(db)
+    deleted_count = notification_service.delete_many(int(current_user["user_id"]), batch.ids)
+    
+    return {"deleted": deleted_count}
+
+
+@router.post("/purge", response_model=dict)
+async def purge_notifications(
+    purge: NotificationPurgeRequest,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user)
+):
+    """Delete or archive the current user's notifications older than a date."""
+    notification_service = NotificationService(db)
+    deleted_count, archived_count = notification_service.purge_older_than(
+        int(current_user["user_id"]),
+        purge.before,
+        archive=purge.archive
+    )
+    
+    return {"deleted": deleted_count, "archived": archived_count}
+
+
+@router.get("/stream")
+async def stream_notifications(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: dict = Depends(get_current_user)
+):
+    """Push the current user's new notifications as server-sent events.
+    
+    Reconnect with the Last-Event-ID header to receive anything missed.
+    """
+    broker = get_broker()
+    if broker.connection_count >= settings.notification_stream_max_connections:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many notification streams"
+        )
+    
+    return StreamingResponse(
+        notification_stream(broker, int(current_user["user_id"]), parse_last_event_id(last_event_id)),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
     )
 
 
@@ -2,13 +2,42 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.shared.database import engine, Base
+from contextlib import asynccontextmanager
+import asyncio
+
+from backend.shared.database import engine, Base, QueryStatsMiddleware
+from backend.shared.compression import setup_compression
 from backend.shared.config import settings
+from backend.shared.monitoring import setup_metrics
+from backend.shared.tracing import setup_tracing
+from backend.shared.profiling import setup_profiling
+from services.broker import start_notification_broker, stop_notification_broker
+from services.counters import run_counter_reconciliation
+from services.retention import run_notification_purge
 from .app.api.v1 import api_router
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan events."""
+    await start_notification_broker()
+    reconcile_task = asyncio.create_task(run_counter_reconciliation())
+    # Nothing is purged until a retention policy is configured
+    purge_task = None
+    if settings.notification_retention_days:
+        purge_task = asyncio.create_task(run_notification_purge())
+    
+    yield
+    
+    if purge_task is not None:
+        purge_task.cancel()
+    reconcile_task.cancel()
+    await stop_notification_broker()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Notification Service",
@@ -16,6 +45,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.environment == "development" else None,
     redoc_url="/redoc" if settings.environment == "development" else None,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -27,6 +57,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses with zstd, brotli or gzip, as the client accepts
+setup_compression(app)
+
+# Count queries per request, flagging slow and repeated ones
+app.add_middleware(QueryStatsMiddleware)
+
+# Expose Prometheus metrics at /metrics
+setup_metrics(app)
+
+# Trace requests, calls to other services and SQL statements
+setup_tracing(app)
+
+# Admin-only profiling of live workers at /debug/profile, or on SIGUSR2
+setup_profiling(app)
+
 # Include API routes
 app.include_router(api_router)
 
@@ -1,6 +1,6 @@
 """Notification models."""
 
-from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean
+from sqlalchemy import Column, String, Text, DateTime, Integer, Boolean, Index, false
 from sqlalchemy.sql import func
 from .base import Base
 
@@ -11,7 +11,7 @@ class Notification(Base):
     __tablename__ = "notifications"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
     title = Column(String(255), nullable=False)
     message = Column(Text, nullable=False)
     type = Column(String(50), nullable=False, default="info")  # info, success, warning, error
@@ -19,6 +19,16 @@ class Notification(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     read_at = Column(DateTime(timezone=True), nullable=True)
     
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at", user_id, created_at.desc(), id.desc()),
+        Index(
+            "ix_notifications_user_id_unread",
+            user_id, created_at.desc(), id.desc(),
+            postgresql_where=is_read == false(),
+            sqlite_where=is_read == false()
+        ),
+    )
+    
     def __repr__(self):
         return f"<Notification(id={self.id}, user_id={self.user_id}, title='{self.title}')>"
     
@@ -34,3 +44,35 @@ class Notification(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "read_at": self.read_at.isoformat() if self.read_at else None,
         }
+
+
+class NotificationCounter(Base):
+    """Cached per-user count of unread notifications."""
+    
+    __tablename__ = "notification_counters"
+    
+    user_id = Column(Integer, primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<NotificationCounter(user_id={self.user_id}, unread_count={self.unread_count})>"
+
+
+class ArchivedNotification(Base):
+    """Notification moved out of the inbox by a purge."""
+    
+    __tablename__ = "notifications_archive"
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    title = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    type = Column(String(50), nullable=False)
+    is_read = Column(Boolean, nullable=False)
+    created_at = Column(DateTime(timezone=True))
+    read_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<ArchivedNotification(id={self.id}, user_id={self.user_id}, title='{self.title}')>"
@@ -0,0 +1,276 @@
+"""Publish notification events to connected push streams."""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+from backend.shared.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Events waiting to go out to Redis before publishers fall back to local delivery
+OUTBOX_SIZE = 10000
+
+
+@dataclass
+class NotificationEvent:
+    """An event for one user, or for every user in an id range."""
+
+    event: str
+    data: Dict[str, Any]
+    id: Optional[int] = None
+    user_id: Optional[int] = None
+    user_range: Optional[Tuple[int, int]] = None  # [start, end) of a fan-out chunk
+
+    def matches(self, user_id: int) -> bool:
+        """Check whether a user should receive this event."""
+        if self.user_range is not None:
+            return self.user_range[0] <= user_id < self.user_range[1]
+        return self.user_id == user_id
+
+    def encode(self) -> str:
+        """Format the event as a server-sent event."""
+        lines = []
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        lines.append(f"event: {self.event}")
+        lines.append(f"data: {json.dumps(self.data, separators=(',', ':'), default=str)}")
+        return "\n".join(lines) + "\n\n"
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "NotificationEvent":
+        data = json.loads(payload)
+        if data.get("user_range") is not None:
+            data["user_range"] = tuple(data["user_range"])
+        return cls(**data)
+
+
+class Subscription:
+    """A connected stream's queue of pending events.
+
+    The queue is bounded; a client too slow to keep up is disconnected rather
+    than buffered without limit, and catches up from the database when it
+    reconnects with Last-Event-ID.
+    """
+
+    def __init__(self, user_id: int, max_queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.overflowed = False
+
+    def put(self, event: NotificationEvent) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            # Drop everything queued so the client's last event id stays a
+            # safe resume point, and wake the stream up to close
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class NotificationBroker:
+    """Deliver events to the streams connected to this process.
+
+    Streams hold nothing but a small queue, so idle connections cost a few
+    kilobytes each. ``publish`` may be called from any thread; delivery
+    always happens on the event loop.
+    """
+
+    def __init__(self, max_queue_size: Optional[int] = None):
+        self.max_queue_size = max_queue_size or settings.notification_stream_queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    async def start(self) -> None:
+        """Bind the broker to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        """Stop delivering events."""
+        self._loop = None
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Register a stream for a user's events."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        subscription = Subscription(user_id, self.max_queue_size)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a stream."""
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+
+    def publish(self, event: NotificationEvent) -> None:
+        """Send an event to every matching stream."""
+        self._deliver_threadsafe(event)
+
+    def _deliver_threadsafe(self, event: NotificationEvent) -> None:
+        self._call_on_loop(self._deliver, event)
+
+    def _call_on_loop(self, callback, event: NotificationEvent) -> None:
+        """Run a callback on the broker's event loop, from whatever thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            callback(event)
+        else:
+            loop.call_soon_threadsafe(callback, event)
+
+    def _deliver(self, event: NotificationEvent) -> None:
+        if event.user_range is None:
+            for subscription in list(self._subscribers.get(event.user_id, ())):
+                subscription.put(event)
+            return
+
+        for user_id, subscriptions in list(self._subscribers.items()):
+            if event.matches(user_id):
+                for subscription in list(subscriptions):
+                    subscription.put(event)
+
+
+class RedisNotificationBroker(NotificationBroker):
+    """Share events between workers over Redis pub/sub.
+
+    Every worker publishes to one channel and relays what it receives to its
+    own streams, so a notification created on one worker reaches a user
+    connected to another. Publishing only queues the event; a task on the
+    event loop sends it, so a slow Redis never blocks the caller.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, channel: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.redis_url = redis_url or settings.redis_url
+        self.channel = channel or settings.notification_broker_channel
+        self._publisher = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._sender: Optional[asyncio.Task] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Connect to Redis and start relaying events."""
+        import redis.asyncio as aioredis
+
+        await super().start()
+        self._publisher = aioredis.Redis.from_url(self.redis_url)
+        self._outbox = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        self._sender = asyncio.create_task(self._send())
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop relaying events and disconnect."""
+        for task in (self._sender, self._listener):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._sender = self._listener = None
+        if self._publisher is not None:
+            await self._publisher.aclose()
+            self._publisher = None
+        await super().stop()
+
+    def publish(self, event: NotificationEvent) -> None:
+        """Send an event to every worker's matching streams."""
+        if self._publisher is None:
+            self._deliver_threadsafe(event)
+            return
+        self._call_on_loop(self._enqueue, event)
+
+    def _enqueue(self, event: NotificationEvent) -> None:
+        try:
+            self._outbox.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.error("Notification event queue is full, delivering to this worker's streams only")
+            self._deliver(event)
+
+    async def _send(self) -> None:
+        """Publish queued events to Redis in order."""
+        while True:
+            event = await self._outbox.get()
+            try:
+                await self._publisher.publish(self.channel, event.to_json())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to publish notification event to Redis: {str(e)}")
+                self._deliver(event)
+
+    async def _listen(self) -> None:
+        import redis.asyncio as aioredis
+
+        while True:
+            client = aioredis.Redis.from_url(self.redis_url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        try:
+                            self._deliver(NotificationEvent.from_json(message["data"]))
+                        except (ValueError, TypeError) as e:
+                            logger.warning(f"Ignoring malformed notification event: {str(e)}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Lost Redis notification channel, reconnecting: {str(e)}")
+                await asyncio.sleep(1)
+            finally:
+                await client.aclose()
+
+
+_broker: Optional[NotificationBroker] = None
+
+
+def get_broker() -> NotificationBroker:
+    """Get the process-wide notification broker."""
+    global _broker
+    if _broker is None:
+        if settings.notification_broker == "redis":
+            _broker = RedisNotificationBroker()
+        else:
+            _broker = NotificationBroker()
+    return _broker
+
+
+async def start_notification_broker() -> NotificationBroker:
+    """Start the process-wide notification broker."""
+    broker = get_broker()
+    await broker.start()
+    return broker
+
+
+async def stop_notification_broker() -> None:
+    """Stop the process-wide notification broker."""
+    global _broker
+    if _broker is not None:
+        await _broker.stop()
+        _broker = None
@@ -0,0 +1,153 @@
+"""Cached unread-notification counters."""
+
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, case, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+from models.notification import Notification, NotificationCounter
+
+logger = logging.getLogger(__name__)
+
+
+class UnreadCounterStore:
+    """Keep a per-user unread count in notification_counters.
+
+    Counters are changed in the caller's transaction, alongside the
+    notification writes they reflect, and never committed here; that is up to
+    whoever owns the unit of work. Updates only
+    touch existing rows: a user without a counter row gets one computed from
+    the notifications table the first time their count is read, so a missing
+    row is never wrong, only cold.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _count_unread(self, user_id: int) -> int:
+        """Count unread notifications the slow way."""
+        return self.db.query(func.count(Notification.id)).filter(
+            and_(
+                Notification.user_id == user_id,
+                Notification.is_read == False
+            )
+        ).scalar() or 0
+
+    def get(self, user_id: int) -> int:
+        """Get a user's unread count, creating their counter on first use.
+
+        The new counter is only added to the caller's transaction, so it
+        lasts once the caller commits.
+        """
+        unread_count = self.db.execute(
+            select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+        ).scalar()
+        if unread_count is not None:
+            return unread_count
+
+        unread_count = self._count_unread(user_id)
+        try:
+            with self.db.begin_nested():
+                self.db.add(NotificationCounter(user_id=user_id, unread_count=unread_count))
+        except IntegrityError:
+            # Another request created the counter first
+            pass
+        return unread_count
+
+    def increment(self, user_id: int, amount: int = 1) -> None:
+        """Add to a user's unread count."""
+        self.db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=NotificationCounter.unread_count + amount)
+        )
+
+    def increment_many(self, user_ids: Select, amount: int = 1) -> None:
+        """Add to the unread count of every user selected by a subquery."""
+        self.db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id.in_(user_ids))
+            .values(unread_count=NotificationCounter.unread_count + amount)
+        )
+
+    def decrement(self, user_id: int, amount: int = 1) -> None:
+        """Subtract from a user's unread count, never going below zero."""
+        self.db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=case(
+                (NotificationCounter.unread_count > amount, NotificationCounter.unread_count - amount),
+                else_=0
+            ))
+        )
+
+    def reset(self, user_id: int) -> None:
+        """Set a user's unread count to zero."""
+        self.db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=0)
+        )
+
+    def _actual_count(self):
+        """Correlated subquery counting each counter's unread notifications."""
+        return (
+            select(func.count(Notification.id))
+            .where(
+                Notification.user_id == NotificationCounter.user_id,
+                Notification.is_read == False
+            )
+            .scalar_subquery()
+        )
+
+    def recount(self, user_ids: Iterable[int]) -> None:
+        """Recompute some users' counters from the notifications table."""
+        self.db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.user_id.in_(list(user_ids)))
+            .values(unread_count=self._actual_count())
+            .execution_options(synchronize_session=False)
+        )
+
+    def reconcile(self) -> int:
+        """Correct counters that drifted from the notifications table."""
+        actual = self._actual_count()
+        result = self.db.execute(
+            update(NotificationCounter)
+            .where(NotificationCounter.unread_count != actual)
+            .values(unread_count=actual)
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.rowcount:
+            logger.warning(f"Corrected {result.rowcount} drifted unread notification counters")
+        return result.rowcount
+
+
+async def run_counter_reconciliation(interval: Optional[int] = None) -> None:
+    """Periodically correct drifted unread counters."""
+    from backend.shared.database import get_db_session
+
+    interval = interval or settings.notification_counter_reconcile_interval
+
+    def reconcile() -> int:
+        db = get_db_session()
+        try:
+            corrected = UnreadCounterStore(db).reconcile()
+            db.commit()
+            return corrected
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(reconcile)
+        except Exception as e:
+            logger.error(f"Failed to reconcile unread notification counters: {str(e)}")
@@ -0,0 +1,211 @@
+"""Set-based fan-out of system notifications to every active user."""
+
+import logging
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple, Any
+
+from sqlalchemy import column, false, func, insert, literal, select, table, true
+from sqlalchemy.orm import Session
+
+from backend.shared.config import settings
+from models.notification import Notification
+from services.broker import NotificationEvent, get_broker
+from services.counters import UnreadCounterStore
+
+logger = logging.getLogger(__name__)
+
+# The users table belongs to the user service; only the columns needed here
+users_table = table("users", column("id"), column("is_active"))
+
+
+@dataclass
+class FanoutJob:
+    """Progress of a system notification fan-out."""
+
+    title: str
+    message: str
+    type: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = "pending"  # pending, running, completed, failed
+    total_users: int = 0
+    delivered: int = 0
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+    @property
+    def progress(self) -> float:
+        """Fraction of users reached so far."""
+        if self.status == "completed":
+            return 1.0
+        if not self.total_users:
+            return 0.0
+        return min(self.delivered / self.total_users, 1.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "type": self.type,
+            "status": self.status,
+            "total_users": self.total_users,
+            "delivered": self.delivered,
+            "progress": round(self.progress, 4),
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class NotificationFanout:
+    """Write one notification row per active user with INSERT ... SELECT.
+
+    Active users are processed ``chunk_size`` at a time, walking the primary
+    key by keyset so gaps in the ids cost nothing. Each chunk is a single
+    statement committed on its own, so no rows pass through Python and a
+    large broadcast never holds one huge transaction open.
+    """
+
+    def __init__(self, db: Session, chunk_size: Optional[int] = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.notification_fanout_chunk_size
+
+    def count_recipients(self) -> int:
+        """Count the active users a broadcast will reach."""
+        return self.db.execute(
+            select(func.count()).select_from(users_table).where(users_table.c.is_active == true())
+        ).scalar() or 0
+
+    def _chunk_end(self, after_id: int) -> Optional[int]:
+        """Get the id of the last of the next chunk_size active users after after_id."""
+        chunk = (
+            select(users_table.c.id)
+            .where(users_table.c.is_active == true(), users_table.c.id > after_id)
+            .order_by(users_table.c.id)
+            .limit(self.chunk_size)
+            .subquery()
+        )
+        return self.db.execute(select(func.max(chunk.c.id))).scalar()
+
+    def _insert_chunk(self, job: FanoutJob, created_at: datetime, after_id: int, last_id: int) -> int:
+        """Insert notifications for active users with ids in (after_id, last_id]."""
+        in_range = (
+            users_table.c.is_active == true(),
+            users_table.c.id > after_id,
+            users_table.c.id <= last_id,
+        )
+        recipients = select(
+            users_table.c.id,
+            literal(job.title),
+            literal(job.message),
+            literal(job.type),
+            false(),
+            literal(created_at),
+        ).where(*in_range)
+        delivered, last_notification_id = self._insert(
+            insert(Notification.__table__).from_select(
+                ["user_id", "title", "message", "type", "is_read", "created_at"],
+                recipients,
+            )
+        )
+        UnreadCounterStore(self.db).increment_many(select(users_table.c.id).where(*in_range))
+        self.db.commit()
+        if not delivered:
+            return 0
+        
+        # One event per chunk; the broker routes it to connected users in range.
+        # Its id is the chunk's highest notification id, which is at least each
+        # recipient's own, so a client resuming from it isn't replayed the row.
+        get_broker().publish(NotificationEvent(
+            event="notification",
+            id=last_notification_id,
+            user_range=(after_id + 1, last_id + 1),
+            data={
+                "job_id": job.id,
+                "title": job.title,
+                "message": job.message,
+                "type": job.type,
+                "is_read": False,
+                "created_at": created_at.isoformat(),
+            },
+        ))
+        return delivered
+
+    def _insert(self, statement) -> Tuple[int, Optional[int]]:
+        """Run an INSERT of notifications; return the rows written and the highest new id.
+
+        Postgres aggregates the returned ids in the database, so none pass
+        through Python; other databases (SQLite in tests) fetch them.
+        """
+        statement = statement.returning(Notification.id)
+        if self.db.get_bind().dialect.name == "postgresql":
+            inserted = statement.cte("inserted")
+            count, last_id = self.db.execute(select(func.count(), func.max(inserted.c.id))).one()
+            return count, last_id
+        ids = self.db.execute(statement).scalars().all()
+        return len(ids), max(ids, default=None)
+
+    def run(self, job: FanoutJob, on_progress: Optional[Callable[[FanoutJob], None]] = None) -> FanoutJob:
+        """Deliver a broadcast to every active user, updating the job as it goes."""
+        job.status = "running"
+        try:
+            job.total_users = self.count_recipients()
+
+            # One timestamp for the whole broadcast keeps it together in inbox order
+            created_at = datetime.now(timezone.utc)
+            after_id = 0
+            while (last_id := self._chunk_end(after_id)) is not None:
+                job.delivered += self._insert_chunk(job, created_at, after_id, last_id)
+                after_id = last_id
+                if on_progress:
+                    on_progress(job)
+
+            job.status = "completed"
+            logger.info(f"System notification {job.id} delivered to {job.delivered} users")
+        except Exception as e:
+            self.db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"System notification {job.id} failed after {job.delivered} users: {str(e)}")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+        return job
+
+
+_jobs: Dict[str, FanoutJob] = {}
+_jobs_lock = threading.Lock()
+MAX_TRACKED_JOBS = 100
+
+
+def get_fanout_job(job_id: str) -> Optional[FanoutJob]:
+    """Get a fan-out job started by this process."""
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def start_fanout_job(title: str, message: str, notification_type: str = "info") -> FanoutJob:
+    """Start a broadcast in a background thread and return its job."""
+    from backend.shared.database import get_db_session
+
+    job = FanoutJob(title=title, message=message, type=notification_type)
+    with _jobs_lock:
+        _jobs[job.id] = job
+        # Forget the oldest finished jobs so the registry stays small
+        finished = [j for j in _jobs.values() if j.finished_at is not None]
+        for old in sorted(finished, key=lambda j: j.created_at)[:max(0, len(_jobs) - MAX_TRACKED_JOBS)]:
+            del _jobs[old.id]
+
+    def run() -> None:
+        db = get_db_session()
+        try:
+            NotificationFanout(db).run(job)
+        finally:
+            db.close()
+
+    threading.Thread(target=run, name=f"notification-fanout-{job.id}", daemon=True).start()
+    return job
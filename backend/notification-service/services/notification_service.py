@@ -1,12 +1,19 @@
 """Notification service business logic."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, tuple_, delete, insert, select, update
 from fastapi import HTTPException, status
 from datetime import datetime
 
-from models.notification import Notification
+from backend.shared.utils.fieldsets import load_only_fields
+from backend.shared.utils.pagination import decode_cursor
+from models.notification import Notification, ArchivedNotification
+from services.broker import get_broker
+from services.counters import UnreadCounterStore
+from services.fanout import FanoutJob, start_fanout_job
+from services.retention import ARCHIVE_COLUMNS
+from services.stream import notification_event
 from schemas.notification import NotificationCreate, NotificationUpdate, NotificationFilters
 
 
@@ -15,6 +22,7 @@ class NotificationService:
     
     def __init__(self, db: Session):
         self.db = db
+        self.counters = UnreadCounterStore(db)
     
     def create_notification(self, notification_data: NotificationCreate) -> Notification:
         """Create a new notification."""
@@ -26,9 +34,12 @@ class NotificationService:
         )
         
         self.db.add(notification)
+        self.counters.increment(notification_data.user_id)
         self.db.commit()
         self.db.refresh(notification)
         
+        get_broker().publish(notification_event(notification))
+        
         return notification
     
     def get_notification(self, notification_id: int) -> Notification:
@@ -48,8 +59,9 @@ class NotificationService:
     def get_user_notifications(
         self, 
         user_id: int, 
-        filters: NotificationFilters
-    ) -> Tuple[List[Notification], int]:
+        filters: NotificationFilters,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Notification], Optional[int]]:
         """Get notifications for a user with filtering."""
         query = self.db.query(Notification).filter(Notification.user_id == user_id)
         
@@ -59,20 +71,13 @@ class NotificationService:
         if filters.is_read is not None:
             query = query.filter(Notification.is_read == filters.is_read)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        notifications = query.order_by(
-            Notification.created_at.desc()
-        ).offset((filters.page - 1) * filters.size).limit(filters.size).all()
-        
-        return notifications, total
+        return self._paginate(query, filters, fields)
     
     def get_all_notifications(
         self, 
-        filters: NotificationFilters
-    ) -> Tuple[List[Notification], int]:
+        filters: NotificationFilters,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Notification], Optional[int]]:
         """Get all notifications with filtering (admin only)."""
         query = self.db.query(Notification)
         
@@ -84,13 +89,40 @@ class NotificationService:
         if filters.is_read is not None:
             query = query.filter(Notification.is_read == filters.is_read)
         
+        return self._paginate(query, filters, fields)
+    
+    def _paginate(
+        self,
+        query,
+        filters: NotificationFilters,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Notification], Optional[int]]:
+        """Get one page of notifications, newest first.
+        
+        With a cursor or ``since``, pages are read by keyset in index order
+        and the total isn't counted (it is returned as None). Otherwise the
+        page number is used as an offset, as before. With ``fields`` only
+        those columns are loaded, plus ``created_at`` for the next cursor.
+        """
+        if fields:
+            query = query.options(load_only_fields(Notification, fields, "created_at"))
+        if filters.since:
+            query = query.filter(Notification.created_at > filters.since)
+        query = query.order_by(Notification.created_at.desc(), Notification.id.desc())
+        
+        if filters.cursor or filters.since:
+            if filters.cursor:
+                created_at, notification_id = decode_cursor(filters.cursor)
+                query = query.filter(
+                    tuple_(Notification.created_at, Notification.id) < (created_at, notification_id)
+                )
+            return query.limit(filters.size).all(), None
+        
         # Get total count
-        total = query.count()
+        total = query.order_by(None).count()
         
         # Apply pagination
-        notifications = query.order_by(
-            Notification.created_at.desc()
-        ).offset((filters.page - 1) * filters.size).limit(filters.size).all()
+        notifications = query.offset((filters.page - 1) * filters.size).limit(filters.size).all()
         
         return notifications, total
     
@@ -101,12 +133,17 @@ class NotificationService:
     ) -> Notification:
         """Update a notification."""
         notification = self.get_notification(notification_id)
+        was_read = notification.is_read
         
-        for field, value in update_data.dict(exclude_unset=True):
+        for field, value in update_data.model_dump(exclude_unset=True).items():
             setattr(notification, field, value)
         
-        if update_data.is_read and not notification.is_read:
+        if notification.is_read and not was_read:
             notification.read_at = datetime.utcnow()
+            self.counters.decrement(notification.user_id)
+        elif was_read and not notification.is_read:
+            notification.read_at = None
+            self.counters.increment(notification.user_id)
         
         self.db.commit()
         self.db.refresh(notification)
@@ -128,6 +165,7 @@ class NotificationService:
             Notification.is_read: True,
             Notification.read_at: datetime.utcnow()
         })
+        self.counters.reset(user_id)
         
         self.db.commit()
         return updated_count
@@ -136,38 +174,94 @@ class NotificationService:
         """Delete a notification."""
         notification = self.get_notification(notification_id)
         
+        if not notification.is_read:
+            self.counters.decrement(notification.user_id)
         self.db.delete(notification)
         self.db.commit()
         
         return True
     
-    def get_unread_count(self, user_id: int) -> int:
-        """Get count of unread notifications for a user."""
-        return self.db.query(Notification).filter(
-            and_(
+    def mark_many_as_read(self, user_id: int, notification_ids: List[int]) -> int:
+        """Mark a user's notifications as read by ID in one UPDATE.
+        
+        IDs that don't exist, belong to someone else or are already read are
+        skipped; the number actually marked is returned.
+        """
+        result = self.db.execute(
+            update(Notification)
+            .where(
                 Notification.user_id == user_id,
+                Notification.id.in_(notification_ids),
                 Notification.is_read == False
             )
-        ).count()
+            .values(is_read=True, read_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self.counters.decrement(user_id, result.rowcount)
+        
+        self.db.commit()
+        return result.rowcount
+    
+    def delete_many(self, user_id: int, notification_ids: List[int]) -> int:
+        """Delete a user's notifications by ID in one DELETE."""
+        return self._delete_where(user_id, Notification.id.in_(notification_ids))
+    
+    def purge_older_than(self, user_id: int, before: datetime, archive: bool = False) -> Tuple[int, int]:
+        """Delete, or archive, a user's notifications created before a date.
+        
+        Returns the number of notifications deleted and archived.
+        """
+        archived = 0
+        if archive:
+            # Copy in the same transaction as the delete, so rows are never lost
+            archived = self.db.execute(
+                insert(ArchivedNotification).from_select(
+                    ARCHIVE_COLUMNS,
+                    select(*(Notification.__table__.c[name] for name in ARCHIVE_COLUMNS)).where(
+                        Notification.user_id == user_id,
+                        Notification.created_at < before
+                    )
+                )
+            ).rowcount
+        
+        return self._delete_where(user_id, Notification.created_at < before), archived
+    
+    def _delete_where(self, user_id: int, *criteria) -> int:
+        """Delete a user's matching notifications, keeping the unread counter in step.
+        
+        Unread rows go first in a statement of their own, so its row count is
+        what the counter drops by and no rows come back from the database.
+        """
+        matching = (
+            delete(Notification)
+            .where(Notification.user_id == user_id, *criteria)
+            .execution_options(synchronize_session=False)
+        )
+        unread = self.db.execute(matching.where(Notification.is_read == False)).rowcount
+        read = self.db.execute(matching).rowcount
+        
+        if unread:
+            self.counters.decrement(user_id, unread)
+        
+        self.db.commit()
+        return unread + read
+    
+    def get_unread_count(self, user_id: int) -> int:
+        """Get count of unread notifications for a user."""
+        unread_count = self.counters.get(user_id)
+        # Keep the counter if this was its first read
+        self.db.commit()
+        return unread_count
     
     def create_system_notification(
         self, 
         title: str, 
         message: str, 
         notification_type: str = "info"
-    ) -> Notification:
-        """Create a system-wide notification (for all users)."""
-        # This would typically create notifications for all users
-        # For now, we'll create a single system notification
-        notification = Notification(
-            user_id=0,  # System user ID
-            title=title,
-            message=message,
-            type=notification_type
-        )
+    ) -> FanoutJob:
+        """Create a system-wide notification (for all users).
         
-        self.db.add(notification)
-        self.db.commit()
-        self.db.refresh(notification)
-        
-        return notification
+        One notification is written per active user by a background fan-out
+        job; poll the returned job for progress.
+        """
+        return start_fanout_job(title, message, notification_type)
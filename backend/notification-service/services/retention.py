@@ -0,0 +1,212 @@
+"""Retention policy and background purge of old notifications."""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+from models.notification import ArchivedNotification, Notification
+from services.counters import UnreadCounterStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TYPE = "default"
+ARCHIVE_COLUMNS = ["id", "user_id", "title", "message", "type", "is_read", "created_at", "read_at"]
+
+
+@dataclass
+class RetentionRule:
+    """How long to keep read or unread notifications of some types."""
+
+    is_read: bool
+    days: int
+    type: Optional[str] = None  # None covers every type without its own rule
+    excluded_types: tuple = ()
+
+    @property
+    def name(self) -> str:
+        return f"{self.type or DEFAULT_TYPE}:{'read' if self.is_read else 'unread'}"
+
+    def criteria(self, cutoff: datetime) -> list:
+        """WHERE criteria selecting the notifications this rule expires."""
+        criteria = [Notification.is_read == self.is_read, Notification.created_at < cutoff]
+        if self.type is not None:
+            criteria.append(Notification.type == self.type)
+        elif self.excluded_types:
+            criteria.append(Notification.type.notin_(self.excluded_types))
+        return criteria
+
+
+def build_rules(policy: Optional[Dict[str, Dict[str, int]]] = None) -> List[RetentionRule]:
+    """Turn a {type: {"read": days, "unread": days}} policy into rules.
+
+    The "default" entry covers every type not listed, and any read state a
+    type's entry leaves out. 0, or no entry at all, keeps notifications
+    forever.
+    """
+    policy = settings.notification_retention_days if policy is None else policy
+    explicit_types = tuple(sorted(t for t in policy if t != DEFAULT_TYPE))
+    defaults = policy.get(DEFAULT_TYPE, {})
+
+    rules = []
+    for notification_type, days_by_state in policy.items():
+        for state, is_read in (("read", True), ("unread", False)):
+            days = days_by_state.get(state, defaults.get(state, 0))
+            if days <= 0:
+                continue
+            if notification_type == DEFAULT_TYPE:
+                rules.append(RetentionRule(is_read=is_read, days=days, excluded_types=explicit_types))
+            else:
+                rules.append(RetentionRule(is_read=is_read, days=days, type=notification_type))
+    return rules
+
+
+class NotificationPurger:
+    """Delete notifications past their retention in small batches.
+
+    Each batch selects up to ``batch_size`` expired ids, optionally copies
+    them to notifications_archive, deletes them and commits, then sleeps for
+    ``pause`` seconds. Locks are held for one short batch at a time, and
+    other writers get a chance to run in between.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        rules: Optional[List[RetentionRule]] = None,
+        batch_size: Optional[int] = None,
+        pause: Optional[float] = None,
+        archive: Optional[bool] = None
+    ):
+        self.db = db
+        self.rules = build_rules() if rules is None else rules
+        self.batch_size = batch_size or settings.notification_purge_batch_size
+        self.pause = settings.notification_purge_batch_pause if pause is None else pause
+        self.archive = settings.notification_purge_archive if archive is None else archive
+
+    def _purge_batch(self, rule: RetentionRule, cutoff: datetime) -> int:
+        """Purge one batch of notifications expired by a rule."""
+        ids = self.db.execute(
+            select(Notification.id)
+            .where(*rule.criteria(cutoff))
+            .order_by(Notification.id)
+            .limit(self.batch_size)
+        ).scalars().all()
+        if not ids:
+            return 0
+
+        if self.archive:
+            self.db.execute(
+                insert(ArchivedNotification).from_select(
+                    ARCHIVE_COLUMNS,
+                    select(*(Notification.__table__.c[name] for name in ARCHIVE_COLUMNS))
+                    .where(Notification.id.in_(ids))
+                )
+            )
+        user_ids = self.db.execute(
+            delete(Notification)
+            .where(Notification.id.in_(ids))
+            .returning(Notification.user_id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
+        if not rule.is_read:
+            UnreadCounterStore(self.db).recount(set(user_ids))
+        self.db.commit()
+        return len(user_ids)
+
+    def lag_seconds(self, rule: RetentionRule, now: datetime) -> float:
+        """How far past its cutoff the oldest expired notification is."""
+        cutoff = now - timedelta(days=rule.days)
+        oldest = self.db.execute(
+            select(func.min(Notification.created_at)).where(*rule.criteria(cutoff))
+        ).scalar()
+        if oldest is None:
+            return 0.0
+        if oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        return (cutoff - oldest).total_seconds()
+
+    def run(self, max_batches: Optional[int] = None) -> Dict[str, Any]:
+        """Purge every rule until nothing expired is left, or max_batches is hit."""
+        started = time.monotonic()
+        now = datetime.now(timezone.utc)
+        report = {"started_at": now.isoformat(), "purged": 0, "archive": self.archive, "rules": {}}
+
+        batches = 0
+        for rule in self.rules:
+            cutoff = now - timedelta(days=rule.days)
+            purged = 0
+            while max_batches is None or batches < max_batches:
+                count = self._purge_batch(rule, cutoff)
+                purged += count
+                batches += 1
+                if count < self.batch_size:
+                    break
+                if self.pause:
+                    time.sleep(self.pause)
+
+            report["rules"][rule.name] = {
+                "days": rule.days,
+                "purged": purged,
+                "lag_seconds": round(self.lag_seconds(rule, now), 3),
+            }
+            report["purged"] += purged
+
+        report["duration_seconds"] = round(time.monotonic() - started, 3)
+        report["lag_seconds"] = max((r["lag_seconds"] for r in report["rules"].values()), default=0.0)
+        if report["purged"]:
+            logger.info(f"Purged {report['purged']} expired notifications in {report['duration_seconds']}s")
+        return report
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Any] = {"runs": 0, "total_purged": 0, "last_run": None}
+
+
+def get_retention_stats() -> Dict[str, Any]:
+    """Get purge totals and the report of the last run in this process."""
+    with _stats_lock:
+        return {
+            "policy": settings.notification_retention_days,
+            **_stats,
+        }
+
+
+def purge_expired_notifications(db: Session, **kwargs) -> Dict[str, Any]:
+    """Run one purge pass and record its report."""
+    report = NotificationPurger(db, **kwargs).run()
+    with _stats_lock:
+        _stats["runs"] += 1
+        _stats["total_purged"] += report["purged"]
+        _stats["last_run"] = report
+    return report
+
+
+async def run_notification_purge(interval: Optional[int] = None) -> None:
+    """Periodically purge notifications past their retention."""
+    from backend.shared.database import get_db_session
+
+    interval = interval or settings.notification_purge_interval
+
+    def purge() -> Dict[str, Any]:
+        db = get_db_session()
+        try:
+            return purge_expired_notifications(db)
+        finally:
+            db.close()
+
+    while True:
+        try:
+            await run_in_threadpool(purge)
+        except Exception as e:
+            logger.error(f"Failed to purge expired notifications: {str(e)}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,92 @@
+"""Server-sent event streams of a user's notifications."""
+
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+from models.notification import Notification
+from services.broker import NotificationBroker, NotificationEvent
+
+
+def notification_event(notification: Notification) -> NotificationEvent:
+    """Build the event announcing a new notification."""
+    return NotificationEvent(
+        event="notification",
+        id=notification.id,
+        user_id=notification.user_id,
+        data=notification.to_dict(),
+    )
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    """Parse a Last-Event-ID header, ignoring ids this service didn't send."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _missed_notifications(user_id: int, after_id: int, limit: int) -> List[Notification]:
+    """Load notifications created after an event id, oldest first."""
+    from backend.shared.database import get_db_session
+
+    db = get_db_session()
+    try:
+        return db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.id > after_id
+        ).order_by(Notification.id).limit(limit).all()
+    finally:
+        db.close()
+
+
+async def notification_stream(
+    broker: NotificationBroker,
+    user_id: int,
+    last_event_id: Optional[int] = None,
+    heartbeat: Optional[float] = None,
+    replay_limit: Optional[int] = None
+) -> AsyncIterator[str]:
+    """Stream a user's notification events.
+
+    On reconnect, notifications created since ``last_event_id`` are replayed
+    from the database before live events. A comment line is sent whenever the
+    stream has been quiet for ``heartbeat`` seconds so proxies keep it open.
+    """
+    heartbeat = heartbeat or settings.notification_stream_heartbeat
+    replay_limit = replay_limit or settings.notification_stream_replay_limit
+
+    # Subscribe before replaying so nothing created in between is lost
+    subscription = broker.subscribe(user_id)
+    try:
+        yield f"retry: {settings.notification_stream_retry_ms}\n\n"
+
+        replayed_id = last_event_id or 0
+        if last_event_id is not None:
+            missed = await run_in_threadpool(_missed_notifications, user_id, last_event_id, replay_limit)
+            for notification in missed:
+                replayed_id = notification.id
+                yield notification_event(notification).encode()
+            if len(missed) == replay_limit:
+                # Too far behind to catch up event by event
+                yield NotificationEvent(event="reset", data={"reason": "too_many_missed"}).encode()
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+
+            if event is None:
+                # The client fell behind; it will resume from its last event id
+                break
+            if event.id is not None and event.id <= replayed_id:
+                continue
+            yield event.encode()
+    finally:
+        broker.unsubscribe(subscription)
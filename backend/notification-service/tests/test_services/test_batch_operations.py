@@ -0,0 +1,106 @@
+"""Test batch read, delete and purge of a user's notifications."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.notification import ArchivedNotification, Notification, NotificationCounter
+from services.notification_service import NotificationService
+
+
+@pytest.fixture
+def batch_db():
+    """Create a database with notification tables."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    for model in (Notification, NotificationCounter, ArchivedNotification):
+        model.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def add_notification(db, user_id: int, is_read: bool = False, age_days: int = 0) -> int:
+    """Add a notification and return its id."""
+    notification = Notification(
+        user_id=user_id, title="t", message="m", type="info", is_read=is_read,
+        created_at=datetime.now(timezone.utc) - timedelta(days=age_days)
+    )
+    db.add(notification)
+    db.commit()
+    return notification.id
+
+
+def test_mark_many_as_read_only_touches_own_unread(batch_db):
+    """Test other users' ids, read ones and unknown ones are skipped."""
+    unread = add_notification(batch_db, user_id=1)
+    other_unread = add_notification(batch_db, user_id=1)
+    already_read = add_notification(batch_db, user_id=1, is_read=True)
+    someone_elses = add_notification(batch_db, user_id=2)
+    service = NotificationService(batch_db)
+    assert service.get_unread_count(1) == 2
+    
+    updated = service.mark_many_as_read(1, [unread, already_read, someone_elses, 999])
+    
+    assert updated == 1
+    assert batch_db.get(Notification, unread).is_read
+    assert not batch_db.get(Notification, other_unread).is_read
+    assert not batch_db.get(Notification, someone_elses).is_read
+    assert service.get_unread_count(1) == 1
+    assert service.get_unread_count(2) == 1
+
+
+def test_delete_many_decrements_counter_by_unread_deleted(batch_db):
+    """Test deletes count every row but only unread ones come off the counter."""
+    ids = [
+        add_notification(batch_db, user_id=1),
+        add_notification(batch_db, user_id=1),
+        add_notification(batch_db, user_id=1, is_read=True),
+    ]
+    kept = add_notification(batch_db, user_id=1)
+    someone_elses = add_notification(batch_db, user_id=2)
+    service = NotificationService(batch_db)
+    assert service.get_unread_count(1) == 3
+    
+    deleted = service.delete_many(1, [*ids, someone_elses])
+    
+    assert deleted == 3
+    assert [n.id for n in batch_db.query(Notification).order_by(Notification.id)] == [kept, someone_elses]
+    assert service.get_unread_count(1) == 1
+    assert service.get_unread_count(2) == 1
+
+
+def test_purge_archives_then_deletes(batch_db):
+    """Test a purge copies old notifications to the archive before deleting them."""
+    old_unread = add_notification(batch_db, user_id=1, age_days=40)
+    old_read = add_notification(batch_db, user_id=1, is_read=True, age_days=40)
+    recent = add_notification(batch_db, user_id=1)
+    someone_elses = add_notification(batch_db, user_id=2, age_days=40)
+    service = NotificationService(batch_db)
+    assert service.get_unread_count(1) == 2
+    
+    deleted, archived = service.purge_older_than(
+        1, datetime.now(timezone.utc) - timedelta(days=30), archive=True
+    )
+    
+    assert (deleted, archived) == (2, 2)
+    assert sorted(a.id for a in batch_db.query(ArchivedNotification)) == [old_unread, old_read]
+    assert sorted(n.id for n in batch_db.query(Notification)) == [recent, someone_elses]
+    assert service.get_unread_count(1) == 1
+
+
+def test_purge_without_archive(batch_db):
+    """Test a plain purge deletes without archiving."""
+    add_notification(batch_db, user_id=1, age_days=40)
+    
+    deleted, archived = NotificationService(batch_db).purge_older_than(1, datetime.now(timezone.utc))
+    
+    assert (deleted, archived) == (1, 0)
+    assert batch_db.query(ArchivedNotification).count() == 0
@@ -0,0 +1,103 @@
+"""Test cached unread notification counters."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.notification import Notification, NotificationCounter
+from services.counters import UnreadCounterStore
+
+
+@pytest.fixture
+def counter_db():
+    """Create a database with notification tables."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Notification.__table__.create(engine)
+    NotificationCounter.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def add_notifications(db, user_id: int, unread: int, read: int = 0) -> None:
+    """Add notifications for a user."""
+    db.add_all(
+        [Notification(user_id=user_id, title="t", message="m", type="info", is_read=False) for _ in range(unread)]
+        + [Notification(user_id=user_id, title="t", message="m", type="info", is_read=True) for _ in range(read)]
+    )
+    db.commit()
+
+
+def test_counter_is_created_on_first_read(counter_db):
+    """Test a missing counter is computed from the notifications table."""
+    add_notifications(counter_db, user_id=1, unread=3, read=2)
+    store = UnreadCounterStore(counter_db)
+    
+    assert store.get(1) == 3
+    assert counter_db.get(NotificationCounter, 1).unread_count == 3
+
+
+def test_first_read_leaves_the_transaction_to_the_caller(counter_db):
+    """Test creating a counter doesn't commit the caller's pending work."""
+    add_notifications(counter_db, user_id=1, unread=1)
+    counter_db.add(Notification(user_id=2, title="t", message="m", type="info", is_read=False))
+    
+    UnreadCounterStore(counter_db).get(1)
+    counter_db.rollback()
+    
+    assert counter_db.query(Notification).filter(Notification.user_id == 2).count() == 0
+    assert counter_db.get(NotificationCounter, 1) is None
+
+
+def test_counter_updates(counter_db):
+    """Test increments, decrements and resets of an existing counter."""
+    add_notifications(counter_db, user_id=1, unread=2)
+    store = UnreadCounterStore(counter_db)
+    store.get(1)
+    
+    store.increment(1)
+    store.decrement(1, amount=5)
+    counter_db.commit()
+    assert store.get(1) == 0
+    
+    store.increment(1, amount=4)
+    counter_db.commit()
+    assert store.get(1) == 4
+    
+    store.reset(1)
+    counter_db.commit()
+    assert store.get(1) == 0
+
+
+def test_updates_skip_cold_counters(counter_db):
+    """Test updates before the first read don't create a wrong counter."""
+    add_notifications(counter_db, user_id=2, unread=2)
+    store = UnreadCounterStore(counter_db)
+    
+    store.increment(2)
+    counter_db.commit()
+    
+    assert counter_db.get(NotificationCounter, 2) is None
+    assert store.get(2) == 2
+
+
+def test_reconcile_fixes_drift(counter_db):
+    """Test reconciliation corrects counters that disagree with the table."""
+    add_notifications(counter_db, user_id=1, unread=2)
+    add_notifications(counter_db, user_id=2, unread=1)
+    store = UnreadCounterStore(counter_db)
+    store.get(1)
+    store.get(2)
+    counter_db.get(NotificationCounter, 1).unread_count = 7
+    counter_db.commit()
+    
+    assert store.reconcile() == 1
+    counter_db.commit()
+    assert store.get(1) == 2
+    assert store.get(2) == 1
@@ -0,0 +1,101 @@
+"""Test system notification fan-out."""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Boolean, Column, Integer, MetaData, Table, create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.notification import Notification, NotificationCounter
+from services import fanout
+from services.fanout import FanoutJob, NotificationFanout
+
+
+@pytest.fixture
+def fanout_db():
+    """Create a database with users and notifications tables."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    users = Table(
+        "users", MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("is_active", Boolean, nullable=False),
+    )
+    users.create(engine)
+    Notification.__table__.create(engine)
+    NotificationCounter.__table__.create(engine)
+    
+    with engine.begin() as conn:
+        # Ids 1-10 with a gap, users 4 and 8 inactive
+        conn.execute(insert(users), [
+            {"id": user_id, "is_active": user_id not in (4, 8)}
+            for user_id in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 25]
+        ])
+    
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def test_fanout_reaches_every_active_user(fanout_db):
+    """Test one notification is written per active user, chunk by chunk."""
+    progress = []
+    job = FanoutJob(title="Maintenance", message="Down at 2am", type="warning")
+    
+    NotificationFanout(fanout_db, chunk_size=4).run(job, on_progress=lambda j: progress.append(j.delivered))
+    
+    user_ids = sorted(n.user_id for n in fanout_db.query(Notification).all())
+    assert job.status == "completed"
+    assert job.total_users == job.delivered == 9
+    assert user_ids == [1, 2, 3, 5, 6, 7, 9, 10, 25]
+    # Chunks are four active users each, however sparse the ids
+    assert progress == [4, 8, 9]
+    assert fanout_db.query(Notification).filter(Notification.is_read == True).count() == 0
+
+
+def test_fanout_without_users(fanout_db):
+    """Test a broadcast with no recipients completes immediately."""
+    fanout_db.execute(Table("users", MetaData(), autoload_with=fanout_db.get_bind()).delete())
+    fanout_db.commit()
+    job = FanoutJob(title="Hello", message="Anyone?", type="info")
+    
+    NotificationFanout(fanout_db).run(job)
+    
+    assert job.status == "completed"
+    assert job.delivered == 0
+    assert job.progress == 1.0
+
+
+def test_fanout_updates_warm_counters(fanout_db):
+    """Test users with a cached unread count see the broadcast counted."""
+    fanout_db.add_all([
+        NotificationCounter(user_id=1, unread_count=2),
+        NotificationCounter(user_id=4, unread_count=0),
+    ])
+    fanout_db.commit()
+    
+    NotificationFanout(fanout_db, chunk_size=4).run(FanoutJob(title="Hi", message="All", type="info"))
+    
+    assert fanout_db.get(NotificationCounter, 1).unread_count == 3
+    assert fanout_db.get(NotificationCounter, 4).unread_count == 0
+
+
+def test_fanout_events_carry_notification_ids(fanout_db, monkeypatch):
+    """Test each chunk's event id covers its recipients' rows for Last-Event-ID replay."""
+    events = []
+    monkeypatch.setattr(fanout, "get_broker", lambda: SimpleNamespace(publish=events.append))
+    
+    NotificationFanout(fanout_db, chunk_size=4).run(FanoutJob(title="Hi", message="All", type="info"))
+    
+    assert [event.user_range for event in events] == [(1, 6), (6, 11), (11, 26)]
+    for event in events:
+        rows = fanout_db.query(Notification).filter(
+            Notification.user_id >= event.user_range[0],
+            Notification.user_id < event.user_range[1]
+        ).all()
+        assert event.id == max(row.id for row in rows)
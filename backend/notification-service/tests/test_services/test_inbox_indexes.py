@@ -0,0 +1,50 @@
+"""Test the notification inbox is served from its indexes."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, select, tuple_
+
+from models.notification import Notification
+
+
+@pytest.fixture
+def inbox_engine():
+    """Create a notifications table with mostly read notifications."""
+    engine = create_engine("sqlite://")
+    Notification.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Notification.__table__), [
+            {"user_id": i % 50, "title": "t", "message": "m", "type": "info", "is_read": i % 20 != 0}
+            for i in range(5000)
+        ])
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+
+
+def query_plan(engine, *criteria) -> str:
+    """Get SQLite's plan for an inbox page."""
+    query = select(Notification).where(Notification.user_id == 1, *criteria).order_by(
+        Notification.created_at.desc(), Notification.id.desc()
+    ).limit(10)
+    sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+def test_inbox_uses_composite_index(inbox_engine):
+    """Test pages are read in index order without a sort."""
+    cursor = (datetime(2024, 1, 1, tzinfo=timezone.utc), 100)
+    plan = query_plan(inbox_engine, tuple_(Notification.created_at, Notification.id) < cursor)
+    
+    assert "ix_notifications_user_id_created_at" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_unread_inbox_uses_partial_index(inbox_engine):
+    """Test unread notifications come from the partial index."""
+    plan = query_plan(inbox_engine, Notification.is_read == False)
+    
+    assert "ix_notifications_user_id_unread" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,89 @@
+"""Test notification retention and purging."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.notification import ArchivedNotification, Notification, NotificationCounter
+from services.retention import NotificationPurger, build_rules
+
+
+@pytest.fixture
+def retention_db():
+    """Create a database with notifications of various ages."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    for model in (Notification, NotificationCounter, ArchivedNotification):
+        model.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    
+    now = datetime.now(timezone.utc)
+    for age_days, notification_type, is_read in [
+        (40, "info", True), (40, "info", True), (40, "info", False), (100, "info", False),
+        (40, "error", True), (100, "error", True), (10, "info", True),
+    ]:
+        db.add(Notification(
+            user_id=1, title="t", message="m", type=notification_type, is_read=is_read,
+            created_at=now - timedelta(days=age_days)
+        ))
+    db.add(NotificationCounter(user_id=1, unread_count=2))
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def remaining(db):
+    """List what's left as (type, is_read) pairs."""
+    return sorted((n.type, n.is_read) for n in db.query(Notification).all())
+
+
+def test_build_rules():
+    """Test policies become one rule per type and read state."""
+    rules = build_rules({"default": {"read": 30, "unread": 0}, "error": {"read": 90, "unread": 365}})
+    
+    assert sorted(rule.name for rule in rules) == ["default:read", "error:read", "error:unread"]
+    default_read = next(rule for rule in rules if rule.name == "default:read")
+    assert default_read.excluded_types == ("error",)
+
+
+def test_type_entry_falls_back_to_default_for_missing_state():
+    """Test a type that only sets read retention keeps the default unread retention."""
+    rules = {
+        rule.name: rule.days
+        for rule in build_rules({"default": {"read": 30, "unread": 90}, "error": {"read": 7}})
+    }
+    
+    assert rules == {"default:read": 30, "default:unread": 90, "error:read": 7, "error:unread": 90}
+    assert build_rules({}) == []
+
+
+def test_purge_applies_policy_in_batches(retention_db):
+    """Test expired notifications are purged per type and read state."""
+    rules = build_rules({"default": {"read": 30, "unread": 90}, "error": {"read": 90}})
+    
+    report = NotificationPurger(retention_db, rules=rules, batch_size=1, pause=0).run()
+    
+    assert remaining(retention_db) == [("error", True), ("info", False), ("info", True)]
+    assert report["purged"] == 4
+    assert report["rules"]["default:read"]["purged"] == 2
+    assert report["lag_seconds"] == 0
+    assert retention_db.get(NotificationCounter, 1).unread_count == 1
+
+
+def test_purge_can_archive_and_reports_lag(retention_db):
+    """Test purged rows are archived and unfinished work shows as lag."""
+    rules = build_rules({"default": {"read": 30}})
+    
+    report = NotificationPurger(retention_db, rules=rules, batch_size=1, pause=0, archive=True).run(max_batches=1)
+    
+    assert report["purged"] == 1
+    assert retention_db.query(ArchivedNotification).count() == 1
+    # The oldest expired read notification left is 100 days old, 70 past its cutoff
+    assert 69 * 86400 < report["lag_seconds"] < 71 * 86400
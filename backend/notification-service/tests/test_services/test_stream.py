@@ -0,0 +1,164 @@
+"""Test notification push streams."""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import backend.shared.database as database
+from models.notification import Notification
+from services.broker import NotificationBroker, NotificationEvent, RedisNotificationBroker
+from services.stream import notification_stream
+
+
+@pytest.fixture
+def stream_db(monkeypatch):
+    """Point stream replays at a database with a few notifications."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Notification.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        db.add_all([
+            Notification(user_id=user_id, title=f"n{i}", message="m", type="info", is_read=False)
+            for i, user_id in enumerate([1, 1, 2, 1], start=1)
+        ])
+        db.commit()
+
+    monkeypatch.setattr(database, "get_db_session", Session)
+    yield Session
+    engine.dispose()
+
+
+def test_event_encoding():
+    """Test events are formatted as server-sent events."""
+    event = NotificationEvent(event="notification", id=7, user_id=1, data={"title": "Hi"})
+
+    assert event.encode() == 'id: 7\nevent: notification\ndata: {"title":"Hi"}\n\n'
+    assert NotificationEvent.from_json(event.to_json()) == event
+
+
+def test_broker_routes_events():
+    """Test user events and fan-out ranges reach the right streams."""
+    async def run():
+        broker = NotificationBroker(max_queue_size=10)
+        await broker.start()
+        alice, bob, carol = broker.subscribe(1), broker.subscribe(2), broker.subscribe(30)
+
+        broker.publish(NotificationEvent(event="notification", id=1, user_id=1, data={}))
+        broker.publish(NotificationEvent(event="notification", user_range=(1, 10), data={}))
+
+        # Fan-out publishes from a worker thread
+        thread = threading.Thread(target=broker.publish, args=(
+            NotificationEvent(event="notification", id=2, user_id=2, data={}),
+        ))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+
+        broker.unsubscribe(carol)
+        return alice.queue.qsize(), bob.queue.qsize(), carol.queue.qsize(), broker.connection_count
+
+    assert asyncio.run(run()) == (2, 2, 0, 2)
+
+
+class SlowRedis:
+    """Stand-in for an async Redis client that takes a while to publish."""
+
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel, payload):
+        await asyncio.sleep(0.05)
+        self.published.append(NotificationEvent.from_json(payload).id)
+
+    async def aclose(self):
+        pass
+
+
+def test_redis_publish_does_not_block_the_loop(monkeypatch):
+    """Test publishing returns at once and events still reach Redis in order."""
+    import redis.asyncio as aioredis
+
+    client = SlowRedis()
+    monkeypatch.setattr(aioredis.Redis, "from_url", lambda url: client)
+    monkeypatch.setattr(RedisNotificationBroker, "_listen", lambda self: asyncio.sleep(3600))
+
+    async def run():
+        broker = RedisNotificationBroker(redis_url="redis://test")
+        await broker.start()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for event_id in range(1, 4):
+            broker.publish(NotificationEvent(event="notification", id=event_id, user_id=1, data={}))
+        elapsed = loop.time() - started
+        while len(client.published) < 3:
+            await asyncio.sleep(0.01)
+        await broker.stop()
+        return elapsed
+
+    assert asyncio.run(run()) < 0.05
+    assert client.published == [1, 2, 3]
+
+
+def test_slow_stream_is_disconnected():
+    """Test a stream that falls behind is ended instead of buffering forever."""
+    async def run():
+        broker = NotificationBroker(max_queue_size=2)
+        await broker.start()
+        stream = notification_stream(broker, user_id=1, heartbeat=5)
+        assert (await stream.__anext__()).startswith("retry:")
+
+        for event_id in range(1, 5):
+            broker.publish(NotificationEvent(event="notification", id=event_id, user_id=1, data={}))
+
+        chunks = [chunk async for chunk in stream]
+        return chunks, broker.connection_count
+
+    chunks, connections = asyncio.run(run())
+    assert chunks == []
+    assert connections == 0
+
+
+def test_stream_resumes_and_sends_heartbeats(stream_db):
+    """Test reconnecting replays missed notifications then streams live ones."""
+    async def run():
+        broker = NotificationBroker()
+        await broker.start()
+        stream = notification_stream(broker, user_id=1, last_event_id=1, heartbeat=0.01)
+
+        chunks = [await stream.__anext__() for _ in range(3)]
+        # Already replayed, so not sent twice
+        broker.publish(NotificationEvent(event="notification", id=4, user_id=1, data={}))
+        broker.publish(NotificationEvent(event="notification", id=5, user_id=1, data={}))
+        chunks.append(await stream.__anext__())
+        chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks, broker.connection_count
+
+    chunks, connections = asyncio.run(run())
+    assert chunks[0].startswith("retry:")
+    assert [chunk.split("\n")[0] for chunk in chunks[1:]] == ["id: 2", "id: 4", "id: 5", ": ping"]
+    assert connections == 0
+
+
+def test_stream_resets_clients_too_far_behind(stream_db):
+    """Test a client missing more than the replay limit is told to reload."""
+    async def run():
+        broker = NotificationBroker()
+        await broker.start()
+        stream = notification_stream(broker, user_id=1, last_event_id=0, replay_limit=2)
+        chunks = [await stream.__anext__() for _ in range(4)]
+        await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert [chunk.split("\n")[0] for chunk in chunks[1:3]] == ["id: 1", "id: 2"]
+    assert chunks[3].startswith("event: reset")
@@ -2,5 +2,16 @@
 
 from .audit_service import AuditService
 from .models import AuditLog
+from .partitions import AuditPartitionManager, run_audit_partition_maintenance
+from .writer import AuditLogWriter, get_audit_writer, start_audit_writer, stop_audit_writer
 
-__all__ = ["AuditService", "AuditLog"]
\ No newline at end of file
+__all__ = [
+    "AuditService",
+    "AuditLog",
+    "AuditLogWriter",
+    "AuditPartitionManager",
+    "run_audit_partition_maintenance",
+    "get_audit_writer",
+    "start_audit_writer",
+    "stop_audit_writer",
+]
\ No newline at end of file
@@ -1,11 +1,14 @@
 """Audit service for logging user actions."""
 
 from typing import Optional, Dict, Any
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 from .models import AuditLog
+from .writer import get_audit_writer
+from backend.shared.utils.pagination import decode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +30,27 @@ class AuditService:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None
     ) -> AuditLog:
-        """Log an audit action."""
+        """Log an audit action.
+        
+        When the background audit writer is running the event is only queued,
+        and the returned AuditLog is not yet persisted.
+        """
+        writer = get_audit_writer()
+        if writer is not None:
+            event = {
+                "user_id": user_id,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "details": details,
+                "metadata": metadata,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "created_at": datetime.now(timezone.utc),
+            }
+            writer.submit(event)
+            return AuditLog(**event)
+        
         try:
             audit_log = AuditLog(
                 user_id=user_id,
@@ -178,9 +201,18 @@ class AuditService:
         action: Optional[str] = None,
         resource_type: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None
     ) -> list[AuditLog]:
-        """Get audit logs with filtering."""
+        """Get audit logs with filtering, newest first.
+        
+        Bounding the time range with since/until lets Postgres skip monthly
+        partitions outside it. Pass the cursor of the previous page instead of
+        an offset to page through large result sets at constant cost; the
+        offset is ignored when a cursor is given.
+        """
         query = self.db.query(AuditLog)
         
         if user_id:
@@ -189,5 +221,15 @@ class AuditService:
             query = query.filter(AuditLog.action == action)
         if resource_type:
             query = query.filter(AuditLog.resource_type == resource_type)
+        if since:
+            query = query.filter(AuditLog.created_at >= since)
+        if until:
+            query = query.filter(AuditLog.created_at < until)
+        if cursor:
+            created_at, log_id = decode_cursor(cursor)
+            query = query.filter(tuple_(AuditLog.created_at, AuditLog.id) < (created_at, log_id))
         
-        return query.order_by(AuditLog.created_at.desc()).offset(offset).limit(limit).all()
\ No newline at end of file
+        query = query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        if offset and not cursor:
+            query = query.offset(offset)
+        return query.limit(limit).all()
\ No newline at end of file
@@ -1,6 +1,6 @@
 """Audit logging models."""
 
-from sqlalchemy import Column, String, Text, DateTime, Integer, JSON
+from sqlalchemy import Column, String, Text, DateTime, Integer, JSON, Index
 from sqlalchemy.sql import func
 from backend.shared.database import Base
 
@@ -11,9 +11,9 @@ class AuditLog(Base):
     __tablename__ = "audit_logs"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String(100), nullable=True, index=True)
-    action = Column(String(100), nullable=False, index=True)
-    resource_type = Column(String(100), nullable=False, index=True)
+    user_id = Column(String(100), nullable=True)
+    action = Column(String(100), nullable=False)
+    resource_type = Column(String(100), nullable=False)
     resource_id = Column(String(100), nullable=True, index=True)
     details = Column(Text, nullable=True)
     metadata = Column(JSON, nullable=True)
@@ -21,6 +21,17 @@ class AuditLog(Base):
     user_agent = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     
+    # Cover the filter combinations of AuditService.get_audit_logs in
+    # (created_at, id) keyset order, so pages are read straight off an index
+    __table_args__ = (
+        Index("ix_audit_logs_user_id_created_at", user_id, created_at.desc(), id.desc()),
+        Index("ix_audit_logs_action_created_at", action, created_at.desc(), id.desc()),
+        Index(
+            "ix_audit_logs_resource_type_action_created_at",
+            resource_type, action, created_at.desc(), id.desc()
+        ),
+    )
+    
     def __repr__(self):
         return f"<AuditLog(id={self.id}, user_id='{self.user_id}', action='{self.action}')>"
     
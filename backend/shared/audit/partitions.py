@@ -0,0 +1,247 @@
+"""Monthly partition maintenance and archival for audit logs."""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME_RE = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+EXPORT_BATCH_SIZE = 5000
+
+
+def month_start(value: date) -> date:
+    """Get the first day of the month containing a date."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Move the first day of a month by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Get the name of the partition holding a month of audit logs."""
+    return f"{PARENT_TABLE}_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Get the month a partition holds from its name."""
+    match = PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+class AuditPartitionManager:
+    """Roll monthly audit_logs partitions forward and archive expired ones.
+
+    Only Postgres databases migrated to the partitioned table are managed;
+    on anything else every operation is a no-op.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_partitioned(self) -> bool:
+        """Check whether audit_logs is a partitioned table."""
+        if self.db.get_bind().dialect.name != "postgresql":
+            return False
+        return bool(self.db.execute(text(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+        ), {"table": PARENT_TABLE}).scalar())
+
+    def list_partitions(self) -> List[str]:
+        """List the attached monthly partitions, oldest first."""
+        if not self.is_partitioned():
+            return []
+
+        rows = self.db.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(:table)
+        """), {"table": PARENT_TABLE}).scalars()
+        return sorted(name for name in rows if partition_month(name))
+
+    def ensure_partitions(self, months_ahead: Optional[int] = None) -> List[str]:
+        """Create partitions from the current month up to months_ahead ahead.
+
+        Months with rows in the default partition get theirs too, and the
+        rows are moved into it.
+        """
+        if not self.is_partitioned():
+            return []
+
+        months_ahead = settings.audit_partition_months_ahead if months_ahead is None else months_ahead
+        existing = set(self.list_partitions())
+        current = month_start(datetime.now(timezone.utc).date())
+        months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+        stray_months = set(self.default_partition_months())
+
+        created = []
+        for month in sorted(months | stray_months):
+            name = partition_name(month)
+            if name in existing:
+                continue
+            self._create_partition(month, move_rows=month in stray_months)
+            created.append(name)
+
+        self.db.commit()
+        if created:
+            logger.info(f"Created audit log partitions: {', '.join(created)}")
+        return created
+
+    def default_partition_months(self) -> List[date]:
+        """List the months of rows that landed in the default partition."""
+        if not self.db.execute(text("SELECT to_regclass(:name)"), {"name": DEFAULT_PARTITION}).scalar():
+            return []
+        return list(self.db.execute(text(
+            f"SELECT DISTINCT date_trunc('month', created_at)::date FROM {DEFAULT_PARTITION}"
+        )).scalars())
+
+    def _create_partition(self, month: date, move_rows: bool = False) -> None:
+        """Create a month's partition, first taking its rows out of the default partition.
+
+        Postgres refuses to create a partition while the default partition
+        holds rows in its range, so they are parked in a temporary table and
+        inserted again once the partition exists.
+        """
+        name = partition_name(month)
+        start, end = month.isoformat(), add_months(month, 1).isoformat()
+        in_month = f"created_at >= '{start}' AND created_at < '{end}'"
+
+        if move_rows:
+            self.db.execute(text(
+                f"CREATE TEMP TABLE {name}_moving AS SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}"
+            ))
+            self.db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"))
+
+        self.db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+
+        if move_rows:
+            moved = self.db.execute(text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM {name}_moving")).rowcount
+            self.db.execute(text(f"DROP TABLE {name}_moving"))
+            logger.info(f"Moved {moved} audit logs from {DEFAULT_PARTITION} to {name}")
+
+    def expired_partitions(self, retention_months: Optional[int] = None) -> List[str]:
+        """List partitions whose whole month is past the retention period."""
+        retention_months = settings.audit_retention_months if retention_months is None else retention_months
+        cutoff = add_months(month_start(datetime.now(timezone.utc).date()), -retention_months)
+        return [
+            name for name in self.list_partitions()
+            if add_months(partition_month(name), 1) <= cutoff
+        ]
+
+    def archive_partition(self, name: str, archive_dir: Optional[str] = None) -> Path:
+        """Export a partition to a gzipped JSONL archive, then detach and drop it."""
+        if not partition_month(name):
+            raise ValueError(f"Not an audit log partition: {name}")
+
+        archive_path = Path(archive_dir or settings.audit_archive_dir) / f"{name}.jsonl.gz"
+        rows = export_table(self.db, name, archive_path)
+
+        # The partition is only removed once its archive is safely on disk
+        self.db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        self.db.execute(text(f"DROP TABLE {name}"))
+        self.db.commit()
+
+        logger.info(f"Archived {rows} audit logs from {name} to {archive_path}")
+        return archive_path
+
+    def archive_expired_partitions(
+        self,
+        retention_months: Optional[int] = None,
+        archive_dir: Optional[str] = None
+    ) -> List[Path]:
+        """Archive and drop every partition past the retention period."""
+        return [
+            self.archive_partition(name, archive_dir)
+            for name in self.expired_partitions(retention_months)
+        ]
+
+
+def export_table(db: Session, table_name: str, archive_path: Path) -> int:
+    """Stream every row of a table into a gzipped JSONL file."""
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = archive_path.with_name(f".{archive_path.name}.{uuid.uuid4().hex}.tmp")
+
+    rows = 0
+    try:
+        result = db.execute(
+            text(f"SELECT * FROM {table_name} ORDER BY created_at, id").execution_options(
+                stream_results=True, yield_per=EXPORT_BATCH_SIZE
+            )
+        )
+        with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+            for row in result.mappings():
+                f.write(json.dumps(_serialize_row(row), default=str) + "\n")
+                rows += 1
+        os.replace(temp_path, archive_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    return rows
+
+
+def _serialize_row(row: Any) -> Dict[str, Any]:
+    """Convert a database row into JSON-friendly values."""
+    data = dict(row)
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            data[key] = value.isoformat()
+        elif isinstance(value, str) and key == "metadata":
+            # JSON columns come back as text from some drivers
+            try:
+                data[key] = json.loads(value)
+            except ValueError:
+                pass
+    return data
+
+
+def maintain_partitions(db: Session) -> Dict[str, Any]:
+    """Roll partitions forward and archive expired ones."""
+    manager = AuditPartitionManager(db)
+    created = manager.ensure_partitions()
+    archived = manager.archive_expired_partitions()
+    return {"created": created, "archived": [str(path) for path in archived]}
+
+
+async def run_audit_partition_maintenance(interval: Optional[int] = None) -> None:
+    """Periodically maintain audit log partitions."""
+    from backend.shared.database import get_db_session
+
+    interval = interval or settings.audit_partition_maintenance_interval
+
+    def maintain() -> Dict[str, Any]:
+        db = get_db_session()
+        try:
+            return maintain_partitions(db)
+        finally:
+            db.close()
+
+    while True:
+        try:
+            await run_in_threadpool(maintain)
+        except Exception as e:
+            logger.error(f"Failed to maintain audit log partitions: {str(e)}")
+        await asyncio.sleep(interval)
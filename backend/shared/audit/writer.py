@@ -0,0 +1,291 @@
+"""Background writer that batches audit events into multi-row inserts."""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError, StatementError
+from sqlalchemy.orm import Session
+
+from .models import AuditLog
+from backend.shared.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditLogWriter:
+    """Write audit events from a bounded in-process queue.
+
+    Requests only pay for a queue put. A daemon thread collects events until
+    either ``batch_size`` events are waiting or the oldest one has waited
+    ``flush_interval`` seconds, then writes the batch with a single multi-row
+    INSERT on its own session. When the queue is full, producers wait up to
+    ``enqueue_timeout`` seconds before the event is appended to a local JSONL
+    spool file instead. The spool is replayed into the database the next time
+    the writer starts.
+
+    A batch that fails is retried one row at a time. Rows the database
+    rejects (a constraint violation or a bad value) go to a dead-letter file
+    for inspection, since replaying them would fail forever; rows that fail
+    for any other reason, e.g. the database being down, are spooled.
+
+    The spool is fsynced, but only events that reached it survive a crash:
+    whatever is still queued in memory is lost if the process dies without
+    ``stop()``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        enqueue_timeout: Optional[float] = None,
+        spool_path: Optional[str] = None,
+        dead_letter_path: Optional[str] = None
+    ):
+        if session_factory is None:
+            from backend.shared.database import SessionLocal
+            session_factory = SessionLocal
+
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.audit_batch_size
+        self.flush_interval = flush_interval if flush_interval is not None else settings.audit_flush_interval
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else settings.audit_enqueue_timeout
+        self.spool_path = Path(spool_path or settings.audit_spool_path)
+        self.dead_letter_path = Path(dead_letter_path or settings.audit_dead_letter_path)
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size or settings.audit_queue_size)
+        self.stats = {"written": 0, "spooled": 0, "replayed": 0, "failed_batches": 0, "dead_lettered": 0}
+
+        self._thread: Optional[threading.Thread] = None
+        self._spool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Check whether the writer thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Replay any spooled events and start the writer thread."""
+        if self.running:
+            return
+
+        self.replay_spool()
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop the writer after flushing everything already queued."""
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("Audit log writer did not stop in time; spooling queued events")
+            self._thread = None
+
+        # Events submitted while shutting down are spooled for the next start
+        remaining = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                remaining.append(item)
+        if remaining:
+            self._spool(remaining)
+
+    def submit(self, event: Dict[str, Any]) -> bool:
+        """Queue an audit event, spooling it to disk if the queue stays full."""
+        try:
+            if self.enqueue_timeout > 0:
+                self.queue.put(event, timeout=self.enqueue_timeout)
+            else:
+                self.queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self._spool([event])
+            return False
+
+    def _run(self) -> None:
+        """Collect events into batches and write them until stopped."""
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter; request threads and the writer thread both count."""
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _write(self, batch: List[Dict[str, Any]]) -> int:
+        """Insert a batch of events, falling back to one row at a time if it fails.
+
+        Returns how many events were written.
+        """
+        db = self.session_factory()
+        try:
+            try:
+                # executemany of a Core insert is sent as multi-row INSERT statements
+                db.execute(AuditLog.__table__.insert(), batch)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                self._count("failed_batches")
+                logger.error(f"Failed to write {len(batch)} audit logs, retrying them one by one: {str(e)}")
+                return self._write_rows(db, batch)
+            self._count("written", len(batch))
+            return len(batch)
+        finally:
+            db.close()
+
+    def _write_rows(self, db: Session, batch: List[Dict[str, Any]]) -> int:
+        """Insert events one by one, dead-lettering rejected ones and spooling the rest."""
+        written = 0
+        rejected = []
+        for index, event in enumerate(batch):
+            try:
+                db.execute(AuditLog.__table__.insert(), [event])
+                db.commit()
+                written += 1
+            except Exception as e:
+                db.rollback()
+                if not _is_rejected(e):
+                    # The database itself is failing; keep the rest for the next replay
+                    self._spool(batch[index:])
+                    break
+                logger.error(f"Audit log rejected by the database, dead-lettering it: {str(e)}")
+                rejected.append(event)
+
+        self._count("written", written)
+        if rejected:
+            self._append(self.dead_letter_path, rejected)
+            self._count("dead_lettered", len(rejected))
+        return written
+
+    def _append(self, path: Path, events: List[Dict[str, Any]]) -> bool:
+        """Append events to a JSONL file and fsync it."""
+        lines = "".join(json.dumps(event, default=_json_default) + "\n" for event in events)
+        try:
+            with self._spool_lock:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write {len(events)} audit logs to {path}: {str(e)}")
+            return False
+
+    def _spool(self, events: List[Dict[str, Any]]) -> None:
+        """Append events to the local spool file."""
+        if self._append(self.spool_path, events):
+            self._count("spooled", len(events))
+
+    def replay_spool(self) -> int:
+        """Write spooled events to the database and remove the spool file."""
+        replay_path = self.spool_path.with_name(self.spool_path.name + ".replay")
+        with self._spool_lock:
+            if self.spool_path.exists() and not replay_path.exists():
+                os.replace(self.spool_path, replay_path)
+        if not replay_path.exists():
+            return 0
+
+        events = []
+        with open(replay_path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    events.append(_load_event(line))
+                except ValueError:
+                    # A crash can leave a truncated final line behind
+                    logger.warning(f"Skipping unreadable audit spool line {line_number}")
+
+        replayed = 0
+        for start in range(0, len(events), self.batch_size):
+            replayed += self._write(events[start:start + self.batch_size])
+
+        # Events that failed again were spooled back or dead-lettered by _write
+        replay_path.unlink(missing_ok=True)
+        self._count("replayed", replayed)
+        if events:
+            logger.info(f"Replayed {replayed} of {len(events)} spooled audit logs")
+        return replayed
+
+
+def _is_rejected(error: Exception) -> bool:
+    """Tell whether an insert failed because of the event rather than the database."""
+    if isinstance(error, (IntegrityError, DataError)):
+        return True
+    # Values that can't be bound fail before the statement reaches the database
+    return isinstance(error, StatementError) and not isinstance(error, DBAPIError)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values JSON doesn't handle natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _load_event(line: str) -> Dict[str, Any]:
+    """Parse a spooled event back into insert parameters."""
+    event = json.loads(line)
+    if event.get("created_at"):
+        event["created_at"] = datetime.fromisoformat(event["created_at"])
+    return event
+
+
+_writer: Optional[AuditLogWriter] = None
+
+
+def get_audit_writer() -> Optional[AuditLogWriter]:
+    """Get the running audit writer, if there is one."""
+    if _writer is not None and _writer.running:
+        return _writer
+    return None
+
+
+def start_audit_writer(**kwargs) -> AuditLogWriter:
+    """Start the process-wide audit writer."""
+    global _writer
+    if _writer is None:
+        _writer = AuditLogWriter(**kwargs)
+    _writer.start()
+    return _writer
+
+
+def stop_audit_writer(timeout: Optional[float] = 10.0) -> None:
+    """Flush and stop the process-wide audit writer."""
+    global _writer
+    if _writer is not None:
+        _writer.stop(timeout)
+        _writer = None
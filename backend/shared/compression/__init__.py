@@ -0,0 +1,77 @@
+"""Response compression with zstd, brotli or gzip."""
+
+from fastapi import FastAPI
+# httpx keeps its decoder table private; it is the only record of what it can decode
+from httpx._decoders import SUPPORTED_DECODERS
+
+from backend.shared.config import settings
+from .codecs import (
+    BrotliCodec,
+    Codec,
+    GzipCodec,
+    StreamCompressor,
+    ZstdCodec,
+    available_codecs,
+    negotiate,
+    parse_accept_encoding,
+)
+from .middleware import CompressionMiddleware, is_compressible
+
+
+def get_codecs():
+    """Build the configured codecs that are installed, in preference order."""
+    levels = {
+        "zstd": settings.compression_zstd_level,
+        "br": settings.compression_brotli_level,
+        "gzip": settings.compression_gzip_level,
+    }
+    return available_codecs(levels, settings.compression_encodings)
+
+
+def accept_encoding() -> str:
+    """Get the Accept-Encoding header for calls to other services.
+
+    Lists the codings httpx can decode here, whatever this service sends
+    itself; httpx hands back any other coding as raw bytes.
+    """
+    codings = []
+    for name in ("zstd", "br", "gzip"):
+        decoder = SUPPORTED_DECODERS.get(name)
+        if decoder is None:
+            continue
+        try:
+            decoder()
+        except ImportError:  # the decoder's library isn't installed
+            continue
+        codings.append(name)
+    return ", ".join(codings) or "identity"
+
+
+def setup_compression(app: FastAPI) -> None:
+    """Compress responses of at least COMPRESSION_MIN_SIZE bytes."""
+    if not settings.compression_enabled:
+        return
+
+    app.add_middleware(
+        CompressionMiddleware,
+        codecs=get_codecs(),
+        minimum_size=settings.compression_min_size,
+        offload_size=settings.compression_offload_size,
+    )
+
+
+__all__ = [
+    "BrotliCodec",
+    "Codec",
+    "CompressionMiddleware",
+    "GzipCodec",
+    "StreamCompressor",
+    "ZstdCodec",
+    "accept_encoding",
+    "available_codecs",
+    "get_codecs",
+    "is_compressible",
+    "negotiate",
+    "parse_accept_encoding",
+    "setup_compression",
+]
@@ -0,0 +1,157 @@
+"""Content codings for HTTP responses: zstd, brotli and gzip."""
+
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; clients fall back to br or gzip
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; clients fall back to gzip
+    brotli = None
+
+
+class Codec:
+    """One content coding: one-shot compression and a streaming compressor."""
+
+    name: str
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def compressor(self) -> "StreamCompressor":
+        raise NotImplementedError
+
+
+class StreamCompressor:
+    """Compress a body chunk by chunk.
+
+    ``compress`` returns everything needed to decode the chunk so far, so
+    streamed responses reach the client as they are produced; ``finish``
+    ends the stream.
+    """
+
+    def compress(self, chunk: bytes) -> bytes:
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        raise NotImplementedError
+
+
+class _ZlibStream(StreamCompressor):
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def compressor(self) -> StreamCompressor:
+        return _ZlibStream(self.level)
+
+
+class _BrotliStream(StreamCompressor):
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class BrotliCodec(Codec):
+    name = "br"
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.level)
+
+    def compressor(self) -> StreamCompressor:
+        return _BrotliStream(self.level)
+
+
+class _ZstdStream(StreamCompressor):
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+
+    def compress(self, data: bytes) -> bytes:
+        # ZstdCompressor objects can't be shared between threads
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def compressor(self) -> StreamCompressor:
+        return _ZstdStream(self.level)
+
+
+def available_codecs(levels: Dict[str, int], names: Iterable[str]) -> Dict[str, Codec]:
+    """Build the codecs for names, in order, skipping those whose library isn't installed."""
+    classes = {"gzip": GzipCodec}
+    if brotli is not None:
+        classes["br"] = BrotliCodec
+    if zstandard is not None:
+        classes["zstd"] = ZstdCodec
+    return {name: classes[name](levels[name]) for name in names if name in classes}
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into coding -> q-value."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header: Optional[str], preference: List[str]) -> Optional[str]:
+    """Pick the coding for a response, or None to send it as is.
+
+    The client's q-values decide; among equal ones our preference order
+    does. ``*`` stands for any coding the client didn't list.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in preference:
+        q = accepted.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
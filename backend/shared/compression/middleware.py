@@ -0,0 +1,153 @@
+"""ASGI middleware that compresses responses."""
+
+from typing import Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .codecs import Codec, StreamCompressor, negotiate
+
+# Media types worth compressing. Already compressed formats are left out, and so
+# are event streams, which mustn't be held back to fill a buffer.
+COMPRESSIBLE_TYPES = (
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "text/xml",
+    "text/javascript",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    """Tell whether a Content-Type is worth compressing."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json") or media_type.endswith("+xml")
+
+
+class CompressionMiddleware:
+    """Compress responses with the best coding the client accepts.
+
+    Bodies under ``minimum_size`` are sent as they are. Streamed bodies
+    are buffered up to ``minimum_size``, then compressed chunk by chunk
+    and flushed as they go. Compressing ``offload_size`` bytes or more at
+    once runs in the thread pool, so a large listing doesn't stall the
+    event loop for every other request.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        codecs: Dict[str, Codec],
+        minimum_size: int = 1024,
+        offload_size: int = 64 * 1024
+    ):
+        self.app = app
+        self.codecs = codecs
+        self.preference = list(codecs)
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.codecs:
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate(Headers(scope=scope).get("accept-encoding"), self.preference)
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, self.codecs[coding], send)
+        await self.app(scope, receive, responder.send)
+
+    async def run(self, func, data: bytes) -> bytes:
+        """Run a compression step, off the event loop if data is large."""
+        if len(data) >= self.offload_size:
+            return await run_in_threadpool(func, data)
+        return func(data)
+
+
+class _CompressingResponder:
+    """Send wrapper for one response."""
+
+    def __init__(self, middleware: CompressionMiddleware, codec: Codec, send: Send):
+        self.middleware = middleware
+        self.codec = codec
+        self._send = send
+        self.start: Optional[Message] = None
+        self.active = False
+        self.buffer = bytearray()
+        self.stream: Optional[StreamCompressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if (
+                message["status"] < 200
+                or message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            ):
+                await self._send(message)
+                return
+            # Hold the start until the body shows whether to compress
+            self.start = message
+            self.active = True
+            return
+
+        if message["type"] != "http.response.body" or not self.active:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None:
+            self.buffer.extend(body)
+            if not more_body:
+                await self._send_whole(bytes(self.buffer))
+            elif len(self.buffer) >= self.middleware.minimum_size:
+                await self._start_stream()
+            return
+
+        chunk = await self.middleware.run(self.stream.compress, body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _send_whole(self, body: bytes) -> None:
+        """Send a complete body, compressed if it is large enough."""
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers.add_vary_header("Accept-Encoding")
+        if len(body) >= self.middleware.minimum_size:
+            body = await self.middleware.run(self.codec.compress, body)
+            self._set_encoding(headers)
+            headers["content-length"] = str(len(body))
+        await self._send({**self.start, "headers": headers.raw})
+        await self._send({"type": "http.response.body", "body": body, "more_body": False})
+
+    async def _start_stream(self) -> None:
+        """Switch a streamed body, buffered up to the threshold, to chunked compression."""
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers.add_vary_header("Accept-Encoding")
+        self._set_encoding(headers)
+        if "content-length" in headers:
+            del headers["content-length"]
+        self.stream = self.codec.compressor()
+        chunk = await self.middleware.run(self.stream.compress, bytes(self.buffer))
+        self.buffer.clear()
+        await self._send({**self.start, "headers": headers.raw})
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+    def _set_encoding(self, headers: MutableHeaders) -> None:
+        headers["content-encoding"] = self.codec.name
+        # A strong ETag names exact bytes, which these no longer are
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
@@ -1,11 +1,19 @@
 """Database configuration and utilities."""
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool, NullPool
 
 from backend.shared.config import settings
+from .instrumentation import (
+    QueryStats,
+    QueryStatsMiddleware,
+    get_query_stats,
+    instrument_queries,
+    query_budget,
+    track_queries,
+)
 
 # Create database engine with proper connection pooling
 if "sqlite" in settings.database_url:
@@ -28,6 +36,9 @@ else:
         echo=settings.debug,
     )
 
+# Time every statement for slow-query logs and per-request stats
+instrument_queries(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -43,7 +54,7 @@ def get_db():
     db = SessionLocal()
     try:
         # Test connection health
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         yield db
     except Exception as e:
         db.rollback()
@@ -61,7 +72,7 @@ def check_db_health() -> bool:
     """Check database connection health."""
     try:
         db = get_db_session()
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         db.close()
         return True
     except Exception:
@@ -76,3 +87,22 @@ def create_tables():
 def drop_tables():
     """Drop all tables."""
     Base.metadata.drop_all(bind=engine)
+
+
+__all__ = [
+    "Base",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "SessionLocal",
+    "check_db_health",
+    "create_tables",
+    "drop_tables",
+    "engine",
+    "get_db",
+    "get_db_session",
+    "get_query_stats",
+    "instrument_queries",
+    "metadata",
+    "query_budget",
+    "track_queries",
+]
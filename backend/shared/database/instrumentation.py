@@ -0,0 +1,219 @@
+"""Per-request SQL query statistics, slow-query logging and N+1 detection."""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.shared.config import settings
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST_RE = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+|%s)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+|%s))+\s*\)")
+_POSTCOMPILE_RE = re.compile(r"\(__\[POSTCOMPILE_\w+\]\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape, so repeats compare equal.
+
+    Comments (such as trace context) are dropped, whitespace is collapsed,
+    inline literals become ``?`` and IN lists of any length become ``(?...)``.
+    """
+    if "/*" in statement:
+        # Stripped before the cache, as commented statements are all unique
+        statement = _COMMENT_RE.sub("", statement)
+    return _normalize_sql(statement)
+
+
+@lru_cache(maxsize=2048)
+def _normalize_sql(statement: str) -> str:
+    sql = _WHITESPACE_RE.sub(" ", statement).strip()
+    sql = _LITERAL_RE.sub("?", sql)
+    sql = _POSTCOMPILE_RE.sub("(?...)", sql)
+    return _IN_LIST_RE.sub("(?...)", sql)
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Describe bound parameters by type only, so values never reach the logs."""
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = parameter_shape(parameters[0]) if parameters else None
+        return f"{len(parameters)} x {first}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+@dataclass
+class QueryStats:
+    """Queries run while handling one request."""
+
+    count: int = 0
+    total_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    slow_queries: List[str] = field(default_factory=list)
+    n_plus_one: List[str] = field(default_factory=list)
+
+    def record(self, sql: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.statements[sql] += 1
+        if self.statements[sql] == settings.n_plus_one_threshold:
+            self.n_plus_one.append(sql)
+            logger.warning(
+                f"Possible N+1: statement ran {settings.n_plus_one_threshold} times in one request: {sql}"
+            )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """Get the statistics of the request being handled, if tracked."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statistics for queries run in this context."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Time every statement an engine runs.
+
+    Statements are added to the current request's QueryStats, and any
+    slower than SLOW_QUERY_THRESHOLD_MS are logged with their normalized
+    SQL and parameter types.
+    """
+    if getattr(engine, "_query_stats_instrumented", False):
+        return
+    engine._query_stats_instrumented = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _current_stats.get()
+        threshold = settings.slow_query_threshold_ms / 1000
+        if stats is None and duration < threshold:
+            return
+
+        sql = normalize_sql(statement)
+        if stats is not None:
+            stats.record(sql, duration)
+        if duration >= threshold:
+            if stats is not None:
+                stats.slow_queries.append(sql)
+            logger.warning(
+                f"Slow query ({duration * 1000:.1f} ms): {sql} "
+                f"parameters={parameter_shape(parameters, executemany)}"
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Keep the timing stack balanced when a statement fails
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+class QueryStatsMiddleware:
+    """Track the queries of every HTTP request.
+
+    Requests that look like N+1 are logged with their path. In debug mode
+    the counts are also sent back in a ``Server-Timing`` header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start" and settings.debug:
+                    headers = list(message.get("headers", []))
+                    headers.append((
+                        b"server-timing",
+                        f'db;dur={stats.total_time * 1000:.1f};desc="{stats.count} queries"'.encode(),
+                    ))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if stats.n_plus_one:
+                    logger.warning(
+                        f"{scope['method']} {scope['path']} ran {stats.count} queries "
+                        f"({len(stats.n_plus_one)} repeated statements)"
+                    )
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More queries ran than a test allowed."""
+
+
+@contextmanager
+def query_budget(
+    max_queries: int,
+    engine: Optional[Engine] = None,
+    allow_repeats: bool = True
+) -> Iterator[QueryStats]:
+    """Fail if a block runs more than max_queries statements.
+
+    Meant for tests::
+
+        with query_budget(3):
+            client.put(f"/api/v1/items/{item.id}", json=data)
+
+    Every statement on the engine counts, whichever thread runs it, so it
+    works with TestClient. With ``allow_repeats=False`` any statement run
+    twice fails as well.
+    """
+    if engine is None:
+        from backend.shared.database import engine
+
+    stats = QueryStats()
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats.count += 1
+        stats.statements[normalize_sql(statement)] += 1
+
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield stats
+    finally:
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+    statements = "\n".join(f"  {count} x {sql}" for sql, count in stats.statements.most_common())
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(f"Expected at most {max_queries} queries, ran {stats.count}:\n{statements}")
+    repeated = [sql for sql, count in stats.statements.items() if count > 1]
+    if repeated and not allow_repeats:
+        raise QueryBudgetExceeded(f"Statements ran more than once:\n{statements}")
@@ -0,0 +1,132 @@
+"""Partition audit_logs by month
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-01-01 00:07:00.000000
+
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Months of empty partitions created ahead of the current month
+MONTHS_AHEAD = 3
+
+AUDIT_COLUMNS = (
+    "id, created_at, updated_at, user_id, action, resource_type, resource_id, "
+    "details, metadata, ip_address, user_agent"
+)
+AUDIT_INDEXES = ['id', 'user_id', 'action', 'resource_type', 'resource_id', 'created_at']
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # Range partitioning is Postgres-only; other databases keep the plain table
+        return
+
+    op.drop_constraint('fk_audit_logs_user_id', 'audit_logs', type_='foreignkey')
+    for column in AUDIT_INDEXES:
+        op.drop_index(op.f(f'ix_audit_logs_{column}'), table_name='audit_logs')
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute("ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey")
+    # Keep the id sequence so ids continue where the old table left off
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE,
+            user_id VARCHAR(100),
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(100) NOT NULL,
+            resource_id VARCHAR(100),
+            details TEXT,
+            metadata JSON,
+            ip_address VARCHAR(45),
+            user_agent TEXT,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+
+    # Create monthly partitions covering existing rows and the next few months
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_unpartitioned")).scalar()
+    today = datetime.now(timezone.utc).date()
+    month = (oldest.date() if oldest else today).replace(day=1)
+    last = _add_months(today.replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+
+    # Indexes created on the parent are created on every partition
+    for column in AUDIT_INDEXES:
+        op.create_index(op.f(f'ix_audit_logs_{column}'), 'audit_logs', [column], unique=False)
+    op.create_foreign_key('fk_audit_logs_user_id', 'audit_logs', 'users', ['user_id'], ['id'])
+
+    op.execute(f"""
+        INSERT INTO audit_logs ({AUDIT_COLUMNS})
+        SELECT id, coalesce(created_at, now()), updated_at, user_id, action, resource_type,
+               resource_id, details, metadata, ip_address, user_agent
+        FROM audit_logs_unpartitioned
+    """)
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.drop_constraint('fk_audit_logs_user_id', 'audit_logs_partitioned', type_='foreignkey')
+    for column in AUDIT_INDEXES:
+        op.drop_index(op.f(f'ix_audit_logs_{column}'), table_name='audit_logs_partitioned')
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE,
+            user_id VARCHAR(100),
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(100) NOT NULL,
+            resource_id VARCHAR(100),
+            details TEXT,
+            metadata JSON,
+            ip_address VARCHAR(45),
+            user_agent TEXT,
+            CONSTRAINT audit_logs_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute(f"""
+        INSERT INTO audit_logs ({AUDIT_COLUMNS})
+        SELECT {AUDIT_COLUMNS} FROM audit_logs_partitioned
+    """)
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+
+    for column in AUDIT_INDEXES:
+        op.create_index(op.f(f'ix_audit_logs_{column}'), 'audit_logs', [column], unique=False)
+    op.create_foreign_key('fk_audit_logs_user_id', 'audit_logs', 'users', ['user_id'], ['id'])
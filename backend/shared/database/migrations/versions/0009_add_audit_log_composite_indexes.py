@@ -0,0 +1,47 @@
+"""Add composite indexes for audit log queries
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-01-01 00:08:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite indexes in (created_at, id) keyset order for each filter combination
+    op.create_index(
+        'ix_audit_logs_user_id_created_at', 'audit_logs',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+    op.create_index(
+        'ix_audit_logs_action_created_at', 'audit_logs',
+        ['action', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+    op.create_index(
+        'ix_audit_logs_resource_type_action_created_at', 'audit_logs',
+        ['resource_type', 'action', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+
+    # The single-column indexes are prefixes of the composite ones
+    op.drop_index(op.f('ix_audit_logs_user_id'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_action'), table_name='audit_logs')
+    op.drop_index(op.f('ix_audit_logs_resource_type'), table_name='audit_logs')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_audit_logs_resource_type'), 'audit_logs', ['resource_type'], unique=False)
+    op.create_index(op.f('ix_audit_logs_action'), 'audit_logs', ['action'], unique=False)
+    op.create_index(op.f('ix_audit_logs_user_id'), 'audit_logs', ['user_id'], unique=False)
+
+    op.drop_index('ix_audit_logs_resource_type_action_created_at', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_action_created_at', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_user_id_created_at', table_name='audit_logs')
@@ -0,0 +1,48 @@
+"""Add notification unread counters
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2024-01-01 00:09:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bring notifications in line with the notification service model, which
+    # tracks read state with is_read and doesn't set channel or status
+    op.add_column('notifications', sa.Column('is_read', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.execute("UPDATE notifications SET is_read = (read_at IS NOT NULL)")
+    op.alter_column('notifications', 'channel', server_default='in_app')
+    op.alter_column('notifications', 'status', server_default='sent')
+
+    # Create notification_counters table
+    op.create_table('notification_counters',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Seed counters from the current unread notifications
+    op.execute("""
+        INSERT INTO notification_counters (user_id, unread_count)
+        SELECT user_id, count(*) FROM notifications WHERE NOT is_read GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    # Drop notification_counters table
+    op.drop_table('notification_counters')
+
+    op.alter_column('notifications', 'status', server_default=None)
+    op.alter_column('notifications', 'channel', server_default=None)
+    op.drop_column('notifications', 'is_read')
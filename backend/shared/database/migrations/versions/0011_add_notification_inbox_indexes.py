@@ -0,0 +1,45 @@
+"""Add notification inbox indexes
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2024-01-01 00:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so the inbox keeps serving while they build
+    with op.get_context().autocommit_block():
+        # Inbox in (created_at, id) keyset order
+        op.create_index(
+            'ix_notifications_user_id_created_at', 'notifications',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False,
+            postgresql_concurrently=True
+        )
+        # Unread only: small, and answers unread counts from the index alone
+        op.create_index(
+            'ix_notifications_user_id_unread', 'notifications',
+            ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False,
+            postgresql_where=sa.column('is_read') == sa.false(),
+            sqlite_where=sa.column('is_read') == sa.false(),
+            postgresql_concurrently=True
+        )
+
+    # The single-column index is a prefix of the composite one
+    op.drop_index(op.f('ix_notifications_user_id'), table_name='notifications')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_notifications_user_id'), 'notifications', ['user_id'], unique=False)
+
+    op.drop_index('ix_notifications_user_id_unread', table_name='notifications')
+    op.drop_index('ix_notifications_user_id_created_at', table_name='notifications')
@@ -0,0 +1,45 @@
+"""Add a default partition to audit_logs
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2024-01-01 00:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def _is_partitioned(bind) -> bool:
+    return bool(bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs')"
+    )).scalar())
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not _is_partitioned(bind):
+        return
+
+    # Catches rows dated past the last monthly partition until maintenance
+    # creates theirs and moves them over
+    op.execute("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not _is_partitioned(bind):
+        return
+
+    rows = bind.execute(sa.text("SELECT count(*) FROM audit_logs_default")).scalar()
+    if rows:
+        raise RuntimeError(
+            f"audit_logs_default still holds {rows} rows; run partition maintenance to move them first"
+        )
+    op.execute("DROP TABLE audit_logs_default")
@@ -1,6 +1,14 @@
 """Email utilities and services."""
 
+from .delivery import SMTPDeliveryQueue, get_delivery_queue, start_email_delivery, stop_email_delivery
 from .email_service import EmailService
 from .templates import EmailTemplates
 
-__all__ = ["EmailService", "EmailTemplates"]
\ No newline at end of file
+__all__ = [
+    "EmailService",
+    "EmailTemplates",
+    "SMTPDeliveryQueue",
+    "get_delivery_queue",
+    "start_email_delivery",
+    "stop_email_delivery",
+]
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""Pooled, asynchronous SMTP delivery."""
+
+import logging
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from email.message import Message
+from typing import Any, Dict, List, Optional
+
+from backend.shared.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class SMTPConnection:
+    """A reusable, authenticated SMTP session."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = True,
+        timeout: float = 30
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._server: Optional[smtplib.SMTP] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._server is not None
+
+    def open(self) -> None:
+        """Connect, upgrade to TLS and log in."""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.use_tls:
+                server.starttls(context=ssl.create_default_context())
+                server.ehlo()
+            if self.username:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def close(self) -> None:
+        """Say goodbye to the server and drop the connection."""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+    def send(self, msg: Message) -> None:
+        """Send a message, reconnecting once if the server dropped the session."""
+        if self._server is None:
+            self.open()
+        try:
+            self._server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._server = None
+            self.open()
+            self._server.send_message(msg)
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Check whether retrying a failed delivery is pointless."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
+
+
+class SMTPDeliveryQueue:
+    """Deliver mail from an in-process queue over pooled SMTP sessions.
+
+    Each worker thread keeps its own authenticated connection open and reuses
+    it for every message it sends, closing it after ``idle_timeout`` seconds
+    without work. Transient failures are retried with exponential backoff;
+    5xx responses are not.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_tls: Optional[bool] = None,
+        workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        timeout: Optional[float] = None
+    ):
+        self.connection_options = {
+            "host": host or settings.smtp_server,
+            "port": port or settings.smtp_port,
+            "username": settings.smtp_username if username is None else username,
+            "password": settings.smtp_password if password is None else password,
+            "use_tls": settings.smtp_use_tls if use_tls is None else use_tls,
+            "timeout": timeout or settings.smtp_timeout,
+        }
+        self.workers = workers or settings.smtp_pool_size
+        self.max_retries = settings.smtp_max_retries if max_retries is None else max_retries
+        self.retry_backoff = settings.smtp_retry_backoff if retry_backoff is None else retry_backoff
+        self.idle_timeout = idle_timeout or settings.smtp_idle_timeout
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size or settings.smtp_queue_size)
+
+        self._threads: List[threading.Thread] = []
+        self._retry_timers: Dict[int, threading.Timer] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "queued": 0,
+            "sent": 0,
+            "failed": 0,
+            "retried": 0,
+            "dropped": 0,
+            "connections_opened": 0,
+        }
+        self._total_latency = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Check whether any worker thread is alive."""
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        if self.running:
+            return
+        self._threads = [
+            threading.Thread(target=self._run, name=f"smtp-delivery-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """Deliver everything already queued, then stop the workers."""
+        with self._lock:
+            timers = list(self._retry_timers.values())
+            self._retry_timers.clear()
+        for timer in timers:
+            timer.cancel()
+        if timers:
+            logger.warning(f"Dropping {len(timers)} emails waiting to be retried")
+
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, msg: Message, timeout: Optional[float] = 0) -> bool:
+        """Queue a message for delivery without waiting for it to be sent.
+        
+        A full queue drops the message straight away unless ``timeout`` is
+        given, in which case the caller waits up to that many seconds (or
+        forever, for None) for a worker to free up room.
+        """
+        try:
+            if timeout == 0:
+                self.queue.put_nowait((msg, 0, time.monotonic()))
+            else:
+                self.queue.put((msg, 0, time.monotonic()), timeout=timeout)
+        except queue.Full:
+            self._count("dropped")
+            logger.error(f"Email queue is full, dropping email to {msg['To']}")
+            return False
+        self._count("queued")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delivery counters and the current queue depth."""
+        with self._lock:
+            stats = dict(self._stats)
+            sent = stats["sent"]
+            stats["avg_delivery_seconds"] = round(self._total_latency / sent, 4) if sent else 0.0
+        stats["queue_depth"] = self.queue.qsize()
+        stats["pending_retries"] = len(self._retry_timers)
+        return stats
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _run(self) -> None:
+        """Send queued messages over one persistent connection."""
+        connection = SMTPConnection(**self.connection_options)
+        try:
+            while True:
+                try:
+                    item = self.queue.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    connection.close()
+                    continue
+                if item is _STOP:
+                    break
+                self._deliver(connection, *item)
+        finally:
+            connection.close()
+
+    def _deliver(self, connection: SMTPConnection, msg: Message, attempt: int, queued_at: float) -> None:
+        """Send one message, scheduling a retry on transient failures."""
+        try:
+            if not connection.connected:
+                self._count("connections_opened")
+            connection.send(msg)
+        except Exception as e:
+            # Don't reuse a session left in an unknown state
+            connection.close()
+            if _is_permanent(e) or attempt >= self.max_retries:
+                self._count("failed")
+                logger.error(f"Failed to send email to {msg['To']} after {attempt + 1} attempts: {str(e)}")
+            else:
+                self._schedule_retry(msg, attempt + 1, queued_at)
+            return
+
+        with self._lock:
+            self._stats["sent"] += 1
+            self._total_latency += time.monotonic() - queued_at
+        logger.info(f"Email sent successfully to {msg['To']}")
+
+    def _schedule_retry(self, msg: Message, attempt: int, queued_at: float) -> None:
+        """Re-queue a message after an exponential backoff delay."""
+        delay = self.retry_backoff * (2 ** (attempt - 1))
+        self._count("retried")
+        logger.warning(f"Retrying email to {msg['To']} in {delay:.1f}s (attempt {attempt + 1})")
+
+        def requeue() -> None:
+            with self._lock:
+                self._retry_timers.pop(id(timer), None)
+            try:
+                self.queue.put_nowait((msg, attempt, queued_at))
+            except queue.Full:
+                self._count("dropped")
+                logger.error(f"Email queue is full, dropping retry to {msg['To']}")
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        with self._lock:
+            self._retry_timers[id(timer)] = timer
+        timer.start()
+
+
+_delivery_queue: Optional[SMTPDeliveryQueue] = None
+
+
+def get_delivery_queue() -> Optional[SMTPDeliveryQueue]:
+    """Get the running delivery queue, if there is one."""
+    if _delivery_queue is not None and _delivery_queue.running:
+        return _delivery_queue
+    return None
+
+
+def start_email_delivery(**kwargs) -> SMTPDeliveryQueue:
+    """Start the process-wide email delivery queue."""
+    global _delivery_queue
+    if _delivery_queue is None:
+        _delivery_queue = SMTPDeliveryQueue(**kwargs)
+    _delivery_queue.start()
+    return _delivery_queue
+
+
+def stop_email_delivery(timeout: Optional[float] = 30.0) -> None:
+    """Flush and stop the process-wide email delivery queue."""
+    global _delivery_queue
+    if _delivery_queue is not None:
+        _delivery_queue.stop(timeout)
+        _delivery_queue = None
@@ -1,197 +1,43 @@
 """Email service for sending emails."""
 
-import smtplib
-import ssl
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional, Dict, Any
+from itertools import repeat
+from typing import Optional, Dict, Any, Iterable, Tuple
 import logging
-from jinja2 import Template
 
 from backend.shared.config import settings
+from .delivery import SMTPConnection, get_delivery_queue
+from .templates import TEMPLATES, EmailTemplates, render_many
 
 logger = logging.getLogger(__name__)
 
 
-class EmailTemplates:
-    """Email templates for various email types."""
-    
-    @staticmethod
-    def get_verification_email_html(user_name: str, verification_url: str) -> str:
-        """Get HTML content for verification email."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Verify Your Email - AliFrzngn Development</title>
-        </head>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #2c3e50;">Welcome to AliFrzngn Development!</h2>
-                <p>Hello {user_name},</p>
-                <p>Thank you for registering with AliFrzngn Development. Please verify your email address by clicking the button below:</p>
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{verification_url}" style="background-color: #3498db; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; display: inline-block;">Verify Email Address</a>
-                </div>
-                <p>If the button doesn't work, you can copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; color: #666;">{verification_url}</p>
-                <p>This link will expire in 24 hours.</p>
-                <p>If you didn't create an account with us, please ignore this email.</p>
-                <hr style="margin: 30px 0; border: none; border-top: 1px solid #eee;">
-                <p style="font-size: 12px; color: #666;">© 2025 AliFrzngn Development. All rights reserved.</p>
-            </div>
-        </body>
-        </html>
-        """
-    
-    @staticmethod
-    def get_verification_email_text(user_name: str, verification_url: str) -> str:
-        """Get text content for verification email."""
-        return f"""
-        Welcome to AliFrzngn Development!
-        
-        Hello {user_name},
-        
-        Thank you for registering with AliFrzngn Development. Please verify your email address by visiting the following link:
-        
-        {verification_url}
-        
-        This link will expire in 24 hours.
-        
-        If you didn't create an account with us, please ignore this email.
-        
-        Best regards,
-        AliFrzngn Development Team
-        """
-    
-    @staticmethod
-    def get_password_reset_email_html(user_name: str, reset_url: str) -> str:
-        """Get HTML content for password reset email."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Reset Your Password - AliFrzngn Development</title>
-        </head>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #e74c3c;">Password Reset Request</h2>
-                <p>Hello {user_name},</p>
-                <p>We received a request to reset your password for your AliFrzngn Development account.</p>
-                <p>Click the button below to reset your password:</p>
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{reset_url}" style="background-color: #e74c3c; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; display: inline-block;">Reset Password</a>
-                </div>
-                <p>If the button doesn't work, you can copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; color: #666;">{reset_url}</p>
-                <p>This link will expire in 1 hour for security reasons.</p>
-                <p>If you didn't request a password reset, please ignore this email and your password will remain unchanged.</p>
-                <hr style="margin: 30px 0; border: none; border-top: 1px solid #eee;">
-                <p style="font-size: 12px; color: #666;">© 2025 AliFrzngn Development. All rights reserved.</p>
-            </div>
-        </body>
-        </html>
-        """
-    
-    @staticmethod
-    def get_password_reset_email_text(user_name: str, reset_url: str) -> str:
-        """Get text content for password reset email."""
-        return f"""
-        Password Reset Request
-        
-        Hello {user_name},
-        
-        We received a request to reset your password for your AliFrzngn Development account.
-        
-        Please visit the following link to reset your password:
-        
-        {reset_url}
-        
-        This link will expire in 1 hour for security reasons.
-        
-        If you didn't request a password reset, please ignore this email and your password will remain unchanged.
-        
-        Best regards,
-        AliFrzngn Development Team
-        """
-    
-    @staticmethod
-    def get_welcome_email_html(user_name: str) -> str:
-        """Get HTML content for welcome email."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <title>Welcome to AliFrzngn Development!</title>
-        </head>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: #27ae60;">Welcome to AliFrzngn Development!</h2>
-                <p>Hello {user_name},</p>
-                <p>Congratulations! Your email has been successfully verified and your account is now active.</p>
-                <p>You can now access all features of our platform:</p>
-                <ul>
-                    <li>Browse our product inventory</li>
-                    <li>Manage your customer profile</li>
-                    <li>Access exclusive features</li>
-                </ul>
-                <div style="text-align: center; margin: 30px 0;">
-                    <a href="{settings.frontend_url}" style="background-color: #27ae60; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; display: inline-block;">Get Started</a>
-                </div>
-                <p>If you have any questions, feel free to contact our support team.</p>
-                <hr style="margin: 30px 0; border: none; border-top: 1px solid #eee;">
-                <p style="font-size: 12px; color: #666;">© 2025 AliFrzngn Development. All rights reserved.</p>
-            </div>
-        </body>
-        </html>
-        """
-    
-    @staticmethod
-    def get_welcome_email_text(user_name: str) -> str:
-        """Get text content for welcome email."""
-        return f"""
-        Welcome to AliFrzngn Development!
-        
-        Hello {user_name},
-        
-        Congratulations! Your email has been successfully verified and your account is now active.
-        
-        You can now access all features of our platform:
-        - Browse our product inventory
-        - Manage your customer profile
-        - Access exclusive features
-        
-        Visit our platform: {settings.frontend_url}
-        
-        If you have any questions, feel free to contact our support team.
-        
-        Best regards,
-        AliFrzngn Development Team
-        """
-
-
 class EmailService:
     """Email service for sending various types of emails."""
     
     def __init__(self):
-        self.smtp_server = getattr(settings, 'SMTP_SERVER', 'smtp.gmail.com')
-        self.smtp_port = getattr(settings, 'SMTP_PORT', 587)
-        self.smtp_username = getattr(settings, 'SMTP_USERNAME', '')
-        self.smtp_password = getattr(settings, 'SMTP_PASSWORD', '')
-        self.from_email = getattr(settings, 'FROM_EMAIL', 'noreply@alifrzngn.dev')
-        self.from_name = getattr(settings, 'FROM_NAME', 'AliFrzngn Development')
+        self.smtp_server = settings.smtp_server
+        self.smtp_port = settings.smtp_port
+        self.smtp_username = settings.smtp_username
+        self.smtp_password = settings.smtp_password
+        self.from_email = settings.from_email
+        self.from_name = settings.from_name
     
     def send_email(
         self,
         to_email: str,
         subject: str,
         html_content: str,
-        text_content: Optional[str] = None
+        text_content: Optional[str] = None,
+        enqueue_timeout: Optional[float] = 0
     ) -> bool:
-        """Send an email."""
+        """Send an email.
+        
+        When the delivery queue is running the message is only queued, and
+        True means it was accepted for delivery. ``enqueue_timeout`` is how
+        long to wait for room if the queue is full.
+        """
         try:
             # Create message
             msg = MIMEMultipart('alternative')
@@ -215,12 +61,23 @@ class EmailService:
                 logger.info(f"Content: {html_content}")
                 return True
             
-            # In production, actually send the email
-            context = ssl.create_default_context()
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls(context=context)
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
+            # In production, hand the email to the pooled delivery workers
+            delivery_queue = get_delivery_queue()
+            if delivery_queue is not None:
+                return delivery_queue.enqueue(msg, timeout=enqueue_timeout)
+            
+            connection = SMTPConnection(
+                self.smtp_server,
+                self.smtp_port,
+                self.smtp_username,
+                self.smtp_password,
+                use_tls=settings.smtp_use_tls,
+                timeout=settings.smtp_timeout
+            )
+            try:
+                connection.send(msg)
+            finally:
+                connection.close()
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -231,7 +88,7 @@ class EmailService:
     
     def send_verification_email(self, to_email: str, verification_token: str, user_name: str) -> bool:
         """Send email verification email."""
-        verification_url = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
+        verification_url = f"{settings.frontend_url}/verify-email?token={verification_token}"
         
         subject = "Verify Your Email Address - AliFrzngn Development"
         
@@ -249,7 +106,7 @@ class EmailService:
     
     def send_password_reset_email(self, to_email: str, reset_token: str, user_name: str) -> bool:
         """Send password reset email."""
-        reset_url = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
+        reset_url = f"{settings.frontend_url}/reset-password?token={reset_token}"
         
         subject = "Reset Your Password - AliFrzngn Development"
         
@@ -272,4 +129,33 @@ class EmailService:
         html_content = EmailTemplates.get_welcome_email_html(user_name=user_name)
         text_content = EmailTemplates.get_welcome_email_text(user_name=user_name)
         
-        return self.send_email(to_email, subject, html_content, text_content)
\ No newline at end of file
+        return self.send_email(to_email, subject, html_content, text_content)
+    
+    def send_bulk_email(
+        self,
+        subject: str,
+        template: str,
+        recipients: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> int:
+        """Render one template for many recipients and send each a copy.
+        
+        Recipients are (email, context) pairs. Uses the "<template>.html"
+        template and, if there is one, "<template>.txt". Returns the number
+        of emails accepted for delivery. Each recipient waits for room in the
+        delivery queue rather than being dropped when it fills up.
+        """
+        recipients = list(recipients)
+        contexts = [context for _, context in recipients]
+        html_bodies = render_many(f"{template}.html", contexts)
+        text_template = f"{template}.txt"
+        text_bodies = render_many(text_template, contexts) if text_template in TEMPLATES else repeat(None)
+        
+        accepted = 0
+        for (to_email, _), html_content, text_content in zip(recipients, html_bodies, text_bodies):
+            if self.send_email(
+                to_email, subject, html_content, text_content,
+                enqueue_timeout=settings.smtp_enqueue_timeout
+            ):
+                accepted += 1
+        
+        return accepted
@@ -1,213 +1,330 @@
 """Email templates for various email types."""
 
-from typing import Dict, Any
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from jinja2 import DictLoader, Environment, StrictUndefined, Template, nodes, select_autoescape
+from markupsafe import escape
+
+from backend.shared.config import settings
+
+_STYLES = """
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background-color: {{ accent }}; color: white; padding: 20px; text-align: center; }
+        .content { padding: 20px; background-color: #f9fafb; }
+        .button { display: inline-block; background-color: {{ accent }}; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0; }
+        .footer { text-align: center; padding: 20px; color: #6b7280; font-size: 14px; }
+"""
+
+TEMPLATES: Dict[str, str] = {
+    "layout.html": """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{% block title %}{% endblock %}</title>
+    <style>""" + _STYLES + """    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>{% block header %}{{ company_name }}{% endblock %}</h1>
+        </div>
+        <div class="content">
+{% block content %}{% endblock %}
+        </div>
+        <div class="footer">
+            <p>&copy; 2024 {{ company_name }}. All rights reserved.</p>
+        </div>
+    </div>
+</body>
+</html>
+""",
+    "verification.html": """{% extends "layout.html" %}
+{% set accent = "#3b82f6" %}
+{% block title %}Verify Your Email{% endblock %}
+{% block content %}
+            <h2>Verify Your Email Address</h2>
+            <p>Hello {{ user_name }},</p>
+            <p>Thank you for registering with {{ company_name }}! To complete your registration, please verify your email address by clicking the button below:</p>
+            <p style="text-align: center;">
+                <a href="{{ verification_url }}" class="button">Verify Email Address</a>
+            </p>
+            <p>If the button doesn't work, you can also copy and paste this link into your browser:</p>
+            <p style="word-break: break-all; color: #3b82f6;">{{ verification_url }}</p>
+            <p>This link will expire in 24 hours for security reasons.</p>
+            <p>If you didn't create an account with us, please ignore this email.</p>
+{% endblock %}
+""",
+    "verification.txt": """Verify Your Email Address - {{ company_name }}
+
+Hello {{ user_name }},
+
+Thank you for registering with {{ company_name }}! To complete your registration, please verify your email address by visiting the following link:
+
+{{ verification_url }}
+
+This link will expire in 24 hours for security reasons.
+
+If you didn't create an account with us, please ignore this email.
+
+Best regards,
+The {{ company_name }} Team
+
+(c) 2024 {{ company_name }}. All rights reserved.
+""",
+    "password_reset.html": """{% extends "layout.html" %}
+{% set accent = "#dc2626" %}
+{% block title %}Reset Your Password{% endblock %}
+{% block content %}
+            <h2>Reset Your Password</h2>
+            <p>Hello {{ user_name }},</p>
+            <p>We received a request to reset your password for your {{ company_name }} account. Click the button below to reset your password:</p>
+            <p style="text-align: center;">
+                <a href="{{ reset_url }}" class="button">Reset Password</a>
+            </p>
+            <p>If the button doesn't work, you can also copy and paste this link into your browser:</p>
+            <p style="word-break: break-all; color: #dc2626;">{{ reset_url }}</p>
+            <p>This link will expire in 1 hour for security reasons.</p>
+            <p>If you didn't request a password reset, please ignore this email. Your password will remain unchanged.</p>
+{% endblock %}
+""",
+    "password_reset.txt": """Reset Your Password - {{ company_name }}
+
+Hello {{ user_name }},
+
+We received a request to reset your password for your {{ company_name }} account. Visit the following link to reset your password:
+
+{{ reset_url }}
+
+This link will expire in 1 hour for security reasons.
+
+If you didn't request a password reset, please ignore this email. Your password will remain unchanged.
+
+Best regards,
+The {{ company_name }} Team
+
+(c) 2024 {{ company_name }}. All rights reserved.
+""",
+    "welcome.html": """{% extends "layout.html" %}
+{% set accent = "#10b981" %}
+{% block title %}Welcome to {{ company_name }}{% endblock %}
+{% block header %}Welcome to {{ company_name }}!{% endblock %}
+{% block content %}
+            <h2>Hello {{ user_name }}!</h2>
+            <p>Welcome to {{ company_name }}! We're excited to have you on board.</p>
+            <p>Your account has been successfully created and verified. You can now access all the features of our microservices platform:</p>
+            <ul>
+                <li>📦 Inventory Management</li>
+                <li>👥 Customer Relationship Management</li>
+                <li>🔐 Secure User Authentication</li>
+                <li>📊 Real-time Dashboard</li>
+            </ul>
+            <p style="text-align: center;">
+                <a href="{{ frontend_url }}/dashboard" class="button">Access Your Dashboard</a>
+            </p>
+            <p>If you have any questions or need assistance, please don't hesitate to contact our support team.</p>
+{% endblock %}
+""",
+    "welcome.txt": """Welcome to {{ company_name }}!
+
+Hello {{ user_name }}!
+
+Welcome to {{ company_name }}! We're excited to have you on board.
+
+Your account has been successfully created and verified. You can now access all the features of our microservices platform:
+
+- Inventory Management
+- Customer Relationship Management
+- Secure User Authentication
+- Real-time Dashboard
+
+Access your dashboard at: {{ frontend_url }}/dashboard
+
+If you have any questions or need assistance, please don't hesitate to contact our support team.
+
+Best regards,
+The {{ company_name }} Team
+
+(c) 2024 {{ company_name }}. All rights reserved.
+""",
+}
+
+
+@lru_cache(maxsize=None)
+def get_template_environment() -> Environment:
+    """Get the Jinja environment with every template compiled.
+
+    HTML templates are autoescaped; plain-text ones are not.
+    """
+    environment = Environment(
+        loader=DictLoader(TEMPLATES),
+        autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+        undefined=StrictUndefined,
+        auto_reload=False,
+        cache_size=-1,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+    )
+    environment.globals.update(
+        company_name=settings.from_name,
+        frontend_url=settings.frontend_url,
+    )
+
+    # Compile everything up front so the first send doesn't pay for it
+    for name in TEMPLATES:
+        environment.get_template(name)
+    return environment
+
+
+def get_template(name: str) -> Template:
+    """Get a compiled template by name."""
+    return get_template_environment().get_template(name)
+
+
+def render_template(name: str, **context: Any) -> str:
+    """Render a template with the given context."""
+    return get_template(name).render(context)
+
+
+def _template_chain(environment: Environment, name: str) -> Optional[List[nodes.Template]]:
+    """Parse a template and the layouts it extends.
+
+    Returns None for templates that pull in other templates any other way.
+    """
+    chain = []
+    while name is not None:
+        source, _, _ = environment.loader.get_source(environment, name)
+        ast = environment.parse(source)
+        if any(ast.find_all((nodes.Include, nodes.Import, nodes.FromImport))):
+            return None
+        chain.append(ast)
+
+        parent = next(ast.find_all(nodes.Extends), None)
+        if parent is None:
+            break
+        if not isinstance(parent.template, nodes.Const):
+            return None
+        name = parent.template.value
+    return chain
+
+
+def _outputs_variables_verbatim(environment: Environment, name: str, keys: Iterable[str]) -> bool:
+    """Check that variables are only ever printed as-is.
+
+    That is, never tested, looped over, filtered or assigned, so the
+    template's output is the same for every recipient apart from them.
+    """
+    chain = _template_chain(environment, name)
+    if chain is None:
+        return False
+
+    keys = set(keys)
+    for ast in chain:
+        printed = {
+            id(node)
+            for output in ast.find_all(nodes.Output)
+            for node in output.nodes
+            if isinstance(node, nodes.Name)
+        }
+        for node in ast.find_all(nodes.Name):
+            if node.name in keys and id(node) not in printed:
+                return False
+    return True
+
+
+class _SubstitutionRenderer:
+    """Render a template once with placeholders and fill them in per recipient."""
+
+    def __init__(self, template: Template, keys: List[str], autoescape: bool):
+        self.keys = frozenset(keys)
+        self.escape = escape if autoescape else str
+        parts = re.split(r"\x00(\d+)\x00", template.render({
+            key: f"\x00{index}\x00" for index, key in enumerate(keys)
+        }))
+        self.literals = parts[0::2]
+        self.slots = [keys[int(index)] for index in parts[1::2]]
+
+    def render(self, context: Dict[str, Any]) -> str:
+        escape_value = self.escape
+        out = [self.literals[0]]
+        for key, literal in zip(self.slots, self.literals[1:]):
+            out.append(escape_value(context[key]))
+            out.append(literal)
+        return "".join(out)
+
+
+def render_many(name: str, contexts: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Render one template for many recipients.
+
+    Contexts are rendered lazily, so newsletter-sized sends never hold every
+    body in memory. When the template only prints the per-recipient
+    variables as-is, it is rendered once with placeholders and each email
+    becomes a string join of escaped values, several times faster than a
+    full render. Anything else falls back to rendering each context.
+    """
+    template = get_template(name)
+    environment = template.environment
+    fast = None
+    first = True
+
+    for context in contexts:
+        if first:
+            first = False
+            keys = sorted(context)
+            if _outputs_variables_verbatim(environment, name, keys):
+                autoescape = environment.autoescape
+                if callable(autoescape):
+                    autoescape = autoescape(name)
+                fast = _SubstitutionRenderer(template, keys, autoescape)
+                rendered = template.render(context)
+                # Double-check the shortcut against a real render
+                if fast.render(context) != rendered:
+                    fast = None
+                yield rendered
+                continue
+
+        if fast is not None and context.keys() == fast.keys:
+            yield fast.render(context)
+        else:
+            yield template.render(context)
 
 
 class EmailTemplates:
     """Email templates for different types of emails."""
-    
+
+    render = staticmethod(render_template)
+    render_many = staticmethod(render_many)
+
     @staticmethod
     def get_verification_email_html(user_name: str, verification_url: str) -> str:
         """Get HTML content for email verification email."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Verify Your Email</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #3b82f6; color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; background-color: #f9fafb; }}
-                .button {{ display: inline-block; background-color: #3b82f6; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 14px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>AliFrzngn Development</h1>
-                </div>
-                <div class="content">
-                    <h2>Verify Your Email Address</h2>
-                    <p>Hello {user_name},</p>
-                    <p>Thank you for registering with AliFrzngn Development! To complete your registration, please verify your email address by clicking the button below:</p>
-                    <p style="text-align: center;">
-                        <a href="{verification_url}" class="button">Verify Email Address</a>
-                    </p>
-                    <p>If the button doesn't work, you can also copy and paste this link into your browser:</p>
-                    <p style="word-break: break-all; color: #3b82f6;">{verification_url}</p>
-                    <p>This link will expire in 24 hours for security reasons.</p>
-                    <p>If you didn't create an account with us, please ignore this email.</p>
-                </div>
-                <div class="footer">
-                    <p>© 2024 AliFrzngn Development. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-    
+        return render_template("verification.html", user_name=user_name, verification_url=verification_url)
+
     @staticmethod
     def get_verification_email_text(user_name: str, verification_url: str) -> str:
         """Get text content for email verification email."""
-        return f"""
-        Verify Your Email Address - AliFrzngn Development
-        
-        Hello {user_name},
-        
-        Thank you for registering with AliFrzngn Development! To complete your registration, please verify your email address by visiting the following link:
-        
-        {verification_url}
-        
-        This link will expire in 24 hours for security reasons.
-        
-        If you didn't create an account with us, please ignore this email.
-        
-        Best regards,
-        The AliFrzngn Development Team
-        
-        © 2024 AliFrzngn Development. All rights reserved.
-        """
-    
+        return render_template("verification.txt", user_name=user_name, verification_url=verification_url)
+
     @staticmethod
     def get_password_reset_email_html(user_name: str, reset_url: str) -> str:
         """Get HTML content for password reset email."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Reset Your Password</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #dc2626; color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; background-color: #f9fafb; }}
-                .button {{ display: inline-block; background-color: #dc2626; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 14px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>AliFrzngn Development</h1>
-                </div>
-                <div class="content">
-                    <h2>Reset Your Password</h2>
-                    <p>Hello {user_name},</p>
-                    <p>We received a request to reset your password for your AliFrzngn Development account. Click the button below to reset your password:</p>
-                    <p style="text-align: center;">
-                        <a href="{reset_url}" class="button">Reset Password</a>
-                    </p>
-                    <p>If the button doesn't work, you can also copy and paste this link into your browser:</p>
-                    <p style="word-break: break-all; color: #dc2626;">{reset_url}</p>
-                    <p>This link will expire in 1 hour for security reasons.</p>
-                    <p>If you didn't request a password reset, please ignore this email. Your password will remain unchanged.</p>
-                </div>
-                <div class="footer">
-                    <p>© 2024 AliFrzngn Development. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-    
+        return render_template("password_reset.html", user_name=user_name, reset_url=reset_url)
+
     @staticmethod
     def get_password_reset_email_text(user_name: str, reset_url: str) -> str:
         """Get text content for password reset email."""
-        return f"""
-        Reset Your Password - AliFrzngn Development
-        
-        Hello {user_name},
-        
-        We received a request to reset your password for your AliFrzngn Development account. Visit the following link to reset your password:
-        
-        {reset_url}
-        
-        This link will expire in 1 hour for security reasons.
-        
-        If you didn't request a password reset, please ignore this email. Your password will remain unchanged.
-        
-        Best regards,
-        The AliFrzngn Development Team
-        
-        © 2024 AliFrzngn Development. All rights reserved.
-        """
-    
+        return render_template("password_reset.txt", user_name=user_name, reset_url=reset_url)
+
     @staticmethod
     def get_welcome_email_html(user_name: str) -> str:
         """Get HTML content for welcome email."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Welcome to AliFrzngn Development</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #10b981; color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; background-color: #f9fafb; }}
-                .button {{ display: inline-block; background-color: #10b981; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; margin: 20px 0; }}
-                .footer {{ text-align: center; padding: 20px; color: #6b7280; font-size: 14px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h1>Welcome to AliFrzngn Development!</h1>
-                </div>
-                <div class="content">
-                    <h2>Hello {user_name}!</h2>
-                    <p>Welcome to AliFrzngn Development! We're excited to have you on board.</p>
-                    <p>Your account has been successfully created and verified. You can now access all the features of our microservices platform:</p>
-                    <ul>
-                        <li>📦 Inventory Management</li>
-                        <li>👥 Customer Relationship Management</li>
-                        <li>🔐 Secure User Authentication</li>
-                        <li>📊 Real-time Dashboard</li>
-                    </ul>
-                    <p style="text-align: center;">
-                        <a href="http://localhost:3000/dashboard" class="button">Access Your Dashboard</a>
-                    </p>
-                    <p>If you have any questions or need assistance, please don't hesitate to contact our support team.</p>
-                </div>
-                <div class="footer">
-                    <p>© 2024 AliFrzngn Development. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-    
+        return render_template("welcome.html", user_name=user_name)
+
     @staticmethod
     def get_welcome_email_text(user_name: str) -> str:
         """Get text content for welcome email."""
-        return f"""
-        Welcome to AliFrzngn Development!
-        
-        Hello {user_name}!
-        
-        Welcome to AliFrzngn Development! We're excited to have you on board.
-        
-        Your account has been successfully created and verified. You can now access all the features of our microservices platform:
-        
-        - Inventory Management
-        - Customer Relationship Management
-        - Secure User Authentication
-        - Real-time Dashboard
-        
-        Access your dashboard at: http://localhost:3000/dashboard
-        
-        If you have any questions or need assistance, please don't hesitate to contact our support team.
-        
-        Best regards,
-        The AliFrzngn Development Team
-        
-        © 2024 AliFrzngn Development. All rights reserved.
-        """
\ No newline at end of file
+        return render_template("welcome.txt", user_name=user_name)
@@ -0,0 +1,47 @@
+"""Prometheus metrics for the services."""
+
+import atexit
+import os
+
+from fastapi import FastAPI
+from starlette.responses import Response
+
+from backend.shared.config import settings
+from .metrics import (
+    generate_metrics,
+    instrument_engine,
+    is_multiprocess,
+    mark_process_dead,
+    observe_outbound_request,
+)
+from .middleware import PrometheusMiddleware
+
+
+def setup_metrics(app: FastAPI, metrics_path: str = "/metrics") -> None:
+    """Instrument an app and expose its metrics at metrics_path."""
+    if not settings.prometheus_enabled:
+        return
+
+    from backend.shared.database import engine
+
+    app.add_middleware(PrometheusMiddleware, excluded_paths=[metrics_path])
+    instrument_engine(engine)
+
+    @app.get(metrics_path, include_in_schema=False)
+    def metrics() -> Response:
+        content, content_type = generate_metrics()
+        return Response(content=content, media_type=content_type)
+
+    if is_multiprocess():
+        # Stop counting this worker's in-flight requests once it exits
+        atexit.register(mark_process_dead, os.getpid())
+
+
+__all__ = [
+    "PrometheusMiddleware",
+    "generate_metrics",
+    "instrument_engine",
+    "mark_process_dead",
+    "observe_outbound_request",
+    "setup_metrics",
+]
@@ -0,0 +1,130 @@
+"""Prometheus metrics shared by every service.
+
+Set PROMETHEUS_MULTIPROC_DIR to an empty, writable directory before starting
+a multi-worker deployment; each worker then writes its samples there and
+/metrics aggregates all of them.
+"""
+
+import os
+from typing import Any, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled, by route and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of HTTP response bodies",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+HTTP_CLIENT_REQUEST_DURATION = Histogram(
+    "http_client_request_duration_seconds",
+    "Time spent on requests to other services",
+    ["target", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Connections the database pool keeps open",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Database connections in use",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_IN = Gauge(
+    "db_pool_checked_in",
+    "Idle database connections in the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Database connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+
+
+def is_multiprocess() -> bool:
+    """Check whether metrics are shared between worker processes."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def generate_metrics() -> Tuple[bytes, str]:
+    """Render every metric in the text exposition format."""
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a finished worker's live gauges in multiprocess mode."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(pid)
+
+
+def observe_outbound_request(target: str, method: str, status: Any, seconds: float) -> None:
+    """Record the latency of a request to another service."""
+    HTTP_CLIENT_REQUEST_DURATION.labels(target, method, str(status)).observe(seconds)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Keep the pool gauges up to date from an engine's pool events.
+
+    Pools without a fixed size (such as NullPool for SQLite) only report
+    connections in use.
+    """
+    if getattr(engine, "_pool_metrics_instrumented", False):
+        return
+    engine._pool_metrics_instrumented = True
+
+    def update(returning: int = 0) -> None:
+        pool = engine.pool
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_CHECKED_OUT.set(pool.checkedout() - returning)
+        DB_POOL_CHECKED_IN.set(pool.checkedin() + returning)
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    if hasattr(engine.pool, "size"):
+        event.listen(engine, "checkout", lambda *args: update())
+        # Fired before the connection is back in the pool
+        event.listen(engine, "checkin", lambda *args: update(returning=1))
+        update()
+    else:
+        event.listen(engine, "checkout", lambda *args: DB_POOL_CHECKED_OUT.inc())
+        event.listen(engine, "checkin", lambda *args: DB_POOL_CHECKED_OUT.dec())
@@ -0,0 +1,174 @@
+"""On-demand and continuous sampling profiling of live workers."""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import signal
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Set
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.auth import get_current_user
+from backend.shared.config import settings
+from .continuous import ContinuousProfiler
+from .sampler import StackSampler, dump_tasks, format_collapsed, profile, profile_async
+
+logger = logging.getLogger(__name__)
+
+# One on-demand profile at a time per worker
+_profile_lock = asyncio.Lock()
+
+
+def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    """Allow only admins."""
+    if current_user["role"] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
+
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profile")
+async def get_profile(
+    seconds: float = Query(10, gt=0, description="How long to sample"),
+    interval: float = Query(0.01, ge=0.001, le=1, description="Seconds between samples"),
+    include_tasks: bool = Query(False, description="Also dump the pending asyncio tasks")
+):
+    """Profile this worker and return collapsed stacks for a flame graph."""
+    if seconds > settings.profiling_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Profiles are limited to {settings.profiling_max_seconds} seconds"
+        )
+    if _profile_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A profile is already running on this worker"
+        )
+
+    async with _profile_lock:
+        collapsed = await profile_async(seconds, interval)
+    if include_tasks:
+        return {"pid": os.getpid(), "collapsed": collapsed, "tasks": dump_tasks()}
+    return PlainTextResponse(collapsed)
+
+
+@router.get("/tasks")
+async def get_tasks():
+    """List the pending asyncio tasks of this worker and where each is waiting."""
+    return {"pid": os.getpid(), "tasks": dump_tasks()}
+
+
+def _write_signal_output(kind: str, content: str) -> Path:
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    directory = Path(settings.profiling_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Named apart from continuous profiles so their rotation leaves these alone
+    path = directory / f"signal-{settings.service_name}-{os.getpid()}-{timestamp}.{kind}"
+    path.write_text(content)
+    return path
+
+
+async def profile_to_file() -> Optional[Path]:
+    """Write a task dump and a profile of this worker to PROFILING_DIR.
+
+    The task dump is taken straight away, the stacks over the next
+    PROFILING_SIGNAL_SECONDS. Skipped if a profile is already running on
+    this worker; returns the profile's path otherwise.
+    """
+    if _profile_lock.locked():
+        logger.warning("A profile is already running on this worker; ignoring the signal")
+        return None
+
+    async with _profile_lock:
+        tasks = json.dumps(dump_tasks(), indent=2)
+        try:
+            await run_in_threadpool(_write_signal_output, "tasks.json", tasks)
+            collapsed = await profile_async(settings.profiling_signal_seconds)
+            path = await run_in_threadpool(_write_signal_output, "collapsed", collapsed)
+        except OSError as e:
+            logger.error(f"Failed to write profile: {e}")
+            return None
+        logger.info(f"Wrote profile to {path}")
+        return path
+
+
+_signal_tasks: Set[asyncio.Task] = set()
+
+
+def handle_profile_signal() -> asyncio.Task:
+    """Start profiling to PROFILING_DIR in the background.
+
+    For workers too busy to answer HTTP: ``kill -USR2 <pid>``. Installed with
+    loop.add_signal_handler, so it runs on the event loop rather than
+    inside a raw signal handler.
+    """
+    task = asyncio.get_running_loop().create_task(profile_to_file())
+    # The loop only keeps weak references to tasks
+    _signal_tasks.add(task)
+    task.add_done_callback(_signal_tasks.discard)
+    return task
+
+
+def _add_signal_handler(app: FastAPI) -> None:
+    """Install the SIGUSR2 handler on the event loop when the app starts."""
+    lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan_with_signal(app: FastAPI):
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGUSR2, handle_profile_signal)
+            installed = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Not the main thread, or a loop without signal support
+            installed = False
+        try:
+            async with lifespan(app) as state:
+                yield state
+        finally:
+            if installed:
+                loop.remove_signal_handler(signal.SIGUSR2)
+
+    app.router.lifespan_context = lifespan_with_signal
+
+
+def setup_profiling(app: FastAPI) -> None:
+    """Add the admin profiling endpoints, the signal handler and continuous profiling."""
+    if not settings.profiling_enabled:
+        return
+
+    app.include_router(router)
+
+    if hasattr(signal, "SIGUSR2"):
+        _add_signal_handler(app)
+
+    if settings.profiling_continuous:
+        profiler = ContinuousProfiler()
+        profiler.start()
+        atexit.register(profiler.stop)
+
+
+__all__ = [
+    "ContinuousProfiler",
+    "StackSampler",
+    "dump_tasks",
+    "format_collapsed",
+    "handle_profile_signal",
+    "profile",
+    "profile_async",
+    "profile_to_file",
+    "router",
+    "setup_profiling",
+]
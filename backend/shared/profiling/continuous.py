@@ -0,0 +1,96 @@
+"""Continuous low-rate profiling into rotating files."""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from backend.shared.config import settings
+from .sampler import StackSampler, format_collapsed
+
+logger = logging.getLogger(__name__)
+
+
+class ContinuousProfiler:
+    """Sample all the time at a low rate, writing one file per window.
+
+    Each window of ``window`` seconds is written to
+    ``<directory>/<service>-<pid>-<timestamp>.collapsed``, and only the
+    newest ``keep`` files of the service are kept. At the default 10
+    samples a second the profiler costs well under 1% of a core, so it can
+    stay on in production and show what a worker was doing before someone
+    noticed the spike.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        interval: Optional[float] = None,
+        window: Optional[float] = None,
+        keep: Optional[int] = None,
+        service_name: Optional[str] = None
+    ):
+        self.directory = Path(directory or settings.profiling_dir)
+        self.window = window or settings.profiling_continuous_window
+        self.keep = keep or settings.profiling_keep_files
+        self.service_name = service_name or settings.service_name
+        self.sampler = StackSampler(interval or settings.profiling_continuous_interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="continuous-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling, writing out the current partial window."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        window_end = time.monotonic() + self.window
+        while not self._stop.wait(self.sampler.interval):
+            self.sampler.sample()
+            if time.monotonic() >= window_end:
+                self.flush()
+                window_end = time.monotonic() + self.window
+        self.flush()
+
+    def flush(self) -> Optional[Path]:
+        """Write the window sampled so far and rotate old files."""
+        stacks = self.sampler.take()
+        if not stacks:
+            return None
+
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = self.directory / f"{self.service_name}-{os.getpid()}-{timestamp}.collapsed"
+        try:
+            path.write_text(format_collapsed(stacks))
+            self.rotate()
+        except OSError as e:
+            logger.error(f"Failed to write profile {path}: {e}")
+            return None
+        return path
+
+    def rotate(self) -> None:
+        """Delete all but the newest ``keep`` profiles of this service."""
+        files = sorted(
+            self.directory.glob(f"{self.service_name}-*.collapsed"),
+            key=lambda path: path.stat().st_mtime,
+            reverse=True,
+        )
+        for path in files[self.keep:]:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,152 @@
+"""Sampling profiler producing collapsed stacks."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+
+@lru_cache(maxsize=None)
+def _short_path(filename: str) -> str:
+    """Drop the longest sys.path prefix so frames read like module paths."""
+    prefixes = [path for path in sys.path if path and filename.startswith(path + os.sep)]
+    if not prefixes:
+        return filename
+    return filename[len(max(prefixes, key=len)) + 1:]
+
+
+class StackSampler:
+    """Record the stack of every thread at a fixed interval.
+
+    A daemon thread reads ``sys._current_frames()``, so the profiled code
+    runs unmodified and the cost is one stack walk per thread per sample.
+    Stacks are counted in the collapsed format (``root;caller;callee N``)
+    read by flamegraph.pl, speedscope and Grafana's flame graph panel, with
+    the thread name as the root frame.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def sample(self) -> None:
+        """Take one sample of every other thread's stack."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        stacks = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(self._label(frame.f_code))
+                frame = frame.f_back
+            frames.append(names.get(thread_id, f"thread-{thread_id}"))
+            stacks.append(";".join(reversed(frames)))
+
+        with self._lock:
+            self.stacks.update(stacks)
+            self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def take(self) -> Counter:
+        """Return the stacks counted so far and start counting afresh."""
+        with self._lock:
+            stacks, self.stacks = self.stacks, Counter()
+            self.samples = 0
+        return stacks
+
+
+def format_collapsed(stacks: Counter) -> str:
+    """Render stack counts one per line, busiest first."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def profile(seconds: float, interval: float = 0.01) -> str:
+    """Sample this process for a while and return collapsed stacks.
+
+    Blocks the calling thread; from async code use :func:`profile_async`.
+    """
+    sampler = StackSampler(interval)
+    sampler.start()
+    try:
+        time.sleep(seconds)
+    finally:
+        sampler.stop()
+    return format_collapsed(sampler.take())
+
+
+async def profile_async(seconds: float, interval: float = 0.01) -> str:
+    """Sample this process for a while without blocking the event loop."""
+    sampler = StackSampler(interval)
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+    return format_collapsed(sampler.take())
+
+
+def _await_chain(coro) -> List[str]:
+    """Follow what a suspended coroutine awaits, outermost first."""
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is not None:
+            frames.append(f"{_short_path(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}")
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def dump_tasks(loop: Optional[asyncio.AbstractEventLoop] = None) -> List[Dict[str, Any]]:
+    """Describe every pending asyncio task and where it is suspended.
+
+    Must run on the loop's own thread. Unlike ``Task.get_stack()``, the
+    stack follows the whole chain of awaited coroutines, down to the one
+    actually waiting.
+    """
+    tasks = []
+    for task in asyncio.all_tasks(loop):
+        coro = task.get_coro()
+        tasks.append({
+            "name": task.get_name(),
+            "coroutine": getattr(coro, "__qualname__", repr(coro)),
+            "stack": _await_chain(coro),
+        })
+    return sorted(tasks, key=lambda task: task["name"])
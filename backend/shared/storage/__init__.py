@@ -1,6 +1,17 @@
 """File storage utilities."""
 
+from .backends import LocalStorageBackend, S3StorageBackend, StorageBackend, get_storage_backend
 from .file_service import FileService
-from .models import FileUpload
+from .models import FileUpload, UploadSession
+from .multipart import MultipartUploadService
 
-__all__ = ["FileService", "FileUpload"]
\ No newline at end of file
+__all__ = [
+    "FileService",
+    "FileUpload",
+    "UploadSession",
+    "MultipartUploadService",
+    "StorageBackend",
+    "LocalStorageBackend",
+    "S3StorageBackend",
+    "get_storage_backend",
+]
\ No newline at end of file
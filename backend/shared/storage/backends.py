@@ -0,0 +1,203 @@
+"""Pluggable storage backends for uploaded files."""
+
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import closing
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from backend.shared.config import settings
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_created_dirs: set = set()
+_created_dirs_lock = threading.Lock()
+
+
+def ensure_directory(path: Path) -> Path:
+    """Create a directory once per process instead of on every write."""
+    key = str(path)
+    if key not in _created_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        with _created_dirs_lock:
+            _created_dirs.add(key)
+    return path
+
+
+class StorageBackend(ABC):
+    """Interface for file storage backends.
+
+    Files are addressed by keys of the form
+    ``<mime major type>/<aa>/<bb>/<filename>``, where ``aabb`` is a hash
+    prefix of the filename. The two shard levels keep any one directory
+    (or object-store prefix) small no matter how many files are stored.
+    """
+
+    name = "base"
+
+    def build_key(self, filename: str, content_type: str) -> str:
+        """Build a sharded storage key for a new file."""
+        file_type = content_type.split('/')[0]
+        digest = hashlib.sha1(filename.encode()).hexdigest()
+        return f"{file_type}/{digest[:2]}/{digest[2:4]}/{filename}"
+
+    @abstractmethod
+    def save(self, key: str, fileobj: BinaryIO) -> None:
+        """Stream a readable file object into storage under a key."""
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Open a stored file for streaming reads."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete a stored file if it exists."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Check whether a key exists in storage."""
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """Get a local filesystem path for a key, if the backend has one."""
+        return None
+
+    def iter_chunks(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Stream a stored file in chunks."""
+        with closing(self.open(key)) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+
+class LocalStorageBackend(StorageBackend):
+    """Store files on the local filesystem under a root directory."""
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = ensure_directory(Path(root).resolve())
+
+    def _path(self, key: str) -> Path:
+        """Resolve a key to a path inside the storage root."""
+        path = Path(key)
+        if path.is_absolute():
+            # Files stored before the sharded layout recorded absolute paths
+            return path
+
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def save(self, key: str, fileobj: BinaryIO) -> None:
+        """Write to a temporary file and rename it into place atomically."""
+        path = self._path(key)
+        ensure_directory(path.parent)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(temp_path, 'wb') as f:
+                shutil.copyfileobj(fileobj, f, DEFAULT_CHUNK_SIZE)
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), 'rb')
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self._path(key)
+
+
+class S3StorageBackend(StorageBackend):
+    """Store files in an S3-compatible object store."""
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client=None,
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        multipart_chunksize: int = 8 * 1024 * 1024
+    ):
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+        except ImportError as e:
+            raise RuntimeError("boto3 is required for the S3 storage backend") from e
+
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+        self.client = client or boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region_name or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+        )
+        # Large objects are sent as parallel multipart uploads by boto3
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_chunksize,
+            multipart_chunksize=multipart_chunksize,
+        )
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def save(self, key: str, fileobj: BinaryIO) -> None:
+        self.client.upload_fileobj(
+            fileobj, self.bucket, self._object_key(key), Config=self.transfer_config
+        )
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))
+        except self.client.exceptions.NoSuchKey as e:
+            raise FileNotFoundError(key) from e
+        return response["Body"]
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+
+@lru_cache(maxsize=None)
+def get_storage_backend() -> StorageBackend:
+    """Get the storage backend configured for this process."""
+    if settings.storage_backend == "s3":
+        return S3StorageBackend(
+            bucket=settings.s3_bucket,
+            prefix=settings.s3_prefix,
+            endpoint_url=settings.s3_endpoint_url,
+            region_name=settings.s3_region,
+            access_key_id=settings.s3_access_key_id,
+            secret_access_key=settings.s3_secret_access_key,
+        )
+    return LocalStorageBackend(settings.upload_dir)
@@ -1,21 +1,22 @@
 """File service for handling file uploads and storage."""
 
-import os
+import io
 import uuid
 import hashlib
-from typing import Optional, Dict, Any, BinaryIO
+from typing import Optional, Dict, Any, BinaryIO, Iterator
 from sqlalchemy.orm import Session
 from fastapi import UploadFile, HTTPException, status
-import aiofiles
+from starlette.concurrency import run_in_threadpool
 import mimetypes
 from pathlib import Path
 
 from .models import FileUpload
+from .backends import StorageBackend, get_storage_backend
+from .image_variants import get_variant_key, schedule_variant_generation
 from backend.shared.config import settings
 
 # File upload configuration
-UPLOAD_DIR = getattr(settings, 'UPLOAD_DIR', '/app/uploads')
-MAX_FILE_SIZE = getattr(settings, 'MAX_FILE_SIZE', 10 * 1024 * 1024)  # 10MB
+MAX_FILE_SIZE = settings.max_file_size  # 10MB by default
 ALLOWED_EXTENSIONS = {
     'image': ['.jpg', '.jpeg', '.png', '.gif', '.webp'],
     'document': ['.pdf', '.doc', '.docx', '.txt', '.rtf'],
@@ -36,10 +37,9 @@ ALLOWED_MIME_TYPES = {
 class FileService:
     """Service for handling file uploads and storage."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, backend: Optional[StorageBackend] = None):
         self.db = db
-        self.upload_dir = Path(UPLOAD_DIR)
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = backend or get_storage_backend()
     
     def _generate_filename(self, original_filename: str) -> str:
         """Generate a unique filename."""
@@ -83,29 +83,43 @@ class FileService:
     
     def _validate_file(self, file: UploadFile) -> None:
         """Validate uploaded file with enhanced security checks."""
+        self._validate_metadata(
+            filename=file.filename,
+            content_type=file.content_type,
+            file_size=getattr(file, 'size', None),
+        )
+    
+    def _validate_metadata(
+        self,
+        filename: Optional[str],
+        content_type: Optional[str],
+        file_size: Optional[int] = None,
+        max_size: int = MAX_FILE_SIZE
+    ) -> None:
+        """Validate file name, type and size before accepting any content."""
         # Check file size
-        if hasattr(file, 'size') and file.size and file.size > MAX_FILE_SIZE:
+        if file_size and file_size > max_size:
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size exceeds maximum allowed size of {MAX_FILE_SIZE} bytes"
+                detail=f"File size exceeds maximum allowed size of {max_size} bytes"
             )
         
         # Validate filename to prevent path traversal
-        if not file.filename or '..' in file.filename or '/' in file.filename or '\\' in file.filename:
+        if not filename or '..' in filename or '/' in filename or '\\' in filename:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid filename"
             )
         
         # Check content type
-        if file.content_type not in ALLOWED_MIME_TYPES:
+        if content_type not in ALLOWED_MIME_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type {file.content_type} is not allowed"
+                detail=f"File type {content_type} is not allowed"
             )
         
         # Check file extension
-        file_ext = Path(file.filename).suffix.lower()
+        file_ext = Path(filename).suffix.lower()
         if not any(file_ext in extensions for extensions in ALLOWED_EXTENSIONS.values()):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -120,6 +134,10 @@ class FileService:
                 detail="Executable files are not allowed"
             )
     
+    def _build_storage_key(self, filename: str, content_type: str) -> str:
+        """Get the sharded storage key for a new file."""
+        return self.backend.build_key(filename, content_type)
+    
     async def upload_file(
         self,
         file: UploadFile,
@@ -135,22 +153,15 @@ class FileService:
             
             # Generate unique filename
             filename = self._generate_filename(file.filename)
+            storage_key = self._build_storage_key(filename, file.content_type)
             
-            # Create subdirectory based on file type
-            file_type = file.content_type.split('/')[0]
-            subdir = self.upload_dir / file_type
-            subdir.mkdir(exist_ok=True)
+            content = await file.read()
             
-            file_path = subdir / filename
+            # Validate file content for malicious patterns
+            self._validate_file_content(content, file.content_type)
             
-            # Save file to disk with content validation
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                
-                # Validate file content for malicious patterns
-                self._validate_file_content(content, file.content_type)
-                
-                await f.write(content)
+            # Save file to storage without blocking the event loop
+            await run_in_threadpool(self.backend.save, storage_key, io.BytesIO(content))
             
             # Get file size
             file_size = len(content)
@@ -159,7 +170,7 @@ class FileService:
             file_upload = FileUpload(
                 filename=filename,
                 original_filename=file.filename,
-                file_path=str(file_path),
+                file_path=storage_key,
                 file_size=file_size,
                 content_type=file.content_type,
                 user_id=user_id,
@@ -172,12 +183,16 @@ class FileService:
             self.db.commit()
             self.db.refresh(file_upload)
             
+            # Generate thumbnails and WebP variants in the background
+            if file.content_type.startswith('image/'):
+                schedule_variant_generation(storage_key)
+            
             return file_upload
             
         except Exception as e:
             # Clean up file if database operation fails
-            if 'file_path' in locals() and file_path.exists():
-                file_path.unlink()
+            if 'storage_key' in locals():
+                self.backend.delete(storage_key)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to upload file: {str(e)}"
@@ -194,11 +209,11 @@ class FileService:
         return file_upload
     
     def get_file_path(self, file_id: int) -> str:
-        """Get file path by ID."""
+        """Get local file path by ID."""
         file_upload = self.get_file(file_id)
-        file_path = Path(file_upload.file_path)
+        file_path = self.backend.local_path(file_upload.file_path)
         
-        if not file_path.exists():
+        if file_path is None or not file_path.exists():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="File not found on disk"
@@ -206,14 +221,48 @@ class FileService:
         
         return str(file_path)
     
+    def get_local_path(self, storage_key: str) -> Optional[str]:
+        """Get the local path of a stored file, or None for remote backends."""
+        file_path = self.backend.local_path(storage_key)
+        return str(file_path) if file_path is not None else None
+    
+    def iter_file(self, storage_key: str) -> Iterator[bytes]:
+        """Stream a stored file from the storage backend."""
+        if not self.backend.exists(storage_key):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found in storage"
+            )
+        return self.backend.iter_chunks(storage_key)
+    
+    def get_variant_key(self, file_upload: FileUpload, variant: str) -> Optional[str]:
+        """Get the storage key of an image variant, or None if it isn't ready yet."""
+        if variant not in settings.image_variant_sizes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown variant '{variant}'"
+            )
+        
+        if not file_upload.content_type.startswith('image/'):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Variants are only available for images"
+            )
+        
+        variant_key = get_variant_key(file_upload.file_path, variant)
+        if not self.backend.exists(variant_key):
+            return None
+        
+        return variant_key
+    
     def delete_file(self, file_id: int) -> bool:
         """Delete file and its metadata."""
         file_upload = self.get_file(file_id)
-        file_path = Path(file_upload.file_path)
         
-        # Delete file from disk
-        if file_path.exists():
-            file_path.unlink()
+        # Delete file and any generated variants from storage
+        self.backend.delete(file_upload.file_path)
+        for variant in settings.image_variant_sizes:
+            self.backend.delete(get_variant_key(file_upload.file_path, variant))
         
         # Delete database record
         self.db.delete(file_upload)
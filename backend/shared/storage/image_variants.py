@@ -0,0 +1,118 @@
+"""Image variant generation for uploaded files."""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import PurePosixPath
+from typing import Dict, Optional
+
+from backend.shared.config import settings
+from .backends import StorageBackend, get_storage_backend
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; variants are skipped without it
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+VARIANT_FORMAT = "webp"
+VARIANT_CONTENT_TYPE = "image/webp"
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def variants_enabled() -> bool:
+    """Check whether image variants can be generated."""
+    return Image is not None and bool(settings.image_variant_sizes)
+
+
+def get_variant_key(storage_key: str, variant: str) -> str:
+    """Get the storage key of a variant stored alongside the original file."""
+    path = PurePosixPath(storage_key)
+    return str(path.with_name(f"{path.stem}_{variant}.{VARIANT_FORMAT}"))
+
+
+def generate_variants(
+    storage_key: str,
+    sizes: Dict[str, int],
+    backend: Optional[StorageBackend] = None
+) -> Dict[str, str]:
+    """Generate resized WebP variants of an image.
+
+    Runs inside a worker process, so it only takes picklable arguments and
+    opens the configured storage backend itself. Backends write variants
+    atomically, so a download never sees a partially written variant.
+    """
+    backend = backend or get_storage_backend()
+    generated = {}
+    with backend.open(storage_key) as source, Image.open(source) as image:
+        image.load()
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        for name, max_size in sizes.items():
+            variant = image.copy()
+            if max_size:
+                variant.thumbnail((max_size, max_size), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            variant.save(buffer, format="WEBP", quality=80, method=4)
+            buffer.seek(0)
+
+            variant_key = get_variant_key(storage_key, name)
+            backend.save(variant_key, buffer)
+            generated[name] = variant_key
+
+    return generated
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Get the shared process pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        # Spawned workers don't inherit the parent's DB connections or locks
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.image_variant_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def _log_result(storage_key: str, future: Future) -> None:
+    """Log the outcome of a variant generation job."""
+    try:
+        generated = future.result()
+        logger.info(f"Generated {len(generated)} image variants for {storage_key}")
+    except Exception as e:
+        logger.error(f"Failed to generate image variants for {storage_key}: {str(e)}")
+
+
+def schedule_variant_generation(storage_key: str) -> Optional[asyncio.Future]:
+    """Generate variants for an uploaded image without blocking the request."""
+    if not variants_enabled():
+        return None
+
+    try:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            _get_executor(),
+            generate_variants,
+            storage_key,
+            dict(settings.image_variant_sizes),
+        )
+        future.add_done_callback(lambda f: _log_result(storage_key, f))
+        return future
+    except Exception as e:
+        logger.error(f"Failed to schedule image variants for {storage_key}: {str(e)}")
+        return None
+
+
+def shutdown_variant_pool(wait: bool = True) -> None:
+    """Shut down the variant process pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
@@ -39,4 +39,52 @@ class FileUpload(Base):
             "resource_id": self.resource_id,
             "is_public": self.is_public,
             "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+class UploadSession(Base):
+    """Upload session for resumable multipart uploads."""
+    
+    __tablename__ = "upload_sessions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(String(36), unique=True, nullable=False, index=True)
+    original_filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    total_size = Column(BigInteger, nullable=False)
+    part_size = Column(Integer, nullable=False)
+    user_id = Column(String(100), nullable=True, index=True)
+    resource_type = Column(String(100), nullable=True)
+    resource_id = Column(String(100), nullable=True)
+    is_public = Column(String(10), default="false", nullable=False)
+    status = Column(String(20), default="pending", nullable=False, index=True)  # pending, completing, completed, aborted, expired
+    file_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<UploadSession(upload_id='{self.upload_id}', status='{self.status}')>"
+    
+    @property
+    def part_count(self) -> int:
+        """Number of parts needed to cover the whole file."""
+        return max(1, -(-self.total_size // self.part_size))
+    
+    def to_dict(self):
+        """Convert to dictionary."""
+        return {
+            "upload_id": self.upload_id,
+            "original_filename": self.original_filename,
+            "content_type": self.content_type,
+            "total_size": self.total_size,
+            "part_size": self.part_size,
+            "part_count": self.part_count,
+            "user_id": self.user_id,
+            "resource_type": self.resource_type,
+            "resource_id": self.resource_id,
+            "is_public": self.is_public,
+            "status": self.status,
+            "file_id": self.file_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
         }
\ No newline at end of file
@@ -0,0 +1,405 @@
+"""Resumable multipart uploads built on top of FileService."""
+
+import asyncio
+import hashlib
+import io
+import logging
+import shutil
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Any
+
+import aiofiles
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from .backends import ensure_directory
+from .file_service import FileService
+from .image_variants import schedule_variant_generation
+from .models import FileUpload, UploadSession
+from backend.shared.config import settings
+
+logger = logging.getLogger(__name__)
+
+SESSION_DIR_NAME = ".sessions"
+COPY_CHUNK_SIZE = 1024 * 1024
+MAX_PARTS = 10000
+# Longest malicious signature checked by FileService, kept between chunks
+SCAN_OVERLAP = 16
+
+
+class MultipartUploadService:
+    """Service for resumable, parallel multipart uploads.
+
+    Parts are streamed to individual files in a per-session directory and
+    verified against a SHA-256 checksum supplied by the client, so parts can
+    be uploaded in any order and retried independently. Completing the
+    upload concatenates the parts on disk into the final file.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.file_service = FileService(db)
+        # Parts are always staged locally, whatever backend stores the result
+        self.sessions_dir = ensure_directory(Path(settings.upload_dir) / SESSION_DIR_NAME)
+
+    def _session_dir(self, upload_id: str) -> Path:
+        """Get the directory holding the parts of an upload session."""
+        return self.sessions_dir / upload_id
+
+    @staticmethod
+    def _is_expired(session: UploadSession) -> bool:
+        """Check whether an upload session has passed its expiry time."""
+        expires_at = session.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at < datetime.now(timezone.utc)
+
+    def _expected_part_size(self, session: UploadSession, part_number: int) -> int:
+        """Get the exact size a part must have."""
+        if part_number < session.part_count:
+            return session.part_size
+        return session.total_size - (session.part_count - 1) * session.part_size
+
+    def initiate_upload(
+        self,
+        filename: str,
+        content_type: str,
+        total_size: int,
+        user_id: Optional[str] = None,
+        part_size: Optional[int] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        is_public: bool = False
+    ) -> UploadSession:
+        """Start a new multipart upload session."""
+        self.file_service._validate_metadata(
+            filename=filename,
+            content_type=content_type,
+            file_size=total_size,
+            max_size=settings.multipart_max_upload_size,
+        )
+
+        part_size = part_size or settings.multipart_part_size
+        if total_size <= 0 or part_size <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File size and part size must be positive"
+            )
+        if -(-total_size // part_size) > MAX_PARTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Upload would need more than {MAX_PARTS} parts; use a larger part size"
+            )
+
+        session = UploadSession(
+            upload_id=str(uuid.uuid4()),
+            original_filename=filename,
+            content_type=content_type,
+            total_size=total_size,
+            part_size=part_size,
+            user_id=user_id,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            is_public="true" if is_public else "false",
+            status="pending",
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=settings.upload_session_ttl_hours)
+        )
+
+        self._session_dir(session.upload_id).mkdir(parents=True, exist_ok=True)
+
+        self.db.add(session)
+        self.db.commit()
+        self.db.refresh(session)
+
+        return session
+
+    def get_session(self, upload_id: str, user_id: Optional[str] = None) -> UploadSession:
+        """Get an active upload session owned by the user."""
+        session = self.db.query(UploadSession).filter(
+            UploadSession.upload_id == upload_id
+        ).first()
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found"
+            )
+
+        if user_id is not None and session.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+
+        if session.status != "pending" or self._is_expired(session):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload session is no longer active"
+            )
+
+        return session
+
+    def list_parts(self, session: UploadSession) -> List[Dict[str, Any]]:
+        """List the parts received so far, so clients can resume."""
+        parts = []
+        session_dir = self._session_dir(session.upload_id)
+        if not session_dir.exists():
+            return parts
+
+        for part_path in sorted(session_dir.glob("*.part")):
+            part_number, checksum = part_path.stem.split("-", 1)
+            parts.append({
+                "part_number": int(part_number),
+                "checksum": checksum,
+                "size": part_path.stat().st_size,
+            })
+
+        return parts
+
+    async def upload_part(
+        self,
+        upload_id: str,
+        part_number: int,
+        chunks: AsyncIterator[bytes],
+        checksum: str,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Stream one part to disk and verify its SHA-256 checksum."""
+        session = self.get_session(upload_id, user_id)
+
+        if part_number < 1 or part_number > session.part_count:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Part number must be between 1 and {session.part_count}"
+            )
+
+        checksum = checksum.strip().lower()
+        expected_size = self._expected_part_size(session, part_number)
+        session_dir = self._session_dir(upload_id)
+        temp_path = session_dir / f"{part_number:05d}.{uuid.uuid4().hex}.tmp"
+
+        hasher = hashlib.sha256()
+        received = 0
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                async for chunk in chunks:
+                    received += len(chunk)
+                    if received > expected_size:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Part {part_number} exceeds its expected size of {expected_size} bytes"
+                        )
+                    hasher.update(chunk)
+                    await f.write(chunk)
+
+            if received != expected_size:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Part {part_number} must be {expected_size} bytes, got {received}"
+                )
+
+            if hasher.hexdigest() != checksum:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Checksum mismatch for part {part_number}"
+                )
+
+            # Replace any earlier attempt at this part, then publish atomically
+            for previous in session_dir.glob(f"{part_number:05d}-*.part"):
+                previous.unlink(missing_ok=True)
+            temp_path.replace(session_dir / f"{part_number:05d}-{checksum}.part")
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+        return {"part_number": part_number, "checksum": checksum, "size": received}
+
+    def _assemble(self, session: UploadSession, part_paths: List[Path], storage_key: str) -> None:
+        """Stream the concatenated parts into storage while scanning the content."""
+        reader = _PartReader(part_paths, session.content_type, self.file_service)
+        with reader:
+            self.file_service.backend.save(storage_key, reader)
+
+    def _claim(self, session: UploadSession) -> None:
+        """Move a session from pending to completing, or fail if another request got there first.
+
+        The conditional UPDATE is atomic, so of two concurrent completions of
+        the same session only one assembles the file.
+        """
+        claimed = self.db.query(UploadSession).filter(
+            UploadSession.id == session.id,
+            UploadSession.status == "pending"
+        ).update({UploadSession.status: "completing"}, synchronize_session=False)
+        self.db.commit()
+        if not claimed:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload is already being completed"
+            )
+
+    async def complete_upload(self, upload_id: str, user_id: Optional[str] = None) -> FileUpload:
+        """Assemble all parts into the final file and record it."""
+        session = self.get_session(upload_id, user_id)
+
+        parts = {part["part_number"]: part for part in self.list_parts(session)}
+        missing = [n for n in range(1, session.part_count + 1) if n not in parts]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Missing parts: {missing[:20]}"
+            )
+
+        session_dir = self._session_dir(upload_id)
+        part_paths = [
+            session_dir / f"{n:05d}-{parts[n]['checksum']}.part"
+            for n in range(1, session.part_count + 1)
+        ]
+
+        self._claim(session)
+
+        filename = self.file_service._generate_filename(session.original_filename)
+        storage_key = self.file_service._build_storage_key(filename, session.content_type)
+
+        try:
+            await run_in_threadpool(self._assemble, session, part_paths, storage_key)
+
+            file_upload = FileUpload(
+                filename=filename,
+                original_filename=session.original_filename,
+                file_path=storage_key,
+                file_size=session.total_size,
+                content_type=session.content_type,
+                user_id=session.user_id,
+                resource_type=session.resource_type,
+                resource_id=session.resource_id,
+                is_public=session.is_public
+            )
+            self.db.add(file_upload)
+            self.db.flush()
+
+            session.status = "completed"
+            session.file_id = file_upload.id
+            self.db.commit()
+            self.db.refresh(file_upload)
+        except Exception:
+            self.db.rollback()
+            self.file_service.backend.delete(storage_key)
+            # Let the client retry the completion
+            session.status = "pending"
+            self.db.commit()
+            raise
+
+        shutil.rmtree(session_dir, ignore_errors=True)
+
+        if session.content_type.startswith('image/'):
+            schedule_variant_generation(storage_key)
+
+        return file_upload
+
+    def abort_upload(self, upload_id: str, user_id: Optional[str] = None) -> bool:
+        """Abort an upload session and discard its parts."""
+        session = self.get_session(upload_id, user_id)
+
+        session.status = "aborted"
+        self.db.commit()
+
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+        return True
+
+    def purge_expired_sessions(self) -> int:
+        """Discard the parts of abandoned upload sessions.
+
+        Sessions left completing by a crash mid-assembly are swept too, once
+        they are UPLOAD_COMPLETION_GRACE_HOURS past expiry so that a slow
+        completion still running isn't cut short.
+        """
+        now = datetime.now(timezone.utc)
+        grace = timedelta(hours=settings.upload_completion_grace_hours)
+        expired_sessions = self.db.query(UploadSession).filter(or_(
+            and_(UploadSession.status == "pending", UploadSession.expires_at < now),
+            and_(UploadSession.status == "completing", UploadSession.expires_at < now - grace)
+        )).all()
+
+        for session in expired_sessions:
+            shutil.rmtree(self._session_dir(session.upload_id), ignore_errors=True)
+            session.status = "expired"
+
+        self.db.commit()
+
+        if expired_sessions:
+            logger.info(f"Purged {len(expired_sessions)} expired upload sessions")
+        return len(expired_sessions)
+
+
+class _PartReader(io.RawIOBase):
+    """Read a sequence of part files as one stream, scanning each chunk."""
+
+    def __init__(self, part_paths: List[Path], content_type: str, file_service: FileService):
+        self._part_paths = iter(part_paths)
+        self._current = None
+        self._content_type = content_type
+        self._file_service = file_service
+        self._tail = b""
+        self._first_chunk = True
+
+    def readable(self) -> bool:
+        return True
+
+    def _next_chunk(self, size: int) -> bytes:
+        while True:
+            if self._current is None:
+                part_path = next(self._part_paths, None)
+                if part_path is None:
+                    return b""
+                self._current = open(part_path, 'rb')
+
+            chunk = self._current.read(size)
+            if chunk:
+                return chunk
+            self._current.close()
+            self._current = None
+
+    def read(self, size: int = -1) -> bytes:
+        size = COPY_CHUNK_SIZE if size is None or size < 0 else size
+        chunk = self._next_chunk(size)
+        if chunk:
+            # Only the start of the file carries the format signature
+            content_type = self._content_type if self._first_chunk else "application/octet-stream"
+            self._file_service._validate_file_content(self._tail + chunk, content_type)
+            self._first_chunk = False
+            self._tail = chunk[-SCAN_OVERLAP:]
+        return chunk
+
+    def readinto(self, buffer) -> int:
+        chunk = self.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+    def close(self) -> None:
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+        super().close()
+
+
+async def run_upload_session_gc(interval: Optional[int] = None) -> None:
+    """Periodically purge abandoned upload sessions."""
+    from backend.shared.database import get_db_session
+
+    interval = interval or settings.upload_session_gc_interval
+
+    def purge() -> int:
+        db = get_db_session()
+        try:
+            return MultipartUploadService(db).purge_expired_sessions()
+        finally:
+            db.close()
+
+    while True:
+        try:
+            await run_in_threadpool(purge)
+        except Exception as e:
+            logger.error(f"Failed to purge expired upload sessions: {str(e)}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,53 @@
+"""Test configuration and fixtures for shared utilities."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+from backend.shared.database import Base
+from backend.shared.audit.models import AuditLog
+from backend.shared.storage.models import FileUpload
+
+
+@pytest.fixture(scope="function")
+def db_engine():
+    """Create an in-memory database engine."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(db_engine):
+    """Create a test database session."""
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """Point local file storage at a temporary directory."""
+    from backend.shared.config import settings
+    from backend.shared.storage.backends import get_storage_backend
+    
+    monkeypatch.setattr(settings, "storage_backend", "local")
+    monkeypatch.setattr(settings, "upload_dir", str(tmp_path))
+    get_storage_backend.cache_clear()
+    yield tmp_path
+    get_storage_backend.cache_clear()
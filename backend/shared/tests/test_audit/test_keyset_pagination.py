@@ -0,0 +1,77 @@
+"""Test keyset pagination of audit logs."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from backend.shared.audit import AuditService
+from backend.shared.audit.models import AuditLog
+from backend.shared.utils.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+def test_cursor_round_trip():
+    """Test cursors decode back to the position they encode."""
+    created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_invalid_cursor():
+    """Test malformed cursors are rejected."""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor")
+    
+    assert exc_info.value.status_code == 400
+
+
+def test_pages_cover_every_log_once(db_session):
+    """Test walking pages by cursor, including rows sharing a timestamp."""
+    created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.add_all([
+        AuditLog(
+            action="update",
+            resource_type="product",
+            user_id="u1",
+            # Pairs of rows share a timestamp, so the id breaks ties
+            created_at=created_at + timedelta(minutes=i // 2),
+        )
+        for i in range(7)
+    ])
+    db_session.add(AuditLog(action="update", resource_type="product", user_id="u2", created_at=created_at))
+    db_session.commit()
+    service = AuditService(db_session)
+    
+    seen = []
+    cursor = None
+    while True:
+        page = service.get_audit_logs(user_id="u1", limit=3, cursor=cursor)
+        seen.extend(log.id for log in page)
+        cursor = next_cursor(page, 3)
+        if cursor is None:
+            break
+    
+    expected = [
+        log.id for log in db_session.query(AuditLog)
+        .filter(AuditLog.user_id == "u1")
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+    ]
+    assert seen == expected
+    assert len(seen) == 7
+
+
+def test_offset_is_ignored_with_cursor(db_session):
+    """Test a cursor alone decides where the next page starts."""
+    created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db_session.add_all([
+        AuditLog(action="update", resource_type="product", user_id="u1", created_at=created_at + timedelta(minutes=i))
+        for i in range(6)
+    ])
+    db_session.commit()
+    service = AuditService(db_session)
+    first = service.get_audit_logs(user_id="u1", limit=2)
+    
+    page = service.get_audit_logs(user_id="u1", limit=2, offset=2, cursor=next_cursor(first, 2))
+    
+    expected = service.get_audit_logs(user_id="u1", limit=2, offset=2)
+    assert [log.id for log in page] == [log.id for log in expected]
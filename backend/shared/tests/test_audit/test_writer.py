@@ -0,0 +1,136 @@
+"""Test the batched audit log writer."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.shared.audit import AuditService
+from backend.shared.audit import writer as writer_module
+from backend.shared.audit.models import AuditLog
+from backend.shared.audit.writer import AuditLogWriter
+
+
+def make_event(action: str = "login") -> dict:
+    """Build an audit event as queued by AuditService."""
+    return {
+        "user_id": "user-1",
+        "action": action,
+        "resource_type": "user",
+        "resource_id": None,
+        "details": None,
+        "metadata": {"source": "test"},
+        "ip_address": "127.0.0.1",
+        "user_agent": None,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    """Create sessions bound to the test database."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+
+@pytest.fixture
+def audit_writer(session_factory, tmp_path):
+    """Create an audit writer that spools to a temporary file."""
+    writer = AuditLogWriter(
+        session_factory=session_factory,
+        max_queue_size=100,
+        batch_size=10,
+        flush_interval=0.05,
+        enqueue_timeout=0,
+        spool_path=str(tmp_path / "audit_spool.jsonl"),
+        dead_letter_path=str(tmp_path / "audit_dead_letter.jsonl"),
+    )
+    yield writer
+    writer.stop()
+
+
+def test_writer_flushes_in_batches(audit_writer, db_session):
+    """Test queued events are written in multi-row batches and drained on stop."""
+    audit_writer.start()
+    for i in range(25):
+        assert audit_writer.submit(make_event(f"action-{i}"))
+    
+    audit_writer.stop()
+    
+    assert db_session.query(AuditLog).count() == 25
+    assert audit_writer.stats["written"] == 25
+    assert not audit_writer.spool_path.exists()
+
+
+def test_full_queue_spills_to_spool_and_replays(session_factory, db_session, tmp_path):
+    """Test backpressure spools events that are replayed on the next start."""
+    writer = AuditLogWriter(
+        session_factory=session_factory,
+        max_queue_size=1,
+        batch_size=10,
+        flush_interval=0.05,
+        enqueue_timeout=0,
+        spool_path=str(tmp_path / "audit_spool.jsonl"),
+    )
+    
+    assert writer.submit(make_event("queued"))
+    assert not writer.submit(make_event("spooled"))
+    assert writer.spool_path.exists()
+    
+    writer.start()
+    writer.stop()
+    
+    actions = {log.action for log in db_session.query(AuditLog).all()}
+    assert actions == {"queued", "spooled"}
+    assert writer.stats["replayed"] == 1
+    assert not writer.spool_path.exists()
+
+
+def test_rejected_event_is_dead_lettered(audit_writer, db_session):
+    """Test one bad event doesn't keep the rest of its batch out of the database."""
+    bad_event = make_event("bad")
+    bad_event["action"] = None  # violates NOT NULL
+    
+    audit_writer.start()
+    audit_writer.submit(make_event("before"))
+    audit_writer.submit(bad_event)
+    audit_writer.submit(make_event("after"))
+    audit_writer.stop()
+    
+    actions = {log.action for log in db_session.query(AuditLog).all()}
+    assert actions == {"before", "after"}
+    assert audit_writer.stats["failed_batches"] == 1
+    assert audit_writer.stats["dead_lettered"] == 1
+    assert audit_writer.dead_letter_path.read_text().count("\n") == 1
+    assert not audit_writer.spool_path.exists()
+
+
+def test_failed_batch_is_spooled_when_database_fails(audit_writer):
+    """Test events are kept for replay when the database, not the event, is at fault."""
+    def unavailable():
+        raise OperationalError("INSERT", {}, Exception("connection refused"))
+    
+    class BrokenSession:
+        execute = staticmethod(lambda *args, **kwargs: unavailable())
+        commit = rollback = close = staticmethod(lambda: None)
+    
+    audit_writer.session_factory = BrokenSession
+    
+    assert audit_writer._write([make_event("first"), make_event("second")]) == 0
+    
+    assert audit_writer.stats["spooled"] == 2
+    assert audit_writer.spool_path.read_text().count("\n") == 2
+    assert not audit_writer.dead_letter_path.exists()
+
+
+def test_log_action_queues_when_writer_running(audit_writer, db_session, monkeypatch):
+    """Test AuditService leaves the caller's session alone when the writer is running."""
+    monkeypatch.setattr(writer_module, "_writer", audit_writer)
+    audit_writer.start()
+    
+    audit_log = AuditService(db_session).log_user_login("user-1", ip_address="127.0.0.1")
+    
+    assert audit_log.id is None
+    assert audit_log not in db_session
+    audit_writer.stop()
+    assert db_session.query(AuditLog).filter(AuditLog.action == "login").count() == 1
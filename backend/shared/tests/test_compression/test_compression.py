@@ -0,0 +1,125 @@
+"""Test response compression."""
+
+import gzip
+
+import brotli
+import pytest
+import zstandard
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.shared import compression
+from backend.shared.compression import CompressionMiddleware, accept_encoding, available_codecs, negotiate
+from backend.shared.config import settings
+
+LEVELS = {"zstd": 3, "br": 4, "gzip": 6}
+PAYLOAD = {"items": [{"id": i, "name": f"Product {i}", "category": "Electronics"} for i in range(100)]}
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+
+    @app.get("/items")
+    def items():
+        return PAYLOAD
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"\x00" * 4096, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"line {i}\n" * 50 for i in range(20)), media_type="text/plain")
+
+    @app.get("/tagged")
+    def tagged():
+        return PlainTextResponse("x" * 2048, headers={"ETag": '"abc"'})
+
+    return app
+
+
+def make_client(app, **options) -> TestClient:
+    app.add_middleware(CompressionMiddleware, codecs=available_codecs(LEVELS, ["zstd", "br", "gzip"]), **options)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("coding, decode", [
+    ("zstd", lambda body: zstandard.ZstdDecompressor().decompressobj().decompress(body)),
+    ("br", brotli.decompress),
+    ("gzip", gzip.decompress),
+])
+def test_negotiated_coding_round_trips(app, coding, decode):
+    client = make_client(app)
+
+    with client.stream("GET", "/items", headers={"Accept-Encoding": coding}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == coding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(raw)
+    assert decode(raw) == client.get("/items", headers={"Accept-Encoding": "identity"}).content
+
+
+def test_small_and_incompressible_bodies_are_left_alone(app):
+    client = make_client(app)
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    image = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in small.headers
+    assert small.headers["vary"] == "Accept-Encoding"
+    assert "content-encoding" not in image.headers
+    assert "vary" not in image.headers
+
+
+def test_streamed_body_is_compressed_in_chunks(app):
+    client = make_client(app, minimum_size=100)
+
+    response = client.get("/stream", headers={"Accept-Encoding": "br, gzip"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert "content-length" not in response.headers
+    assert response.text == "".join(f"line {i}\n" * 50 for i in range(20))
+
+
+def test_large_bodies_are_compressed_in_the_thread_pool(app):
+    client = make_client(app, offload_size=0)
+
+    response = client.get("/items", headers={"Accept-Encoding": "zstd"})
+
+    assert response.headers["content-encoding"] == "zstd"
+    assert response.json() == PAYLOAD
+
+
+def test_strong_etag_is_weakened(app):
+    client = make_client(app)
+
+    assert client.get("/tagged", headers={"Accept-Encoding": "gzip"}).headers["etag"] == 'W/"abc"'
+    assert client.get("/tagged", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"abc"'
+
+
+def test_negotiate():
+    preference = ["zstd", "br", "gzip"]
+
+    assert negotiate("gzip, deflate, br", preference) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", preference) == "gzip"
+    assert negotiate("zstd;q=0, *", preference) == "br"
+    assert negotiate("identity", preference) is None
+    assert negotiate(None, preference) is None
+    assert negotiate("GZIP", ["gzip"]) == "gzip"
+
+
+def test_accept_encoding_follows_what_httpx_decodes(monkeypatch):
+    monkeypatch.setattr(settings, "compression_encodings", ["gzip"])
+
+    assert accept_encoding() == "zstd, br, gzip"
+
+    # httpx before 0.27.1 has no zstd decoder
+    monkeypatch.delitem(compression.SUPPORTED_DECODERS, "zstd")
+    assert accept_encoding() == "br, gzip"
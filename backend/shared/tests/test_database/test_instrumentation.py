@@ -0,0 +1,114 @@
+"""Test SQL query instrumentation."""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from backend.shared.config import settings
+from backend.shared.database import (
+    QueryStatsMiddleware,
+    get_query_stats,
+    instrument_queries,
+    query_budget,
+    track_queries,
+)
+from backend.shared.database.instrumentation import QueryBudgetExceeded, normalize_sql
+
+
+@pytest.fixture
+def engine():
+    """Create an instrumented engine with a small table."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    instrument_queries(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (name) VALUES ('a'), ('b'), ('c')"))
+    yield engine
+    engine.dispose()
+
+
+def fetch_items_one_by_one(engine) -> None:
+    """Load items the N+1 way."""
+    with engine.connect() as conn:
+        for item_id in conn.execute(text("SELECT id FROM items")).scalars().all():
+            conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id})
+
+
+def test_normalize_sql():
+    """Test statements differing only in values normalize the same."""
+    assert normalize_sql("SELECT *\n  FROM items WHERE id IN (?, ?, ?) AND name = 'x'") == (
+        "SELECT * FROM items WHERE id IN (?...) AND name = ?"
+    )
+    assert normalize_sql("SELECT * FROM items WHERE id IN (%(id_1)s, %(id_2)s) LIMIT 10") == (
+        "SELECT * FROM items WHERE id IN (?...) LIMIT ?"
+    )
+
+
+def test_track_queries_flags_repeated_statements(engine, monkeypatch, caplog):
+    """Test queries are counted per context and repeats are flagged."""
+    monkeypatch.setattr(settings, "n_plus_one_threshold", 3)
+
+    with caplog.at_level(logging.WARNING), track_queries() as stats:
+        fetch_items_one_by_one(engine)
+
+    assert stats.count == 4
+    assert stats.total_time > 0
+    assert stats.n_plus_one == ["SELECT name FROM items WHERE id = ?"]
+    assert "Possible N+1" in caplog.text
+    assert get_query_stats() is None
+
+
+def test_slow_queries_are_logged_without_values(engine, monkeypatch, caplog):
+    """Test slow statements are logged with parameter types only."""
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+
+    with caplog.at_level(logging.WARNING):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT * FROM items WHERE name = :name"), {"name": "secret"})
+
+    assert "Slow query" in caplog.text
+    assert "parameters=['str']" in caplog.text
+    assert "secret" not in caplog.text
+
+
+def test_middleware_tracks_each_request(engine, monkeypatch):
+    """Test stats follow requests into threadpool endpoints."""
+    monkeypatch.setattr(settings, "debug", True)
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/items")
+    def list_items():
+        fetch_items_one_by_one(engine)
+        return {"queries": get_query_stats().count}
+
+    client = TestClient(app)
+    first = client.get("/items")
+    second = client.get("/items")
+
+    assert first.json() == {"queries": 4}
+    assert second.json() == {"queries": 4}
+    assert second.headers["server-timing"].endswith('desc="4 queries"')
+
+
+def test_query_budget(engine):
+    """Test the budget helper fails blocks that run too many queries."""
+    with query_budget(4, engine=engine) as stats:
+        fetch_items_one_by_one(engine)
+    assert stats.count == 4
+
+    with pytest.raises(QueryBudgetExceeded, match="at most 2 queries, ran 4"):
+        with query_budget(2, engine=engine):
+            fetch_items_one_by_one(engine)
+
+    with pytest.raises(QueryBudgetExceeded, match="3 x SELECT name FROM items"):
+        with query_budget(10, engine=engine, allow_repeats=False):
+            fetch_items_one_by_one(engine)
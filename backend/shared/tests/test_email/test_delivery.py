@@ -0,0 +1,149 @@
+"""Test pooled SMTP delivery."""
+
+import asyncio
+import socket
+import time
+from email.message import EmailMessage
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+from backend.shared.config import settings
+from backend.shared.email import email_service
+from backend.shared.email.delivery import SMTPDeliveryQueue
+
+
+class RecordingHandler:
+    """SMTP handler that records messages and can fail the first attempts."""
+    
+    def __init__(self, transient_failures: int = 0, delay: float = 0):
+        self.messages = []
+        self.transient_failures = transient_failures
+        self.delay = delay
+    
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.delay)
+        if self.transient_failures:
+            self.transient_failures -= 1
+            return "451 Try again later"
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server():
+    """Run a local SMTP stand-in server."""
+    servers = []
+    
+    def start(handler):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        servers.append(controller)
+        return port
+    
+    yield start
+    for controller in servers:
+        controller.stop()
+
+
+def make_message(to_email: str) -> EmailMessage:
+    """Build a simple message."""
+    msg = EmailMessage()
+    msg["Subject"] = "Hello"
+    msg["From"] = "noreply@example.com"
+    msg["To"] = to_email
+    msg.set_content("Hello there")
+    return msg
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    """Wait until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def make_queue(port: int, **kwargs) -> SMTPDeliveryQueue:
+    """Create a delivery queue pointed at the local server."""
+    options = dict(
+        host="127.0.0.1",
+        port=port,
+        username="",
+        password="",
+        use_tls=False,
+        workers=1,
+        retry_backoff=0.01,
+    )
+    options.update(kwargs)
+    return SMTPDeliveryQueue(**options)
+
+
+def test_messages_share_one_connection(smtp_server):
+    """Test a worker reuses its SMTP session across messages."""
+    handler = RecordingHandler()
+    delivery_queue = make_queue(smtp_server(handler))
+    delivery_queue.start()
+    
+    for i in range(5):
+        assert delivery_queue.enqueue(make_message(f"user{i}@example.com"))
+    delivery_queue.stop()
+    
+    stats = delivery_queue.get_stats()
+    assert len(handler.messages) == 5
+    assert stats["sent"] == 5
+    assert stats["connections_opened"] == 1
+
+
+def test_transient_failures_are_retried(smtp_server):
+    """Test 4xx responses are retried with backoff."""
+    handler = RecordingHandler(transient_failures=2)
+    delivery_queue = make_queue(smtp_server(handler))
+    delivery_queue.start()
+    
+    delivery_queue.enqueue(make_message("user@example.com"))
+    wait_for(lambda: delivery_queue.get_stats()["sent"] == 1)
+    delivery_queue.stop()
+    
+    stats = delivery_queue.get_stats()
+    assert stats["retried"] == 2
+    assert stats["failed"] == 0
+    assert [envelope.rcpt_tos for envelope in handler.messages] == [["user@example.com"]]
+
+
+def test_gives_up_after_max_retries(smtp_server):
+    """Test delivery stops after the retry budget is spent."""
+    handler = RecordingHandler(transient_failures=10)
+    delivery_queue = make_queue(smtp_server(handler), max_retries=1)
+    delivery_queue.start()
+    
+    delivery_queue.enqueue(make_message("user@example.com"))
+    wait_for(lambda: delivery_queue.get_stats()["failed"] == 1)
+    delivery_queue.stop()
+    
+    assert delivery_queue.get_stats()["retried"] == 1
+    assert handler.messages == []
+
+
+def test_bulk_send_waits_for_a_full_queue(smtp_server, monkeypatch):
+    """Test a bulk send larger than the queue drops nobody."""
+    handler = RecordingHandler(delay=0.01)
+    delivery_queue = make_queue(smtp_server(handler), max_queue_size=2)
+    delivery_queue.start()
+    monkeypatch.setattr(settings, "environment", "production")
+    monkeypatch.setattr(email_service, "get_delivery_queue", lambda: delivery_queue)
+    recipients = [
+        (f"user{i}@example.com", {"user_name": f"User {i}", "verification_url": f"https://example.com/{i}"})
+        for i in range(10)
+    ]
+    
+    accepted = email_service.EmailService().send_bulk_email("Verify", "verification", recipients)
+    delivery_queue.stop()
+    
+    assert accepted == 10
+    assert delivery_queue.get_stats()["dropped"] == 0
+    assert len(handler.messages) == 10
@@ -0,0 +1,44 @@
+"""Test compiled email templates."""
+
+from backend.shared.email import EmailService, EmailTemplates
+from backend.shared.email.templates import TEMPLATES, render_many, render_template
+
+
+def test_html_templates_are_autoescaped():
+    """Test user-supplied values are escaped in HTML but not in text."""
+    html = EmailTemplates.get_welcome_email_html(user_name="<script>x</script>")
+    text = EmailTemplates.get_welcome_email_text(user_name="<script>x</script>")
+    
+    assert "&lt;script&gt;" in html
+    assert "<script>x</script>" not in html
+    assert "<script>x</script>" in text
+
+
+def test_render_many_matches_individual_renders():
+    """Test the bulk path produces exactly what a normal render does."""
+    contexts = [
+        {"user_name": f"User <{i}> & co", "reset_url": f"https://example.com/reset?token={i}&x=1"}
+        for i in range(5)
+    ]
+    
+    for name in ("password_reset.html", "password_reset.txt"):
+        expected = [render_template(name, **context) for context in contexts]
+        assert list(render_many(name, contexts)) == expected
+
+
+def test_render_many_falls_back_for_transformed_variables(monkeypatch):
+    """Test templates that do more than print variables are rendered normally."""
+    monkeypatch.setitem(TEMPLATES, "shout.txt", "{% if loud %}{{ name|upper }}!{% else %}{{ name }}.{% endif %}")
+    contexts = [{"name": "ann", "loud": True}, {"name": "bob", "loud": False}]
+    
+    assert list(render_many("shout.txt", contexts)) == ["ANN!", "bob."]
+
+
+def test_send_bulk_email():
+    """Test bulk sends render one email per recipient."""
+    recipients = [
+        (f"user{i}@example.com", {"user_name": f"User {i}", "verification_url": f"https://example.com/{i}"})
+        for i in range(3)
+    ]
+    
+    assert EmailService().send_bulk_email("Verify", "verification", recipients) == 3
@@ -0,0 +1,105 @@
+"""Test Prometheus metrics."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from backend.shared.monitoring import instrument_engine, setup_metrics
+from backend.shared.utils import HTTPClient
+
+
+def sample(name: str, **labels) -> float:
+    """Get a metric's current value, 0 if it was never recorded."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client():
+    """Create an instrumented app."""
+    app = FastAPI()
+    setup_metrics(app)
+    router = APIRouter(prefix="/items")
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return {"id": item_id, "name": "x" * 100}
+
+    app.include_router(router, prefix="/api/v1")
+    return TestClient(app)
+
+
+def test_requests_are_labelled_by_route(client):
+    """Test latency, status and size are recorded per route template."""
+    labels = {"method": "GET", "route": "/api/v1/items/{item_id}"}
+    requests_before = sample("http_requests_total", status="200", **labels)
+    not_found_before = sample("http_requests_total", status="404", **labels)
+    size_before = sample("http_response_size_bytes_sum", **labels)
+
+    client.get("/api/v1/items/1")
+    client.get("/api/v1/items/2")
+    client.get("/api/v1/items/0")
+    client.get("/nowhere")
+
+    assert sample("http_requests_total", status="200", **labels) - requests_before == 2
+    assert sample("http_requests_total", status="404", **labels) - not_found_before == 1
+    assert sample("http_request_duration_seconds_count", **labels) >= 3
+    assert sample("http_response_size_bytes_sum", **labels) - size_before > 200
+    assert sample("http_requests_total", method="GET", route="<unmatched>", status="404") >= 1
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+def test_metrics_endpoint(client):
+    """Test /metrics serves the exposition format and isn't itself counted."""
+    client.get("/api/v1/items/1")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/api/v1/items/{item_id}",status="200"}' in response.text
+    assert 'route="/metrics"' not in response.text
+
+
+def test_db_pool_gauges(tmp_path):
+    """Test pool gauges follow connections being checked out and returned."""
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db", poolclass=QueuePool, pool_size=3)
+    instrument_engine(engine)
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        assert sample("db_pool_checked_out") == 2
+        assert sample("db_pool_size") == 3
+
+    assert sample("db_pool_checked_out") == 0
+    assert sample("db_pool_checked_in") == 2
+    engine.dispose()
+
+
+def test_http_client_latency(monkeypatch):
+    """Test outbound requests are timed per target and status."""
+    def handler(request):
+        return httpx.Response(200 if request.url.path == "/ok" else 500, json={})
+
+    transport = httpx.MockTransport(handler)
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: real_client(transport=transport, **kwargs))
+    labels = {"target": "crm-service:8000", "method": "GET"}
+    ok_before = sample("http_client_request_duration_seconds_count", status="200", **labels)
+    failed_before = sample("http_client_request_duration_seconds_count", status="500", **labels)
+
+    http_client = HTTPClient("http://crm-service:8000")
+    asyncio.run(http_client.get("/ok"))
+    with pytest.raises(HTTPException):
+        asyncio.run(http_client.get("/broken"))
+
+    assert sample("http_client_request_duration_seconds_count", status="200", **labels) - ok_before == 1
+    assert sample("http_client_request_duration_seconds_count", status="500", **labels) - failed_before == 1
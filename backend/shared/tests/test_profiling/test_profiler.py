@@ -0,0 +1,167 @@
+"""Test the sampling profiler."""
+
+import asyncio
+import json
+import signal
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.shared.auth import get_current_user
+from backend.shared.config import settings
+from backend.shared.profiling import (
+    ContinuousProfiler,
+    StackSampler,
+    handle_profile_signal,
+    profile,
+    router,
+    setup_profiling,
+)
+
+
+def spin(stop: threading.Event) -> None:
+    """Burn CPU until told to stop."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    """Run a CPU-bound thread for the duration of a test."""
+    stop = threading.Event()
+    thread = threading.Thread(target=spin, args=(stop,), name="busy-worker")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+@pytest.fixture
+def client():
+    """Create an app with the profiling endpoints and a switchable user role."""
+    app = FastAPI()
+    app.include_router(router)
+    user = {"user_id": "1", "email": "admin@example.com", "role": "admin", "permissions": []}
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = TestClient(app)
+    client.user = user
+    return client
+
+
+def test_sampler_collapses_stacks(busy_thread):
+    """Test samples are counted per stack with the thread name as root."""
+    sampler = StackSampler(interval=0.005)
+    sampler.start()
+    time.sleep(0.2)
+    sampler.stop()
+    stacks = sampler.take()
+
+    busy = [stack for stack in stacks if stack.startswith("busy-worker;")]
+    assert busy
+    assert all("spin (" in stack for stack in busy)
+    assert "test_profiler.py:" in busy[0]
+    assert not any(stack.startswith("stack-sampler;") for stack in stacks)
+    assert sampler.take() == {}
+
+
+def test_profile_output_is_flamegraph_format(busy_thread):
+    """Test each line is a semicolon-separated stack and a count."""
+    lines = profile(0.1, interval=0.005).splitlines()
+
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert ";" in stack and int(count) > 0
+
+
+def test_profile_endpoint(client, busy_thread):
+    """Test admins get collapsed stacks and, on request, a task dump."""
+    response = client.get("/debug/profile", params={"seconds": 0.1, "interval": 0.005})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "busy-worker;" in response.text
+
+    response = client.get("/debug/profile", params={"seconds": 0.05, "include_tasks": True})
+    assert "busy-worker;" in response.json()["collapsed"]
+    assert response.json()["tasks"]
+
+    assert client.get("/debug/profile", params={"seconds": 3600}).status_code == 400
+
+
+def test_profile_endpoint_is_admin_only(client):
+    """Test other roles can neither profile nor dump tasks."""
+    client.user["role"] = "manager"
+
+    assert client.get("/debug/profile", params={"seconds": 0.01}).status_code == 403
+    assert client.get("/debug/tasks").status_code == 403
+
+
+def test_continuous_profiler_rotates_files(tmp_path, busy_thread):
+    """Test each window is written to its own file and only the newest are kept."""
+    profiler = ContinuousProfiler(directory=str(tmp_path), interval=0.005, window=0.05, keep=2, service_name="crm")
+    profiler.start()
+    time.sleep(0.3)
+    profiler.stop()
+
+    files = list(tmp_path.glob("crm-*.collapsed"))
+    assert len(files) == 2
+    assert all("busy-worker;" in path.read_text() for path in files)
+
+
+def test_signal_writes_profile(tmp_path, monkeypatch, busy_thread):
+    """Test the signal handler profiles in the background into the profile dir, one at a time."""
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profiling_signal_seconds", 0.1)
+
+    async def run():
+        first = handle_profile_signal()
+        second = handle_profile_signal()
+        return await first, await second
+
+    path, skipped = asyncio.run(run())
+
+    assert skipped is None
+    assert "busy-worker;" in path.read_text()
+    assert list(tmp_path.glob("*.collapsed")) == [path]
+    assert len(list(tmp_path.glob("*.tasks.json"))) == 1
+
+
+def test_signal_handler_is_installed_on_startup(monkeypatch):
+    """Test SIGUSR2 is handled through the event loop while the app runs."""
+    installed = []
+    loop = asyncio.new_event_loop()
+    loop_class = type(loop)
+    loop.close()
+    monkeypatch.setattr(loop_class, "add_signal_handler", lambda self, signum, callback: installed.append(signum))
+    monkeypatch.setattr(loop_class, "remove_signal_handler", lambda self, signum: installed.remove(signum))
+    app = FastAPI()
+    setup_profiling(app)
+
+    with TestClient(app):
+        assert installed == [signal.SIGUSR2]
+    assert installed == []
+
+
+def test_task_dump(client):
+    """Test the task dump shows where each pending task is waiting."""
+    async def wait_for_stock():
+        await asyncio.sleep(3600)
+
+    async def sync_inventory():
+        await wait_for_stock()
+
+    @client.app.post("/sync")
+    async def start_sync():
+        asyncio.create_task(sync_inventory(), name="inventory-sync")
+
+    with client:
+        client.post("/sync")
+        tasks = {task["name"]: task for task in client.get("/debug/tasks").json()["tasks"]}
+
+    stack = tasks["inventory-sync"]["stack"]
+    assert tasks["inventory-sync"]["coroutine"].endswith("sync_inventory")
+    assert [frame.rsplit(" in ", 1)[1] for frame in stack] == ["sync_inventory", "wait_for_stock", "sleep"]
+    assert json.dumps(stack)
@@ -0,0 +1,62 @@
+"""Test storage backends."""
+
+import io
+import pytest
+
+from backend.shared.storage.backends import LocalStorageBackend, S3StorageBackend
+
+
+def test_local_backend_shards_keys(tmp_path):
+    """Test keys are spread over two levels of hash-prefix directories."""
+    backend = LocalStorageBackend(str(tmp_path))
+    
+    key = backend.build_key("3f2a.png", "image/png")
+    backend.save(key, io.BytesIO(b"data"))
+    
+    file_type, shard1, shard2, filename = key.split("/")
+    assert (file_type, filename) == ("image", "3f2a.png")
+    assert len(shard1) == len(shard2) == 2
+    assert (tmp_path / key).read_bytes() == b"data"
+    assert b"".join(backend.iter_chunks(key, chunk_size=2)) == b"data"
+
+
+def test_local_backend_rejects_keys_outside_root(tmp_path):
+    """Test keys can't escape the storage root."""
+    backend = LocalStorageBackend(str(tmp_path / "uploads"))
+    
+    with pytest.raises(ValueError):
+        backend.save("../escape.txt", io.BytesIO(b"data"))
+
+
+def test_local_backend_delete(tmp_path):
+    """Test deleting files, including ones that are already gone."""
+    backend = LocalStorageBackend(str(tmp_path))
+    backend.save("text/aa/bb/notes.txt", io.BytesIO(b"data"))
+    
+    backend.delete("text/aa/bb/notes.txt")
+    backend.delete("text/aa/bb/notes.txt")
+    
+    assert not backend.exists("text/aa/bb/notes.txt")
+
+
+def test_s3_backend_streams_objects():
+    """Test the S3 backend against a moto stand-in."""
+    boto3 = pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+    
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="uploads")
+        backend = S3StorageBackend(bucket="uploads", prefix="files", client=client)
+        content = b"x" * (3 * 1024 * 1024)
+        
+        key = backend.build_key("big.csv", "text/csv")
+        backend.save(key, io.BytesIO(content))
+        
+        assert backend.exists(key)
+        assert client.head_object(Bucket="uploads", Key=f"files/{key}")["ContentLength"] == len(content)
+        assert b"".join(backend.iter_chunks(key, chunk_size=64 * 1024)) == content
+        assert backend.local_path(key) is None
+        
+        backend.delete(key)
+        assert not backend.exists(key)
@@ -0,0 +1,65 @@
+"""Test image variant generation."""
+
+import pytest
+from fastapi import HTTPException
+
+from backend.shared.storage import FileService, FileUpload
+from backend.shared.storage.image_variants import generate_variants
+
+Image = pytest.importorskip("PIL.Image")
+
+
+SAMPLE_KEY = "image/ab/cd/sample.png"
+
+
+@pytest.fixture
+def sample_image(upload_dir):
+    """Create a sample PNG image in local storage."""
+    image_path = upload_dir / SAMPLE_KEY
+    image_path.parent.mkdir(parents=True)
+    Image.new("RGB", (1200, 600), color=(200, 30, 30)).save(image_path)
+    return image_path
+
+
+def test_generate_variants(sample_image, upload_dir):
+    """Test variants are resized WebP files next to the original."""
+    generated = generate_variants(SAMPLE_KEY, {"thumb": 160, "webp": 0})
+    
+    assert generated == {
+        "thumb": "image/ab/cd/sample_thumb.webp",
+        "webp": "image/ab/cd/sample_webp.webp",
+    }
+    with Image.open(upload_dir / generated["thumb"]) as thumb:
+        assert thumb.format == "WEBP"
+        assert thumb.size == (160, 80)
+    with Image.open(upload_dir / generated["webp"]) as full:
+        assert full.size == (1200, 600)
+
+
+def test_get_variant_key_falls_back_until_generated(db_session, sample_image):
+    """Test a missing variant returns None so the original is served."""
+    service = FileService(db_session)
+    file_upload = FileUpload(
+        filename="sample.png",
+        original_filename="sample.png",
+        file_path=SAMPLE_KEY,
+        file_size=sample_image.stat().st_size,
+        content_type="image/png",
+    )
+    
+    assert service.get_variant_key(file_upload, "thumb") is None
+    
+    generate_variants(SAMPLE_KEY, {"thumb": 160})
+    
+    assert service.get_variant_key(file_upload, "thumb") == "image/ab/cd/sample_thumb.webp"
+
+
+def test_get_variant_key_unknown_variant(db_session, sample_image):
+    """Test requesting an unconfigured variant."""
+    service = FileService(db_session)
+    file_upload = FileUpload(file_path=SAMPLE_KEY, content_type="image/png")
+    
+    with pytest.raises(HTTPException) as exc_info:
+        service.get_variant_key(file_upload, "huge")
+    
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,141 @@
+"""Test resumable multipart uploads."""
+
+import hashlib
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+
+from backend.shared.storage import MultipartUploadService, UploadSession
+
+
+async def _stream(data: bytes, chunk_size: int = 3):
+    """Yield data in small chunks like a request body."""
+    for i in range(0, len(data), chunk_size):
+        yield data[i:i + chunk_size]
+
+
+def _checksum(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def upload_service(db_session, upload_dir):
+    """Create a multipart upload service."""
+    return MultipartUploadService(db_session)
+
+
+@pytest.mark.asyncio
+async def test_parts_out_of_order_are_assembled(upload_service, upload_dir):
+    """Test parts uploaded in any order produce the original file."""
+    content = b"name,quantity\n" + b"widget,10\n" * 5
+    session = upload_service.initiate_upload(
+        filename="stock.csv",
+        content_type="text/csv",
+        total_size=len(content),
+        user_id="user-1",
+        part_size=20,
+    )
+    parts = [content[i:i + 20] for i in range(0, len(content), 20)]
+    
+    for number in reversed(range(1, len(parts) + 1)):
+        part = parts[number - 1]
+        await upload_service.upload_part(
+            session.upload_id, number, _stream(part), _checksum(part), user_id="user-1"
+        )
+    
+    file_upload = await upload_service.complete_upload(session.upload_id, user_id="user-1")
+    
+    assert file_upload.file_path.startswith("text/")
+    with open(upload_dir / file_upload.file_path, "rb") as f:
+        assert f.read() == content
+    assert file_upload.file_size == len(content)
+    assert not (upload_dir / ".sessions" / session.upload_id).exists()
+
+
+@pytest.mark.asyncio
+async def test_checksum_mismatch_rejects_part(upload_service):
+    """Test a corrupted part is rejected and can be retried."""
+    session = upload_service.initiate_upload(
+        filename="notes.txt", content_type="text/plain", total_size=5, user_id="user-1"
+    )
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await upload_service.upload_part(
+            session.upload_id, 1, _stream(b"hellO"), _checksum(b"hello"), user_id="user-1"
+        )
+    assert exc_info.value.status_code == 400
+    assert upload_service.list_parts(session) == []
+    
+    await upload_service.upload_part(
+        session.upload_id, 1, _stream(b"hello"), _checksum(b"hello"), user_id="user-1"
+    )
+    assert [part["part_number"] for part in upload_service.list_parts(session)] == [1]
+
+
+@pytest.mark.asyncio
+async def test_complete_with_missing_parts(upload_service):
+    """Test completing an upload before every part arrived."""
+    session = upload_service.initiate_upload(
+        filename="notes.txt", content_type="text/plain", total_size=10, part_size=5
+    )
+    await upload_service.upload_part(session.upload_id, 1, _stream(b"hello"), _checksum(b"hello"))
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await upload_service.complete_upload(session.upload_id)
+    
+    assert exc_info.value.status_code == 400
+    assert "[2]" in exc_info.value.detail
+
+
+def test_purge_expired_sessions(upload_service, db_session, upload_dir):
+    """Test abandoned sessions are garbage-collected."""
+    session = upload_service.initiate_upload(
+        filename="notes.txt", content_type="text/plain", total_size=10
+    )
+    session.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db_session.commit()
+    
+    assert upload_service.purge_expired_sessions() == 1
+    
+    assert db_session.query(UploadSession).one().status == "expired"
+    assert not (upload_dir / ".sessions" / session.upload_id).exists()
+    with pytest.raises(HTTPException) as exc_info:
+        upload_service.get_session(session.upload_id)
+    assert exc_info.value.status_code == 410
+
+
+def test_purge_sessions_stuck_completing(upload_service, db_session, upload_dir):
+    """Test sessions left completing by a crash are swept after the grace period."""
+    stuck, running = [
+        upload_service.initiate_upload(filename="notes.txt", content_type="text/plain", total_size=10)
+        for _ in range(2)
+    ]
+    stuck.status = running.status = "completing"
+    stuck.expires_at = datetime.now(timezone.utc) - timedelta(days=1)
+    running.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db_session.commit()
+    
+    assert upload_service.purge_expired_sessions() == 1
+    
+    assert stuck.status == "expired"
+    assert running.status == "completing"
+    assert not (upload_dir / ".sessions" / stuck.upload_id).exists()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_completion_is_rejected(upload_service, db_session):
+    """Test only one of two completions racing on a session assembles it."""
+    session = upload_service.initiate_upload(
+        filename="notes.txt", content_type="text/plain", total_size=5, user_id="user-1"
+    )
+    await upload_service.upload_part(
+        session.upload_id, 1, _stream(b"hello"), _checksum(b"hello"), user_id="user-1"
+    )
+    # Another request has claimed the session since this one loaded it
+    upload_service._claim(upload_service.get_session(session.upload_id))
+    
+    with pytest.raises(HTTPException) as exc_info:
+        upload_service._claim(session)
+    
+    assert exc_info.value.status_code == 409
+    assert db_session.query(UploadSession).one().status == "completing"
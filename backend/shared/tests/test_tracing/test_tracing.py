@@ -0,0 +1,151 @@
+"""Test distributed tracing."""
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+from backend.shared.config import settings
+from backend.shared.database.instrumentation import normalize_sql
+from backend.shared.tracing import (
+    InMemorySpanExporter,
+    Sampler,
+    SimpleSpanProcessor,
+    SpanContext,
+    TracingMiddleware,
+    get_tracer,
+    trace_queries,
+)
+from backend.shared.utils import HTTPClient
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    """Record the service's spans in memory, sampling every trace."""
+    exporter = InMemorySpanExporter()
+    tracer = get_tracer()
+    monkeypatch.setattr(tracer, "processor", SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracer, "sampler", Sampler(1.0))
+    return exporter
+
+
+@pytest.fixture
+def engine():
+    """Create a traced engine with a small table."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, owner_id INTEGER)"))
+        conn.execute(text("INSERT INTO items (owner_id) VALUES (1), (1), (2)"))
+    trace_queries(engine, get_tracer())
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine, monkeypatch):
+    """Create a CRM-like app whose endpoint calls an inventory-like app."""
+    inventory = FastAPI()
+    inventory.add_middleware(TracingMiddleware, tracer=get_tracer())
+    router = APIRouter(prefix="/items")
+
+    @router.get("/owner/{owner_id}")
+    def items_by_owner(owner_id: int):
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT id FROM items WHERE owner_id = :owner_id"), {"owner_id": owner_id})
+            return {"items": rows.scalars().all()}
+
+    inventory.include_router(router, prefix="/api/v1")
+
+    transport = httpx.ASGITransport(app=inventory)
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: real_client(transport=transport, **kwargs))
+
+    crm = FastAPI()
+    crm.add_middleware(TracingMiddleware, tracer=get_tracer())
+
+    @crm.get("/api/v1/customers/{customer_id}/my-items")
+    async def my_items(customer_id: int):
+        return await HTTPClient("http://inventory-service:8001").get(f"/api/v1/items/owner/{customer_id}")
+
+    return TestClient(crm)
+
+
+def test_traceparent_round_trip():
+    """Test traceparent headers are parsed and formatted per W3C."""
+    value = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    context = SpanContext.from_traceparent(value)
+
+    assert context == SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+    assert context.to_traceparent() == value
+    assert SpanContext.from_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00").sampled is False
+    for invalid in ("", "garbage", "00-" + "0" * 32 + "-00f067aa0ba902b7-01", "00-xyz-00f067aa0ba902b7-01"):
+        assert SpanContext.from_traceparent(invalid) is None
+
+
+def test_sampler_follows_parent():
+    """Test new traces are sampled by rate and child spans follow their parent."""
+    parent = SpanContext("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)
+
+    assert Sampler(0.0).should_sample("f" * 32, None) is False
+    assert Sampler(0.0).should_sample(parent.trace_id, parent) is True
+    assert Sampler(1.0).should_sample("f" * 32, None) is True
+    assert Sampler(0.5).should_sample("0" * 32, None) is True
+    assert Sampler(0.5).should_sample("f" * 32, None) is False
+
+
+def test_trace_spans_services_and_sql(client, exporter):
+    """Test one request yields a single trace from the caller down to SQL."""
+    response = client.get("/api/v1/customers/1/my-items")
+
+    assert response.json() == {"items": [1, 2]}
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {
+        "GET /api/v1/customers/{customer_id}/my-items",
+        "GET inventory-service:8001",
+        "GET /api/v1/items/owner/{owner_id}",
+        "SELECT",
+    }
+    crm = spans["GET /api/v1/customers/{customer_id}/my-items"]
+    call = spans["GET inventory-service:8001"]
+    inventory = spans["GET /api/v1/items/owner/{owner_id}"]
+    query = spans["SELECT"]
+
+    assert {span.context.trace_id for span in spans.values()} == {crm.context.trace_id}
+    assert response.headers["x-trace-id"] == crm.context.trace_id
+    assert crm.parent_span_id is None
+    assert call.parent_span_id == crm.context.span_id
+    assert inventory.parent_span_id == call.context.span_id
+    assert query.parent_span_id == inventory.context.span_id
+    assert query.attributes["db.statement"] == "SELECT id FROM items WHERE owner_id = ?"
+    assert call.attributes["http.response.status_code"] == 200
+    assert crm.start_time_ns <= call.start_time_ns <= query.start_time_ns
+    assert query.end_time_ns <= call.end_time_ns <= crm.end_time_ns
+
+
+def test_unsampled_trace_still_propagates(client, exporter, monkeypatch):
+    """Test a caller's decision not to sample is passed on and nothing is recorded."""
+    monkeypatch.setattr(get_tracer(), "sampler", Sampler(0.0))
+    traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00"
+
+    response = client.get("/api/v1/customers/2/my-items", headers={"traceparent": traceparent})
+
+    assert response.json() == {"items": [3]}
+    assert response.headers["x-trace-id"] == "4bf92f3577b34da6a3ce929d0e0e4736"
+    assert exporter.get_finished_spans() == []
+
+
+def test_sql_comments_carry_trace_context(client, exporter, engine, monkeypatch):
+    """Test statements can be tagged with their traceparent for database logs."""
+    monkeypatch.setattr(settings, "tracing_sql_comments", True)
+    statements = []
+    event.listen(engine, "after_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client.get("/api/v1/customers/1/my-items")
+
+    query = exporter.get_finished_spans("SELECT")[0]
+    assert statements == [
+        f"SELECT id FROM items WHERE owner_id = ? /*traceparent='{query.context.to_traceparent()}'*/"
+    ]
+    assert normalize_sql(statements[0]) == "SELECT id FROM items WHERE owner_id = ?"
@@ -0,0 +1,81 @@
+"""Test sparse fieldsets on list responses."""
+
+from datetime import datetime
+from typing import List, Optional
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict, Field
+
+from backend.shared.config import settings
+from backend.shared.storage.models import FileUpload
+from backend.shared.utils.fieldsets import load_only_fields, parse_fields
+from backend.shared.utils.serialization import list_response
+
+
+class FileResponse(BaseModel):
+    id: int
+    filename: str
+    size: int = Field(..., alias="file_size")
+    resource_id: Optional[str] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class FileListResponse(BaseModel):
+    items: List[FileResponse]
+    total: int
+
+
+@pytest.fixture
+def rows(db_session):
+    for i in range(3):
+        db_session.add(FileUpload(
+            filename=f"file-{i}.txt",
+            original_filename=f"file-{i}.txt",
+            file_path=f"uploads/file-{i}.txt",
+            file_size=100 * i,
+            content_type="text/plain",
+        ))
+    db_session.commit()
+    db_session.expunge_all()
+    fields = parse_fields("filename,file_size", FileResponse)
+    return fields, db_session.query(FileUpload).options(load_only_fields(FileUpload, fields)).order_by(FileUpload.id).all()
+
+
+def test_parse_fields_keeps_model_order_and_id():
+    assert parse_fields("created_at, filename", FileResponse) == ("id", "filename", "created_at")
+    assert parse_fields("file_size", FileResponse) == ("id", "file_size")
+    assert parse_fields(None, FileResponse) is None
+    assert parse_fields(" , ", FileResponse) is None
+
+
+def test_parse_fields_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("filename,file_path,size", FileResponse)
+
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Unknown fields: file_path, size"
+
+
+def test_only_selected_columns_are_loaded(rows):
+    fields, loaded = rows
+
+    assert set(fields).issubset(loaded[0].__dict__)
+    assert "original_filename" not in loaded[0].__dict__
+    assert "file_path" not in loaded[0].__dict__
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_list_response_is_trimmed_to_fields(rows, monkeypatch, fast):
+    monkeypatch.setattr(settings, "fast_json_responses", fast)
+    fields, loaded = rows
+
+    response = list_response(FileListResponse, loaded, fields=fields, total=3)
+
+    assert response.body == (
+        b'{"items":[{"id":1,"filename":"file-0.txt","file_size":0},'
+        b'{"id":2,"filename":"file-1.txt","file_size":100},'
+        b'{"id":3,"filename":"file-2.txt","file_size":200}],"total":3}'
+    )
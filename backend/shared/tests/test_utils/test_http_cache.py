@@ -0,0 +1,177 @@
+"""Test conditional GETs with ETag and Last-Modified."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, DateTime, Integer, String, create_engine, event
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import StaticPool
+
+from backend.shared.config import settings
+from backend.shared.utils.http_cache import (
+    ConditionalGet,
+    http_cache,
+    http_date,
+    items_version,
+    query_version,
+    row_version,
+)
+
+NoteBase = declarative_base()
+
+
+class Note(NoteBase):
+    __tablename__ = "notes"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(100), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+
+CREATED = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    NoteBase.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all(Note(title=f"Note {i}", created_at=CREATED + timedelta(minutes=i)) for i in range(3))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(session):
+    """Collect the SQL statements run while serving requests."""
+    executed = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: executed.append(args[2]))
+    return executed
+
+
+@pytest.fixture
+def client(session):
+    app = FastAPI()
+
+    @app.get("/notes/")
+    def list_notes(cache: ConditionalGet = Depends(http_cache("public, no-cache"))):
+        total, version = query_version(session.query(Note), Note)
+        if cache.is_fresh(version):
+            return cache.not_modified()
+        notes = session.query(Note).order_by(Note.id).all()
+        return cache.respond({"items": [note.title for note in notes], "total": total})
+
+    @app.get("/notes/{note_id}")
+    def get_note(note_id: int, cache: ConditionalGet = Depends(http_cache("private, no-cache"))):
+        note = session.get(Note, note_id)
+        if cache.is_fresh(row_version(note)):
+            return cache.not_modified()
+        return cache.respond({"title": note.title})
+
+    return TestClient(app)
+
+
+def test_matching_etag_is_not_modified(client):
+    first = client.get("/notes/1")
+
+    assert first.status_code == 200
+    assert first.headers["etag"].startswith('W/"')
+    assert first.headers["last-modified"] == "Mon, 01 Jan 2024 12:00:00 GMT"
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    second = client.get("/notes/1", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["cache-control"] == "private, no-cache"
+
+
+def test_update_changes_the_etag(client, session):
+    etag = client.get("/notes/1").headers["etag"]
+
+    session.get(Note, 1).updated_at = CREATED + timedelta(days=1)
+    session.commit()
+    response = client.get("/notes/1", headers={"If-None-Match": f'"other", {etag}'.replace("W/", "")})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_if_modified_since(client):
+    assert client.get("/notes/1", headers={"If-Modified-Since": "Mon, 01 Jan 2024 12:00:00 GMT"}).status_code == 304
+    assert client.get("/notes/1", headers={"If-Modified-Since": "Mon, 01 Jan 2024 11:59:59 GMT"}).status_code == 200
+    # If-None-Match takes precedence
+    response = client.get("/notes/1", headers={
+        "If-None-Match": 'W/"stale"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 12:00:00 GMT",
+    })
+    assert response.status_code == 200
+
+
+def test_list_answers_304_before_loading_rows(client, session, statements):
+    etag = client.get("/notes/").headers["etag"]
+    statements.clear()
+
+    response = client.get("/notes/", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert len(statements) == 1
+    assert "count" in statements[0] and "max" in statements[0]
+
+    session.add(Note(title="Note 3", created_at=CREATED))
+    session.commit()
+    assert client.get("/notes/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_list_version_moves_with_deletes(session):
+    total, before = query_version(session.query(Note), Note)
+
+    session.delete(session.get(Note, 2))
+    session.commit()
+    total_after, after = query_version(session.query(Note), Note)
+
+    assert (total, total_after) == (3, 2)
+    assert after.etag != before.etag
+    assert after.last_modified == CREATED + timedelta(minutes=2)
+
+
+def test_cache_control_can_be_overridden_per_route(client, monkeypatch):
+    monkeypatch.setattr(settings, "http_cache_control", {"/notes/": "public, max-age=30"})
+
+    assert client.get("/notes/").headers["cache-control"] == "public, max-age=30"
+    assert client.get("/notes/1").headers["cache-control"] == "private, no-cache"
+
+
+def test_row_version_moves_with_edits_in_the_same_second(session):
+    note = session.get(Note, 1)
+    note.updated_at = CREATED + timedelta(hours=1)
+    session.commit()
+    before = row_version(session.get(Note, 1))
+
+    note.title = "Renamed"  # updated_at unchanged, as with SQLite's one-second now()
+    session.commit()
+    after = row_version(session.get(Note, 1))
+
+    assert after.etag != before.etag
+    assert after.last_modified == before.last_modified
+
+
+def test_items_version_covers_every_item(session):
+    notes = session.query(Note).order_by(Note.id).all()
+    version = items_version(notes)
+
+    assert version.last_modified == CREATED + timedelta(minutes=2)
+    assert items_version(notes[:2]).etag != version.etag
+    assert items_version(notes, "customer-1").etag != version.etag
+
+
+def test_http_date_treats_naive_datetimes_as_utc():
+    aware = datetime(2024, 1, 1, 14, 0, tzinfo=timezone(timedelta(hours=2)))
+
+    assert http_date(datetime(2024, 1, 1, 12, 0)) == http_date(aware) == "Mon, 01 Jan 2024 12:00:00 GMT"
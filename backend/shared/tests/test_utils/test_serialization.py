@@ -0,0 +1,105 @@
+"""Test the fast JSON response path."""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ConfigDict, Field
+
+from backend.shared.config import settings
+from backend.shared.storage.models import FileUpload
+from backend.shared.utils.serialization import FastJSONResponse, dumps, list_response, project
+
+
+class FileResponse(BaseModel):
+    id: int
+    filename: str
+    size: int = Field(..., alias="file_size")
+    resource_id: Optional[str] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class FileListResponse(BaseModel):
+    items: List[FileResponse]
+    total: int
+    page: int
+
+
+@pytest.fixture
+def client(db_session):
+    """Serve the same rows through the validated and the fast path."""
+    for i in range(3):
+        db_session.add(FileUpload(
+            filename=f"file-{i}.txt",
+            original_filename=f"file-{i}.txt",
+            file_path=f"uploads/file-{i}.txt",
+            file_size=100 * i,
+            content_type="text/plain",
+            resource_id=str(i) if i else None,
+        ))
+    db_session.commit()
+
+    app = FastAPI()
+
+    def get_db():
+        return db_session
+
+    @app.get("/validated", response_model=FileListResponse)
+    def validated(db=Depends(get_db)):
+        rows = db.query(FileUpload).order_by(FileUpload.id).all()
+        return list_response(FileListResponse, rows, fast=False, total=len(rows), page=1)
+
+    @app.get("/fast", response_model=FileListResponse)
+    def fast(db=Depends(get_db)):
+        rows = db.query(FileUpload).order_by(FileUpload.id).all()
+        return list_response(FileListResponse, rows, total=len(rows), page=1)
+
+    return TestClient(app)
+
+
+def test_fast_path_matches_validated_response(client):
+    validated = client.get("/validated")
+    fast = client.get("/fast")
+
+    assert fast.status_code == validated.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.json() == validated.json()
+    assert fast.json()["items"][0]["file_size"] == 0
+    assert fast.json()["items"][0]["resource_id"] is None
+
+
+def test_setting_turns_fast_path_off(client, monkeypatch):
+    monkeypatch.setattr(settings, "fast_json_responses", False)
+
+    response = list_response(FileListResponse, [], total=0, page=1)
+
+    assert isinstance(response, FileListResponse)
+    assert client.get("/fast").json() == client.get("/validated").json()
+
+
+def test_project_reads_only_model_fields():
+    row = FileUpload(id=1, filename="a.txt", file_size=5, created_at=datetime(2024, 1, 1), content_type="text/plain")
+
+    assert project([row], FileResponse) == [{
+        "id": 1,
+        "filename": "a.txt",
+        "file_size": 5,
+        "resource_id": None,
+        "created_at": datetime(2024, 1, 1),
+    }]
+
+
+def test_dumps_matches_pydantic_encoding():
+    value = {
+        "at": datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+        "naive": datetime(2024, 1, 1, 12, 30, 0, 5),
+        "amount": Decimal("1.50"),
+    }
+
+    assert dumps(value) == b'{"at":"2024-01-01T12:30:00Z","naive":"2024-01-01T12:30:00.000005","amount":"1.50"}'
+    assert FastJSONResponse(value).body == dumps(value)
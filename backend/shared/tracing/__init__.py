@@ -0,0 +1,92 @@
+"""Distributed tracing across services and the database.
+
+Spans follow the OpenTelemetry model and the W3C ``traceparent`` header, so
+traces from every service are joined up in Jaeger or any OTLP collector.
+"""
+
+import atexit
+from typing import Optional
+
+from fastapi import FastAPI
+
+from backend.shared.config import settings
+from .exporters import (
+    BatchSpanProcessor,
+    InMemorySpanExporter,
+    LoggingSpanExporter,
+    OTLPSpanExporter,
+    SimpleSpanProcessor,
+    SpanExporter,
+)
+from .middleware import TracingMiddleware
+from .sql import trace_queries
+from .tracer import (
+    Sampler,
+    Span,
+    SpanContext,
+    Tracer,
+    extract_context,
+    get_current_span,
+    inject_headers,
+)
+
+_tracer = Tracer(settings.service_name)
+
+
+def get_tracer() -> Tracer:
+    """Get the tracer of this service."""
+    return _tracer
+
+
+def create_exporter(name: str) -> Optional[SpanExporter]:
+    """Build the exporter named by TRACING_EXPORTER."""
+    if name == "none":
+        return None
+    if name == "logging":
+        return LoggingSpanExporter()
+    if name == "otlp":
+        return OTLPSpanExporter()
+    raise ValueError(f"Unknown tracing exporter: {name}")
+
+
+def setup_tracing(app: FastAPI, exporter: Optional[SpanExporter] = None) -> Tracer:
+    """Trace an app's requests, its outgoing calls and its SQL.
+
+    Pass an exporter to override TRACING_EXPORTER, e.g. an
+    InMemorySpanExporter in tests. Even with no exporter, incoming trace
+    context is still passed on to the services this one calls.
+    """
+    from backend.shared.database import engine
+
+    exporter = exporter or create_exporter(settings.tracing_exporter)
+    if isinstance(exporter, InMemorySpanExporter):
+        _tracer.processor = SimpleSpanProcessor(exporter)
+    elif exporter is not None:
+        _tracer.processor = BatchSpanProcessor(exporter)
+        atexit.register(_tracer.processor.shutdown)
+    _tracer.sampler = Sampler(settings.tracing_sample_rate)
+
+    app.add_middleware(TracingMiddleware, tracer=_tracer, excluded_paths=["/health", "/metrics"])
+    trace_queries(engine, _tracer)
+    return _tracer
+
+
+__all__ = [
+    "BatchSpanProcessor",
+    "InMemorySpanExporter",
+    "LoggingSpanExporter",
+    "OTLPSpanExporter",
+    "Sampler",
+    "SimpleSpanProcessor",
+    "Span",
+    "SpanContext",
+    "SpanExporter",
+    "Tracer",
+    "TracingMiddleware",
+    "extract_context",
+    "get_current_span",
+    "get_tracer",
+    "inject_headers",
+    "setup_tracing",
+    "trace_queries",
+]
@@ -0,0 +1,212 @@
+"""Span processors and exporters."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from backend.shared.config import settings
+from .tracer import Span
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+_OTLP_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+_OTLP_STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+
+class SpanExporter:
+    """Send finished spans somewhere."""
+
+    def export(self, spans: Sequence[Span]) -> bool:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keep finished spans in a list, for tests."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> bool:
+        with self._lock:
+            self.spans.extend(spans)
+        return True
+
+    def get_finished_spans(self, name: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            return [span for span in self.spans if name is None or span.name == name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class LoggingSpanExporter(SpanExporter):
+    """Log one line per span, for local debugging."""
+
+    def export(self, spans: Sequence[Span]) -> bool:
+        for span in spans:
+            logger.info(
+                f"span {span.name} trace={span.context.trace_id} span={span.context.span_id} "
+                f"parent={span.parent_span_id} duration={span.duration_ms:.2f}ms "
+                f"status={span.status} {span.attributes}"
+            )
+        return True
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class OTLPSpanExporter(SpanExporter):
+    """Post spans as OTLP/HTTP JSON, which Jaeger and the OTel collector accept."""
+
+    def __init__(self, endpoint: Optional[str] = None, timeout: float = 10.0):
+        self.endpoint = endpoint or settings.tracing_otlp_endpoint
+        self._client = httpx.Client(timeout=timeout)
+
+    def encode(self, spans: Sequence[Span]) -> Dict[str, Any]:
+        """Build the ExportTraceServiceRequest body."""
+        by_service: Dict[str, List[Dict[str, Any]]] = {}
+        for span in spans:
+            otlp_span = {
+                "traceId": span.context.trace_id,
+                "spanId": span.context.span_id,
+                "name": span.name,
+                "kind": _OTLP_SPAN_KINDS.get(span.kind, 1),
+                "startTimeUnixNano": str(span.start_time_ns),
+                "endTimeUnixNano": str(span.end_time_ns),
+                "attributes": _otlp_attributes(span.attributes),
+                "status": {"code": _OTLP_STATUS_CODES[span.status]},
+            }
+            if span.parent_span_id:
+                otlp_span["parentSpanId"] = span.parent_span_id
+            if span.status_message:
+                otlp_span["status"]["message"] = span.status_message
+            by_service.setdefault(span.service_name, []).append(otlp_span)
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes({
+                            "service.name": service_name,
+                            "service.version": settings.service_version,
+                            "deployment.environment": settings.environment,
+                        })
+                    },
+                    "scopeSpans": [{"scope": {"name": "backend.shared.tracing"}, "spans": otlp_spans}],
+                }
+                for service_name, otlp_spans in by_service.items()
+            ]
+        }
+
+    def export(self, spans: Sequence[Span]) -> bool:
+        try:
+            response = self._client.post(self.endpoint, json=self.encode(spans))
+            response.raise_for_status()
+            return True
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to export {len(spans)} spans to {self.endpoint}: {e}")
+            return False
+
+    def shutdown(self) -> None:
+        self._client.close()
+
+
+class SimpleSpanProcessor:
+    """Export each span as soon as it ends, on the calling thread."""
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    def on_end(self, span: Span) -> None:
+        self.exporter.export([span])
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+
+class BatchSpanProcessor:
+    """Export spans from a bounded queue on a background thread.
+
+    Ending a span only costs a queue put; when the queue is full the span
+    is dropped rather than slowing the request down. The thread exports
+    once ``batch_size`` spans are waiting or the oldest has waited
+    ``export_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        export_interval: Optional[float] = None
+    ):
+        self.exporter = exporter
+        self.batch_size = batch_size or settings.tracing_export_batch_size
+        self.export_interval = export_interval if export_interval is not None else settings.tracing_export_interval
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size or settings.tracing_queue_size)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.export_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self.exporter.export(batch)
+            except Exception as e:
+                logger.error(f"Span exporter failed: {e}")
+
+    def shutdown(self, timeout: Optional[float] = 10.0) -> None:
+        """Export what is queued, then stop the thread."""
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        self.exporter.shutdown()
+        if self.dropped:
+            logger.warning(f"Dropped {self.dropped} spans because the export queue was full")
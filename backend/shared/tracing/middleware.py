@@ -0,0 +1,50 @@
+"""ASGI middleware starting a server span for every request."""
+
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.shared.monitoring.middleware import route_template
+from .tracer import SPAN_KIND_SERVER, Tracer, extract_context
+
+
+class TracingMiddleware:
+    """Continue the caller's trace, or start one, for each request.
+
+    The span is named after the route template so requests to the same
+    endpoint group together, and the trace id is returned in an
+    ``x-trace-id`` header to find the trace from a client-side report.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer, excluded_paths: Optional[Iterable[str]] = None):
+        self.app = app
+        self.tracer = tracer
+        self.excluded_paths = frozenset(excluded_paths or ())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        parent = extract_context(Headers(scope=scope))
+        with self.tracer.start_span(method, kind=SPAN_KIND_SERVER, parent=parent) as span:
+            trace_id = span.context.trace_id.encode()
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = "error"
+                    message = {**message, "headers": [*message.get("headers", []), (b"x-trace-id", trace_id)]}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                span.name = f"{method} {route}"
+                span.set_attribute("http.request.method", method)
+                span.set_attribute("http.route", route)
+                span.set_attribute("url.path", scope["path"])
@@ -0,0 +1,58 @@
+"""Spans for SQL statements."""
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.shared.config import settings
+from .tracer import SPAN_KIND_CLIENT, Tracer, get_current_span
+
+
+def trace_queries(engine: Engine, tracer: Tracer) -> None:
+    """Record a child span for every statement run inside a sampled trace.
+
+    Statements outside a request, or in traces that aren't sampled, cost a
+    context variable lookup. With TRACING_SQL_COMMENTS the traceparent is
+    also appended to the SQL as a sqlcommenter-style comment, so a query in
+    the database's own logs leads back to its trace.
+    """
+    from backend.shared.database.instrumentation import normalize_sql
+
+    if getattr(engine, "_tracing_instrumented", False):
+        return
+    engine._tracing_instrumented = True
+    db_system = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        current = get_current_span()
+        if current is None or not current.recording:
+            return statement, parameters
+
+        span = tracer.create_span(
+            statement.split(None, 1)[0].upper() if statement else "SQL",
+            kind=SPAN_KIND_CLIENT,
+            parent=current.context,
+            attributes={"db.system": db_system, "db.statement": normalize_sql(statement)},
+        )
+        conn.info.setdefault("trace_spans", []).append(span)
+        if settings.tracing_sql_comments:
+            statement = f"{statement} /*traceparent='{span.context.to_traceparent()}'*/"
+        return statement, parameters
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            span = spans.pop()
+            if cursor.rowcount >= 0:
+                span.set_attribute("db.rows_affected", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            span = spans.pop()
+            span.set_error(exception_context.original_exception)
+            span.end()
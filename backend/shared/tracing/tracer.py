@@ -0,0 +1,206 @@
+"""Spans, W3C trace context propagation and sampling."""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+TRACEPARENT_HEADER = "traceparent"
+
+SPAN_KIND_INTERNAL = "internal"
+SPAN_KIND_SERVER = "server"
+SPAN_KIND_CLIENT = "client"
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """The identifiers that travel between services."""
+
+    trace_id: str  # 32 hex characters
+    span_id: str  # 16 hex characters
+    sampled: bool
+
+    def to_traceparent(self) -> str:
+        """Format as a W3C traceparent header value."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @classmethod
+    def from_traceparent(cls, value: Optional[str]) -> Optional["SpanContext"]:
+        """Parse a traceparent header, returning None if it is invalid."""
+        if not value:
+            return None
+        parts = value.strip().split("-")
+        if len(parts) < 4 or parts[0] == "ff" or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        try:
+            int(parts[1], 16)
+            int(parts[2], 16)
+            flags = int(parts[3][:2], 16)
+        except ValueError:
+            return None
+        if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+            return None
+        return cls(trace_id=parts[1].lower(), span_id=parts[2].lower(), sampled=bool(flags & 1))
+
+
+def new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+
+def new_span_id() -> str:
+    return os.urandom(8).hex()
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace.
+
+    Spans that weren't sampled still carry their context, so it is passed on
+    to other services, but record nothing and are never exported.
+    """
+
+    name: str
+    context: SpanContext
+    parent_span_id: Optional[str] = None
+    kind: str = SPAN_KIND_INTERNAL
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+    status: str = "unset"  # unset, ok, error
+    status_message: Optional[str] = None
+    service_name: str = ""
+    _tracer: Optional["Tracer"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def recording(self) -> bool:
+        return self.context.sampled and self._tracer is not None and self._tracer.processor is not None
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.recording:
+            self.attributes[key] = value
+
+    def set_error(self, error: BaseException) -> None:
+        """Mark the span as failed."""
+        self.status = "error"
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        """Finish the span and hand it to the exporter."""
+        if self.end_time_ns is not None:
+            return
+        self.end_time_ns = time.time_ns()
+        if self.recording:
+            self._tracer.processor.on_end(self)
+
+
+class Sampler:
+    """Decide which new traces are recorded.
+
+    Child spans follow their parent's decision, so a trace is either
+    recorded in every service or in none. Root spans are sampled at
+    ``rate`` (0 to 1), decided from the trace id so it is consistent.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        self.rate = min(max(rate, 0.0), 1.0)
+        self._bound = int(self.rate * (1 << 64))
+
+    def should_sample(self, trace_id: str, parent: Optional[SpanContext]) -> bool:
+        if parent is not None:
+            return parent.sampled
+        if self.rate >= 1.0:
+            return True
+        return int(trace_id[16:], 16) < self._bound
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def get_current_span() -> Optional[Span]:
+    """Get the span active in this context, if any."""
+    return _current_span.get()
+
+
+class Tracer:
+    """Create spans for one service and pass finished ones to a processor."""
+
+    def __init__(self, service_name: str, sampler: Optional[Sampler] = None, processor=None):
+        self.service_name = service_name
+        self.sampler = sampler or Sampler()
+        self.processor = processor
+
+    def create_span(
+        self,
+        name: str,
+        kind: str = SPAN_KIND_INTERNAL,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> Span:
+        """Create a span under ``parent``, or under the current span."""
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+
+        trace_id = parent.trace_id if parent is not None else new_trace_id()
+        sampled = self.sampler.should_sample(trace_id, parent)
+        span = Span(
+            name=name,
+            context=SpanContext(trace_id=trace_id, span_id=new_span_id(), sampled=sampled),
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            service_name=self.service_name,
+            _tracer=self,
+        )
+        if attributes and span.recording:
+            span.attributes.update(attributes)
+        return span
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: str = SPAN_KIND_INTERNAL,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Span]:
+        """Run a block inside a new current span, recording any exception."""
+        span = self.create_span(name, kind=kind, parent=parent, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+
+def inject_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Add the current trace context to outgoing request headers."""
+    headers = dict(headers or {})
+    span = _current_span.get()
+    if span is not None:
+        headers[TRACEPARENT_HEADER] = span.context.to_traceparent()
+    return headers
+
+
+def extract_context(headers: Mapping[str, str]) -> Optional[SpanContext]:
+    """Read the trace context from incoming request headers."""
+    return SpanContext.from_traceparent(headers.get(TRACEPARENT_HEADER))
+
+
+def spans_by_trace(spans: List[Span]) -> Dict[str, List[Span]]:
+    """Group spans by trace id."""
+    traces: Dict[str, List[Span]] = {}
+    for span in spans:
+        traces.setdefault(span.context.trace_id, []).append(span)
+    return traces
@@ -4,9 +4,15 @@ import logging
 import time
 from typing import Any, Dict, Optional
 from functools import wraps
+from urllib.parse import urlsplit
 from fastapi import HTTPException, status
 import httpx
 
+from backend.shared.compression import accept_encoding
+from backend.shared.monitoring.metrics import observe_outbound_request
+from backend.shared.tracing import get_tracer, inject_headers
+from backend.shared.tracing.tracer import SPAN_KIND_CLIENT
+
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,46 +37,75 @@ class HTTPClient:
     def __init__(self, base_url: str, timeout: int = 30):
         self.base_url = base_url
         self.timeout = timeout
+        self.target = urlsplit(base_url).netloc or base_url
+        # Services compress JSON bodies; httpx decodes whichever coding comes back
+        self.headers = {"Accept-Encoding": accept_encoding()}
+    
+    def _span(self, method: str, endpoint: str):
+        """Start a client span; the request carries its context to the callee."""
+        return get_tracer().start_span(
+            f"{method} {self.target}",
+            kind=SPAN_KIND_CLIENT,
+            attributes={
+                "http.request.method": method,
+                "server.address": self.target,
+                "url.full": f"{self.base_url}{endpoint}",
+            },
+        )
     
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make GET request."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(f"{self.base_url}{endpoint}", params=params)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"External service error: {e.response.status_code}"
-                )
-            except httpx.RequestError as e:
-                logger.error(f"Request error: {str(e)}")
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="External service unavailable"
-                )
+        with self._span("GET", endpoint) as span:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                start_time = time.perf_counter()
+                status_code = "error"
+                try:
+                    response = await client.get(f"{self.base_url}{endpoint}", params=params, headers=inject_headers(self.headers))
+                    status_code = response.status_code
+                    span.set_attribute("http.response.status_code", status_code)
+                    response.raise_for_status()
+                    return response.json()
+                except httpx.HTTPStatusError as e:
+                    logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=f"External service error: {e.response.status_code}"
+                    )
+                except httpx.RequestError as e:
+                    logger.error(f"Request error: {str(e)}")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="External service unavailable"
+                    )
+                finally:
+                    observe_outbound_request(self.target, "GET", status_code, time.perf_counter() - start_time)
     
     async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make POST request."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(f"{self.base_url}{endpoint}", json=data)
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"External service error: {e.response.status_code}"
-                )
-            except httpx.RequestError as e:
-                logger.error(f"Request error: {str(e)}")
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="External service unavailable"
-                )
+        with self._span("POST", endpoint) as span:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                start_time = time.perf_counter()
+                status_code = "error"
+                try:
+                    response = await client.post(f"{self.base_url}{endpoint}", json=data, headers=inject_headers(self.headers))
+                    status_code = response.status_code
+                    span.set_attribute("http.response.status_code", status_code)
+                    response.raise_for_status()
+                    return response.json()
+                except httpx.HTTPStatusError as e:
+                    logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=f"External service error: {e.response.status_code}"
+                    )
+                except httpx.RequestError as e:
+                    logger.error(f"Request error: {str(e)}")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="External service unavailable"
+                    )
+                finally:
+                    observe_outbound_request(self.target, "POST", status_code, time.perf_counter() - start_time)
 
 
 def create_error_response(message: str, status_code: int = 400) -> Dict[str, Any]:
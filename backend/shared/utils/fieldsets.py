@@ -0,0 +1,50 @@
+"""Sparse fieldsets for list endpoints.
+
+A ``fields=id,name,price`` query parameter picks which response fields a
+client gets. The same names limit the columns the query loads, so unused
+columns (long text especially) are neither read, hydrated nor encoded.
+"""
+
+from typing import Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+from backend.shared.utils.serialization import response_fields
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated ``fields`` parameter against a response model.
+
+    Returns the selected field names in the model's order, always with
+    ``id`` so clients can still address what they get back, or None when
+    no fields were asked for. Unknown names are a 400.
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        return None
+    available = response_fields(model)
+    unknown = requested.difference(available)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.add("id")
+    return tuple(name for name in available if name in requested)
+
+
+def load_only_fields(entity, fields: Sequence[str], *required: str):
+    """Get a ``load_only`` option for the mapped columns among fields.
+
+    ``required`` names columns the caller reads itself (e.g. the keyset
+    cursor's ``created_at``) even when the client didn't ask for them.
+    Fields that aren't columns are left to the row to compute.
+    """
+    columns = inspect(entity).column_attrs
+    names = dict.fromkeys(name for name in (*fields, *required) if name in columns)
+    return load_only(*(getattr(entity, name) for name in names))
@@ -0,0 +1,181 @@
+"""Conditional GETs for read endpoints: weak ETags, Last-Modified and 304s.
+
+A route checks its version (cheap to get: a row's ``updated_at``, or an
+aggregate for a list) against the request before loading or serializing
+anything, and answers 304 when the client's copy is current::
+
+    @router.get("/{item_id}")
+    async def get_item(item_id: int, cache: ConditionalGet = Depends(http_cache("public, no-cache"))):
+        item = service.get_item(item_id)
+        version = row_version(item)
+        if cache.is_fresh(version):
+            return cache.not_modified()
+        return cache.respond(item)
+
+The route's Cache-Control default can be overridden per route path with
+HTTP_CACHE_CONTROL, e.g. to let nginx cache a public listing for a while.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, inspect
+
+from backend.shared.config import settings
+
+
+@dataclass(frozen=True)
+class Version:
+    """What a response was built from: its ETag and when it last changed."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def weak_etag(*parts: Any) -> str:
+    """Hash the parts a representation is derived from into a weak ETag."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _row_values(row: Any) -> List[Any]:
+    """Get what a row holds: an ORM row's loaded columns, or a model's fields."""
+    state = inspect(row, raiseerr=False)
+    if state is not None and hasattr(state, "mapper"):
+        # Only what is already loaded, so nothing is lazy-loaded for an ETag
+        return [state.dict.get(attr.key) for attr in state.mapper.column_attrs]
+    if hasattr(row, "model_dump"):
+        return list(row.model_dump().values())
+    return list(vars(row).values())
+
+
+def row_version(row: Any, *extra: Any) -> Version:
+    """Get the version of a row with ``id``, ``created_at`` and ``updated_at``.
+
+    Every column goes into the ETag, not just the timestamps: SQLite's now()
+    only has whole seconds, so two edits within a second keep ``updated_at``.
+    """
+    modified = row.updated_at or row.created_at
+    return Version(weak_etag(*_row_values(row), *extra), modified)
+
+
+def query_version(query, entity, *extra: Any) -> Tuple[int, Version]:
+    """Get the row count and version of everything a list query matches.
+
+    One aggregate over the filtered rows: count, latest change and highest
+    id. An edit moves the latest change, a delete the count, an insert the
+    highest id, so the version of any page of the list moves with them.
+    The latest change is only as precise as the database's now(): on SQLite
+    (whole seconds) an edit in the same second as the previous one can leave
+    a list's version unchanged. Postgres keeps microseconds.
+    """
+    modified = func.max(func.coalesce(entity.updated_at, entity.created_at))
+    total, last_modified, last_id = query.order_by(None).with_entities(
+        func.count(entity.id), modified, func.max(entity.id)
+    ).one()
+    return total, Version(weak_etag(total, last_modified, last_id, *extra), last_modified)
+
+
+def items_version(items: Iterable[Any], *extra: Any) -> Version:
+    """Get the version of a list already in memory, e.g. one fetched from another service.
+
+    Every item's id and last change go into the ETag, so it is exact.
+    """
+    parts = []
+    last_modified = None
+    for item in items:
+        modified = item.updated_at or item.created_at
+        parts.append(f"{item.id}@{modified}")
+        if modified is not None and (last_modified is None or modified > last_modified):
+            last_modified = modified
+    return Version(weak_etag(*parts, *extra), last_modified)
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime (naive ones are UTC) as an HTTP date."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+class ConditionalGet:
+    """Conditional request handling for one GET request; see http_cache."""
+
+    def __init__(self, request: Request, response: Response, cache_control: str):
+        self.request = request
+        self.response = response
+        self.cache_control = cache_control
+        self.version: Optional[Version] = None
+
+    def is_fresh(self, version: Version) -> bool:
+        """Record the response's version and tell whether the client already has it.
+
+        If-None-Match wins over If-Modified-Since, which only counts whole
+        seconds, as HTTP dates do.
+        """
+        self.version = version
+        headers = self.request.headers
+        if "if-none-match" in headers:
+            return _etag_matches(headers["if-none-match"], version.etag)
+        if "if-modified-since" in headers and version.last_modified is not None:
+            try:
+                since = parsedate_to_datetime(headers["if-modified-since"])
+            except (TypeError, ValueError):
+                return False
+            modified = version.last_modified
+            if modified.tzinfo is None:
+                modified = modified.replace(tzinfo=timezone.utc)
+            return modified.replace(microsecond=0) <= since
+        return False
+
+    def headers(self) -> Dict[str, str]:
+        """Get the caching headers for the recorded version."""
+        headers = {"Cache-Control": self.cache_control}
+        if self.version is not None:
+            headers["ETag"] = self.version.etag
+            if self.version.last_modified is not None:
+                headers["Last-Modified"] = http_date(self.version.last_modified)
+        return headers
+
+    def not_modified(self) -> Response:
+        """Build the 304 answer, with the headers a 200 would have had."""
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers())
+
+    def respond(self, result: Any) -> Any:
+        """Add the caching headers to what the route returns.
+
+        A Response gets them directly; anything else goes through the
+        route's response model as usual, and FastAPI copies them over from
+        the injected response.
+        """
+        target = result if isinstance(result, Response) else self.response
+        target.headers.update(self.headers())
+        return result
+
+
+def http_cache(cache_control: str):
+    """Dependency that gives a route its ConditionalGet.
+
+    ``cache_control`` is the route's Cache-Control; HTTP_CACHE_CONTROL
+    maps route paths (as declared, e.g. ``/api/v1/items/{item_id}``) to
+    overrides.
+    """
+    def dependency(request: Request, response: Response) -> ConditionalGet:
+        route = request.scope.get("route")
+        path = getattr(route, "path", request.url.path)
+        return ConditionalGet(request, response, settings.http_cache_control.get(path, cache_control))
+    return dependency
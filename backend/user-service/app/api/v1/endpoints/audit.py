@@ -1,11 +1,13 @@
 """Audit logging API endpoints."""
 
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from backend.shared.database import get_db
 from backend.shared.audit import AuditService
+from backend.shared.utils.pagination import next_cursor
 from services.auth_service import AuthService
 
 router = APIRouter(prefix="/audit", tags=["audit"])
@@ -16,8 +18,11 @@ async def get_audit_logs(
     user_id: Optional[str] = Query(None, description="Filter by user ID"),
     action: Optional[str] = Query(None, description="Filter by action"),
     resource_type: Optional[str] = Query(None, description="Filter by resource type"),
+    since: Optional[datetime] = Query(None, description="Only logs created at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only logs created before this time"),
     limit: int = Query(100, ge=1, le=1000, description="Number of logs to return"),
-    offset: int = Query(0, ge=0, description="Number of logs to skip"),
+    offset: int = Query(0, ge=0, description="Number of logs to skip; ignored with a cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(AuthService(get_db()).get_current_user)
 ):
@@ -35,12 +40,16 @@ async def get_audit_logs(
         action=action,
         resource_type=resource_type,
         limit=limit,
-        offset=offset
+        offset=offset,
+        since=since,
+        until=until,
+        cursor=cursor
     )
     
     return {
         "logs": [log.to_dict() for log in logs],
-        "total": len(logs)
+        "total": len(logs),
+        "next_cursor": next_cursor(logs, limit)
     }
 
 
@@ -48,8 +57,11 @@ async def get_audit_logs(
 async def get_my_audit_logs(
     action: Optional[str] = Query(None, description="Filter by action"),
     resource_type: Optional[str] = Query(None, description="Filter by resource type"),
+    since: Optional[datetime] = Query(None, description="Only logs created at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only logs created before this time"),
     limit: int = Query(100, ge=1, le=1000, description="Number of logs to return"),
-    offset: int = Query(0, ge=0, description="Number of logs to skip"),
+    offset: int = Query(0, ge=0, description="Number of logs to skip; ignored with a cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(AuthService(get_db()).get_current_user)
 ):
@@ -60,10 +72,14 @@ async def get_my_audit_logs(
         action=action,
         resource_type=resource_type,
         limit=limit,
-        offset=offset
+        offset=offset,
+        since=since,
+        until=until,
+        cursor=cursor
     )
     
     return {
         "logs": [log.to_dict() for log in logs],
-        "total": len(logs)
+        "total": len(logs),
+        "next_cursor": next_cursor(logs, limit)
     }
\ No newline at end of file
@@ -1,11 +1,14 @@
 """File upload API endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request, Header
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from pathlib import Path
 
 from backend.shared.database import get_db
-from backend.shared.storage import FileService
+from backend.shared.storage import FileService, MultipartUploadService
+from backend.shared.storage.image_variants import VARIANT_CONTENT_TYPE, VARIANT_FORMAT
 from services.auth_service import AuthService
 
 router = APIRouter(prefix="/files", tags=["files"])
@@ -37,6 +40,100 @@ async def upload_file(
     }
 
 
+@router.post("/uploads", status_code=status.HTTP_201_CREATED)
+async def initiate_multipart_upload(
+    filename: str = Query(..., description="Original file name"),
+    content_type: str = Query(..., description="File content type"),
+    total_size: int = Query(..., gt=0, description="Total file size in bytes"),
+    part_size: int = Query(None, gt=0, description="Part size in bytes"),
+    resource_type: str = Query(None, description="Resource type (e.g., 'product', 'user')"),
+    resource_id: str = Query(None, description="Resource ID"),
+    is_public: bool = Query(False, description="Make file public"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(AuthService(get_db()).get_current_user)
+):
+    """Start a resumable multipart upload."""
+    upload_service = MultipartUploadService(db)
+    session = upload_service.initiate_upload(
+        filename=filename,
+        content_type=content_type,
+        total_size=total_size,
+        user_id=current_user["user_id"],
+        part_size=part_size,
+        resource_type=resource_type,
+        resource_id=resource_id,
+        is_public=is_public
+    )
+    
+    return session.to_dict()
+
+
+@router.get("/uploads/{upload_id}")
+async def get_multipart_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(AuthService(get_db()).get_current_user)
+):
+    """Get an upload session and the parts received so far."""
+    upload_service = MultipartUploadService(db)
+    session = upload_service.get_session(upload_id, current_user["user_id"])
+    
+    return {
+        **session.to_dict(),
+        "parts": upload_service.list_parts(session)
+    }
+
+
+@router.put("/uploads/{upload_id}/parts/{part_number}")
+async def upload_part(
+    upload_id: str,
+    part_number: int,
+    request: Request,
+    checksum: str = Header(..., alias="X-Part-Checksum", description="SHA-256 hex digest of the part"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(AuthService(get_db()).get_current_user)
+):
+    """Upload one part of a multipart upload as the raw request body."""
+    upload_service = MultipartUploadService(db)
+    
+    return await upload_service.upload_part(
+        upload_id=upload_id,
+        part_number=part_number,
+        chunks=request.stream(),
+        checksum=checksum,
+        user_id=current_user["user_id"]
+    )
+
+
+@router.post("/uploads/{upload_id}/complete")
+async def complete_multipart_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(AuthService(get_db()).get_current_user)
+):
+    """Assemble the uploaded parts into the final file."""
+    upload_service = MultipartUploadService(db)
+    file_upload = await upload_service.complete_upload(upload_id, current_user["user_id"])
+    
+    return {
+        "message": "File uploaded successfully",
+        "file": file_upload.to_dict()
+    }
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_multipart_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(AuthService(get_db()).get_current_user)
+):
+    """Abort a multipart upload and discard its parts."""
+    upload_service = MultipartUploadService(db)
+    upload_service.abort_upload(upload_id, current_user["user_id"])
+    
+    return {"message": "Upload aborted"}
+
+
 @router.get("/{file_id}")
 async def get_file(
     file_id: int,
@@ -60,6 +157,7 @@ async def get_file(
 @router.get("/{file_id}/download")
 async def download_file(
     file_id: int,
+    variant: Optional[str] = Query(None, description="Image variant (e.g., 'thumb', 'small', 'webp')"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(AuthService(get_db()).get_current_user)
 ):
@@ -74,16 +172,44 @@ async def download_file(
             detail="Access denied"
         )
     
-    file_path = file_service.get_file_path(file_id)
+    # Serve the variant if it has been generated, otherwise fall back to the original
+    if variant:
+        variant_key = file_service.get_variant_key(file_upload, variant)
+        if variant_key:
+            original_name = Path(file_upload.original_filename).stem
+            return _stored_file_response(
+                file_service,
+                storage_key=variant_key,
+                filename=f"{original_name}_{variant}.{VARIANT_FORMAT}",
+                media_type=VARIANT_CONTENT_TYPE
+            )
     
-    from fastapi.responses import FileResponse
-    return FileResponse(
-        path=file_path,
+    return _stored_file_response(
+        file_service,
+        storage_key=file_upload.file_path,
         filename=file_upload.original_filename,
         media_type=file_upload.content_type
     )
 
 
+def _stored_file_response(file_service: FileService, storage_key: str, filename: str, media_type: str):
+    """Serve a stored file from disk, or stream it from a remote backend."""
+    local_path = file_service.get_local_path(storage_key)
+    if local_path is not None:
+        if not Path(local_path).exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="File not found on disk"
+            )
+        return FileResponse(path=local_path, filename=filename, media_type=media_type)
+    
+    return StreamingResponse(
+        file_service.iter_file(storage_key),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/{file_id}/url")
 async def get_file_url(
     file_id: int,
@@ -1,10 +1,12 @@
 """Users API endpoints."""
 
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from backend.shared.database import get_db
+from backend.shared.utils.fieldsets import parse_fields
+from backend.shared.utils.serialization import list_response
 from schemas.user import (
     UserCreate,
     UserUpdate,
@@ -45,6 +47,7 @@ async def get_users(
     is_verified: bool = Query(None, description="Filter by verified status"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,username,email,role"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(AuthService(get_db()).get_current_user)
 ):
@@ -56,6 +59,7 @@ async def get_users(
             detail="Not enough permissions"
         )
     
+    selected = parse_fields(fields, UserResponse)
     filters = UserFilter(
         email=email,
         username=username,
@@ -67,16 +71,18 @@ async def get_users(
     )
     
     user_service = UserService(db)
-    users, total = user_service.get_users(filters)
+    users, total = user_service.get_users(filters, fields=selected)
     
     pages = (total + size - 1) // size
     
-    return UserListResponse(
-        items=users,
+    return list_response(
+        UserListResponse,
+        users,
         total=total,
         page=page,
         size=size,
-        pages=pages
+        pages=pages,
+        fields=selected
     )
 
 
@@ -3,10 +3,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
+from backend.shared.audit import (
+    run_audit_partition_maintenance,
+    start_audit_writer,
+    stop_audit_writer,
+)
+from backend.shared.compression import setup_compression
 from backend.shared.config import settings
-from backend.shared.database import create_tables
+from backend.shared.monitoring import setup_metrics
+from backend.shared.tracing import setup_tracing
+from backend.shared.profiling import setup_profiling
+from backend.shared.database import create_tables, QueryStatsMiddleware
+from backend.shared.email import start_email_delivery, stop_email_delivery
+from backend.shared.storage.image_variants import shutdown_variant_pool
+from backend.shared.storage.multipart import run_upload_session_gc
 from .app.api.v1 import api_router
 
 # Configure logging
@@ -20,12 +33,22 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting User Service...")
     create_tables()
+    if settings.audit_async_writes:
+        start_audit_writer()
+    start_email_delivery()
+    upload_gc_task = asyncio.create_task(run_upload_session_gc())
+    audit_partition_task = asyncio.create_task(run_audit_partition_maintenance())
     logger.info("User Service started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down User Service...")
+    upload_gc_task.cancel()
+    audit_partition_task.cancel()
+    shutdown_variant_pool()
+    stop_audit_writer()
+    stop_email_delivery()
 
 
 # Create FastAPI application
@@ -45,6 +68,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses with zstd, brotli or gzip, as the client accepts
+setup_compression(app)
+
+# Count queries per request, flagging slow and repeated ones
+app.add_middleware(QueryStatsMiddleware)
+
+# Expose Prometheus metrics at /metrics
+setup_metrics(app)
+
+# Trace requests, calls to other services and SQL statements
+setup_tracing(app)
+
+# Admin-only profiling of live workers at /debug/profile, or on SIGUSR2
+setup_profiling(app)
+
 # Include API routes
 app.include_router(api_router)
 
@@ -1,10 +1,22 @@
 """User schemas for validation and serialization."""
 
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, validator, root_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, ValidationInfo, field_validator
 from datetime import datetime
 import re
 
+# Compiled once here rather than looked up in re's cache on every validation
+NAME_INVALID_CHARS = re.compile(r'[<>"\']')
+NON_DIGITS = re.compile(r'\D')
+PHONE_DIGITS = re.compile(r'^[\+]?[1-9][\d]{0,15}$')
+DANGEROUS_BIO = re.compile(r'<script|javascript:|vbscript:', re.IGNORECASE)
+USERNAME_CHARS = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+ALLOWED_ROLES = {'admin', 'manager', 'customer'}
+RESERVED_USERNAMES = frozenset({'admin', 'root', 'administrator', 'api', 'www', 'mail', 'ftp', 'support', 'help'})
+COMMON_PASSWORDS = frozenset({'password', '123456', '123456789', 'qwerty', 'abc123', 'password123', 'admin', 'letmein'})
+PASSWORD_SPECIAL_CHARS = frozenset('!@#$%^&*()_+-=[]{}|;:,.<>?')
+
 
 class UserBase(BaseModel):
     """Base user schema."""
@@ -16,7 +28,8 @@ class UserBase(BaseModel):
     bio: Optional[str] = Field(None, description="User bio")
     role: str = Field(default="customer", description="User role")
     
-    @validator('full_name')
+    @field_validator('full_name')
+    @classmethod
     def validate_full_name(cls, v):
         """Validate full name format."""
         if v is not None:
@@ -24,25 +37,27 @@ class UserBase(BaseModel):
             if len(v) > 255:
                 raise ValueError('Full name must be less than 255 characters')
             # Check for dangerous characters
-            if re.search(r'[<>"\']', v):
+            if NAME_INVALID_CHARS.search(v):
                 raise ValueError('Full name contains invalid characters')
         return v
     
-    @validator('phone')
+    @field_validator('phone')
+    @classmethod
     def validate_phone(cls, v):
         """Validate phone number format."""
         if v is not None:
             v = v.strip()
             # Remove all non-digit characters for validation
-            digits_only = re.sub(r'\D', '', v)
+            digits_only = NON_DIGITS.sub('', v)
             if len(digits_only) < 10 or len(digits_only) > 15:
                 raise ValueError('Phone number must be between 10 and 15 digits')
             # Check for common patterns
-            if not re.match(r'^[\+]?[1-9][\d]{0,15}$', digits_only):
+            if not PHONE_DIGITS.match(digits_only):
                 raise ValueError('Invalid phone number format')
         return v
     
-    @validator('bio')
+    @field_validator('bio')
+    @classmethod
     def validate_bio(cls, v):
         """Validate bio content."""
         if v is not None:
@@ -50,19 +65,20 @@ class UserBase(BaseModel):
             if len(v) > 1000:
                 raise ValueError('Bio must be less than 1000 characters')
             # Check for dangerous content
-            if re.search(r'<script|javascript:|vbscript:', v, re.IGNORECASE):
+            if DANGEROUS_BIO.search(v):
                 raise ValueError('Bio contains potentially dangerous content')
         return v
     
-    @validator('role')
+    @field_validator('role')
+    @classmethod
     def validate_role(cls, v):
         """Validate user role."""
-        allowed_roles = {'admin', 'manager', 'customer'}
-        if v not in allowed_roles:
-            raise ValueError(f'Role must be one of: {", ".join(allowed_roles)}')
+        if v not in ALLOWED_ROLES:
+            raise ValueError(f'Role must be one of: {", ".join(ALLOWED_ROLES)}')
         return v
     
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def validate_username(cls, v):
         """Validate username format with enhanced security."""
         if not v or len(v.strip()) == 0:
@@ -75,12 +91,11 @@ class UserBase(BaseModel):
             raise ValueError('Username must be less than 50 characters')
         
         # Check for dangerous characters
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
+        if not USERNAME_CHARS.match(v):
             raise ValueError('Username can only contain letters, numbers, hyphens, and underscores')
         
         # Check for reserved usernames
-        reserved_usernames = {'admin', 'root', 'administrator', 'api', 'www', 'mail', 'ftp', 'support', 'help'}
-        if v.lower() in reserved_usernames:
+        if v.lower() in RESERVED_USERNAMES:
             raise ValueError('This username is reserved and cannot be used')
         
         return v.lower()
@@ -91,7 +106,8 @@ class UserCreate(UserBase):
     
     password: str = Field(..., min_length=8, description="Password")
     
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def validate_password(cls, v):
         """Validate password strength with enhanced security."""
         if not v or len(v.strip()) == 0:
@@ -104,8 +120,7 @@ class UserCreate(UserBase):
             raise ValueError('Password must be less than 128 characters')
         
         # Check for common weak passwords
-        common_passwords = {'password', '123456', '123456789', 'qwerty', 'abc123', 'password123', 'admin', 'letmein'}
-        if v.lower() in common_passwords:
+        if v.lower() in COMMON_PASSWORDS:
             raise ValueError('This password is too common and not secure')
         
         # Check for password strength
@@ -115,7 +130,7 @@ class UserCreate(UserBase):
             raise ValueError('Password must contain at least one lowercase letter')
         if not any(c.isdigit() for c in v):
             raise ValueError('Password must contain at least one digit')
-        if not any(c in '!@#$%^&*()_+-=[]{}|;:,.<>?' for c in v):
+        if PASSWORD_SPECIAL_CHARS.isdisjoint(v):
             raise ValueError('Password must contain at least one special character')
         
         # Check for sequential characters
@@ -151,8 +166,7 @@ class UserResponse(UserBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserLogin(BaseModel):
@@ -167,10 +181,11 @@ class UserRegister(UserCreate):
     
     confirm_password: str = Field(..., description="Confirm password")
     
-    @validator('confirm_password')
-    def passwords_match(cls, v, values):
+    @field_validator('confirm_password')
+    @classmethod
+    def passwords_match(cls, v, info: ValidationInfo):
         """Validate password confirmation."""
-        if 'password' in values and v != values['password']:
+        if 'password' in info.data and v != info.data['password']:
             raise ValueError('Passwords do not match')
         return v
 
@@ -226,7 +241,8 @@ class PasswordReset(BaseModel):
     token: str = Field(..., description="Password reset token")
     new_password: str = Field(..., min_length=8, description="New password")
     
-    @validator('new_password')
+    @field_validator('new_password')
+    @classmethod
     def validate_password(cls, v):
         """Validate password strength."""
         if len(v) < 8:
@@ -1,6 +1,6 @@
 """User service business logic."""
 
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 from fastapi import HTTPException, status
@@ -12,6 +12,7 @@ from models.user import User
 from schemas.user import UserCreate, UserUpdate, UserFilter
 from backend.shared.email import EmailService
 from backend.shared.audit import AuditService
+from backend.shared.utils.fieldsets import load_only_fields
 
 # Password hashing context with stronger configuration
 pwd_context = CryptContext(
@@ -65,7 +66,7 @@ class UserService:
         
         # Create new user
         hashed_password = self.get_password_hash(user_data.password)
-        user_dict = user_data.dict(exclude={"password"})
+        user_dict = user_data.model_dump(exclude={"password"})
         user_dict["hashed_password"] = hashed_password
         
         user = User(**user_dict)
@@ -92,9 +93,15 @@ class UserService:
         """Get user by username."""
         return self.db.query(User).filter(User.username == username).first()
     
-    def get_users(self, filters: UserFilter) -> Tuple[List[User], int]:
-        """Get users with filtering and pagination."""
+    def get_users(
+        self,
+        filters: UserFilter,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[User], int]:
+        """Get users with filtering and pagination, loading only ``fields`` if given."""
         query = self.db.query(User)
+        if fields:
+            query = query.options(load_only_fields(User, fields))
         
         # Apply filters with proper parameterization
         if filters.email:
@@ -152,7 +159,7 @@ class UserService:
                 )
         
         # Update fields
-        update_data = user_data.dict(exclude_unset=True)
+        update_data = user_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(user, field, value)
         
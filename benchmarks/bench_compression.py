@@ -0,0 +1,74 @@
+"""Benchmark response compression per coding.
+
+Serves a page of products (100 by default, as our listing endpoints do)
+through an in-process app behind the compression middleware, once per
+Accept-Encoding, and reports bytes on the wire and CPU time per request.
+The identity row is the uncompressed baseline. The generated rows repeat
+much more than real ones, so ratios are higher than in production;
+compare the codings with each other.
+
+Usage:
+    python -m benchmarks.bench_compression --count 2000 --size 100
+    python -m benchmarks.bench_compression --zstd-level 6 --brotli-level 5
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.bench_json_responses import drive, load_rows  # sets up the inventory service path
+from fastapi import FastAPI
+
+from backend.shared.compression import CompressionMiddleware, available_codecs
+from backend.shared.utils.serialization import list_response
+from schemas.product import ProductListResponse
+
+
+def make_app(rows, levels: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items", response_model=ProductListResponse)
+    async def items():
+        return list_response(ProductListResponse, rows, total=len(rows), page=1, size=len(rows), pages=1)
+
+    app.add_middleware(CompressionMiddleware, codecs=available_codecs(levels, ["zstd", "br", "gzip"]))
+    return app
+
+
+def with_encoding(app: FastAPI, coding: str):
+    """Wrap app so every request asks for one coding."""
+    async def wrapped(scope, receive, send):
+        scope = {**scope, "headers": [*scope["headers"], (b"accept-encoding", coding.encode())]}
+        await app(scope, receive, send)
+    return wrapped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2_000, help="Requests per run")
+    parser.add_argument("--size", type=int, default=100, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per coding; the best is kept")
+    parser.add_argument("--zstd-level", type=int, default=3)
+    parser.add_argument("--brotli-level", type=int, default=4)
+    parser.add_argument("--gzip-level", type=int, default=6)
+    args = parser.parse_args()
+
+    levels = {"zstd": args.zstd_level, "br": args.brotli_level, "gzip": args.gzip_level}
+    app = make_app(load_rows(args.size), levels)
+    codings = ["identity", *available_codecs(levels, ["zstd", "br", "gzip"])]
+
+    results = {}
+    for coding in codings:
+        runs = [asyncio.run(drive(with_encoding(app, coding), "/items", args.count)) for _ in range(args.repeat)]
+        results[coding] = min(runs)
+
+    base_cpu, base_size = results["identity"]
+    print(f"{'coding':<10} {'level':>5} {'bytes':>8} {'ratio':>6} {'us CPU/req':>11} {'extra us':>9}")
+    for coding, (cpu, size) in results.items():
+        level = levels.get(coding, "-")
+        per_request = cpu / args.count * 1e6
+        extra = (cpu - base_cpu) / args.count * 1e6
+        print(f"{coding:<10} {level:>5} {size:8d} {base_size / size:5.1f}x {per_request:11.1f} {extra:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark email template rendering.
+
+Compares rendering through the compiled Jinja templates one email at a time
+and through the bulk render path.
+
+Usage:
+    python -m benchmarks.bench_email_templates --count 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.shared.email.templates import (  # noqa: E402
+    EmailTemplates,
+    get_template_environment,
+    render_many,
+)
+
+
+def make_contexts(count: int):
+    """Build per-recipient template contexts."""
+    return [
+        {
+            "user_name": f"User {i}",
+            "verification_url": f"https://example.com/verify-email?token={i:032x}",
+        }
+        for i in range(count)
+    ]
+
+
+def bench(label: str, count: int, func) -> None:
+    """Time a rendering function and print its throughput."""
+    start = time.perf_counter()
+    total_bytes = func()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<28} {elapsed:8.3f}s  {count / elapsed:10.0f} emails/s  "
+        f"{elapsed / count * 1e6:7.1f} us/email  {total_bytes / 1e6:8.1f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Number of emails to render")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    get_template_environment()
+    print(f"Compiled templates in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    contexts = make_contexts(args.count)
+
+    def per_email() -> int:
+        return sum(
+            len(EmailTemplates.get_verification_email_html(**context))
+            + len(EmailTemplates.get_verification_email_text(**context))
+            for context in contexts
+        )
+
+    def bulk() -> int:
+        html = render_many("verification.html", contexts)
+        text = render_many("verification.txt", contexts)
+        return sum(len(h) + len(t) for h, t in zip(html, text))
+
+    print(f"Rendering {args.count} verification emails (HTML + text)")
+    bench("per-email (EmailTemplates)", args.count, per_email)
+    bench("bulk (render_many)", args.count, bulk)
+
+
+if __name__ == "__main__":
+    main()
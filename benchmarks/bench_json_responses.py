@@ -0,0 +1,128 @@
+"""Benchmark list response serialization.
+
+Serves the same page of loaded Product rows through an in-process
+FastAPI app, once validated by the response model as before and once
+through the fast path (projection and orjson), and reports CPU time per
+request. The rows are loaded once up front, so the difference is
+serialization alone.
+
+Usage:
+    python -m benchmarks.bench_json_responses --count 2000 --size 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backend", "inventory-service"))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.shared.utils.serialization import list_response  # noqa: E402
+from models.product import Base, Product  # noqa: E402
+from schemas.product import ProductListResponse  # noqa: E402
+
+
+def load_rows(size: int):
+    """Insert and load a page of products, as a listing query would."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all(
+        Product(
+            name=f"Product {i}",
+            description="A reasonably long product description. " * 5,
+            sku=f"SKU-{i:06d}",
+            price=19.99 + i,
+            cost=9.5,
+            quantity=i,
+            min_quantity=1,
+            max_quantity=500,
+            category="Electronics",
+            brand="Acme",
+            customer_id=str(i % 7),
+        )
+        for i in range(size)
+    )
+    session.commit()
+    return session.query(Product).order_by(Product.id).all()
+
+
+def make_app(rows) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/validated", response_model=ProductListResponse)
+    async def validated():
+        return list_response(ProductListResponse, rows, fast=False, total=len(rows), page=1, size=len(rows), pages=1)
+
+    @app.get("/fast", response_model=ProductListResponse)
+    async def fast():
+        return list_response(ProductListResponse, rows, total=len(rows), page=1, size=len(rows), pages=1)
+
+    return app
+
+
+async def drive(app: FastAPI, path: str, count: int):
+    """Send count GET requests straight to the ASGI app; return CPU seconds and body size."""
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    for _ in range(50):
+        body.clear()
+        await app(scope, receive, send)
+    size = len(body)
+
+    start = time.process_time()
+    for _ in range(count):
+        await app(scope, receive, send)
+    return time.process_time() - start, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2_000, help="Requests per run")
+    parser.add_argument("--size", type=int, default=100, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the best is kept")
+    args = parser.parse_args()
+
+    app = make_app(load_rows(args.size))
+    results = {}
+    for label, path in (("validated", "/validated"), ("fast", "/fast")):
+        runs = [asyncio.run(drive(app, path, args.count)) for _ in range(args.repeat)]
+        best, size = min(runs)
+        results[label] = best
+        print(f"{label:<10} {best / args.count * 1e6:9.1f} us CPU/req  {args.count / best:9.0f} req/s  {size:7d} bytes")
+
+    print(f"{'speedup':<10} {results['validated'] / results['fast']:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
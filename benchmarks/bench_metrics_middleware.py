@@ -0,0 +1,89 @@
+"""Benchmark the overhead of the Prometheus metrics middleware.
+
+Calls the same FastAPI app in-process, without a network or server, with
+and without PrometheusMiddleware, so the difference is the middleware alone.
+
+Usage:
+    python -m benchmarks.bench_metrics_middleware --count 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import FastAPI  # noqa: E402
+
+from backend.shared.monitoring import PrometheusMiddleware  # noqa: E402
+
+
+def make_app(instrumented: bool) -> FastAPI:
+    """Build a small app with a parameterised route."""
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(PrometheusMiddleware, excluded_paths=["/metrics"])
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+async def drive(app: FastAPI, count: int) -> float:
+    """Send count GET requests straight to the ASGI app."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i: int):
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/items/{i % 100}",
+            "raw_path": f"/items/{i % 100}".encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 1234),
+            "server": ("bench", 80),
+        }
+
+    # Warm up routing and metric label children
+    for i in range(200):
+        await app(scope(i), receive, send)
+
+    start = time.perf_counter()
+    for i in range(count):
+        await app(scope(i), receive, send)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000, help="Requests per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant; the best is kept")
+    args = parser.parse_args()
+
+    results = {}
+    for label, instrumented in (("without middleware", False), ("with middleware", True)):
+        app = make_app(instrumented)
+        best = min(asyncio.run(drive(app, args.count)) for _ in range(args.repeat))
+        results[label] = best
+        print(f"{label:<22} {best:8.3f}s  {args.count / best:10.0f} req/s  {best / args.count * 1e6:7.1f} us/req")
+
+    overhead = (results["with middleware"] - results["without middleware"]) / args.count * 1e6
+    print(f"{'overhead':<22} {overhead:7.1f} us/req")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Benchmark request and response schema validation.
+
+Validates a typical payload per schema (request bodies from dicts,
+responses from ORM-like objects) and reports validations per second.
+With ``--baseline REV`` the schema files as of that git revision are
+validated too, side by side, e.g. to compare against the v1-style
+schemas:
+
+Usage:
+    python -m benchmarks.bench_schemas --count 20000
+    python -m benchmarks.bench_schemas --baseline <rev-before-migration>
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import types
+from datetime import datetime
+from types import SimpleNamespace
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SCHEMA_FILES = {
+    "user": "backend/user-service/schemas/user.py",
+    "product": "backend/inventory-service/schemas/product.py",
+    "customer": "backend/crm-service/schemas/customer.py",
+    "notification": "notification-service/schemas/notification.py",
+}
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+USER = {
+    "email": "jane.doe@example.com",
+    "username": "jane_doe",
+    "full_name": "Jane Doe",
+    "phone": "+1 (555) 010-2030",
+    "bio": "Buyer for the north-east stores.",
+    "role": "manager",
+}
+
+PRODUCT = {
+    "name": "Wireless Keyboard",
+    "description": "Compact wireless keyboard with a rechargeable battery.",
+    "sku": "KB-000123",
+    "price": 49.99,
+    "cost": 21.5,
+    "quantity": 140,
+    "min_quantity": 10,
+    "max_quantity": 500,
+    "category": "Electronics",
+    "brand": "Acme",
+    "customer_id": "42",
+}
+
+NOTIFICATION = {"title": "Order shipped", "message": "Your order #1234 is on its way.", "type": "success"}
+
+# schema file, model, build the input, validate from attributes
+CASES = [
+    ("user", "UserCreate", lambda: {**USER, "password": "Str0ng!Passw0rdq"}, False),
+    ("user", "UserResponse", lambda: SimpleNamespace(
+        **USER, id=1, is_active=True, is_verified=True, is_superuser=False, avatar_url=None,
+        last_login=NOW, email_verified_at=NOW, created_at=NOW, updated_at=None,
+    ), True),
+    ("user", "UserFilter", lambda: {"role": "customer", "is_active": True, "page": 3, "size": 50}, False),
+    ("product", "ProductCreate", lambda: dict(PRODUCT), False),
+    ("product", "ProductResponse", lambda: SimpleNamespace(
+        **PRODUCT, id=1, is_active=True, weight=0.7, dimensions="30x10x2", created_at=NOW, updated_at=NOW,
+    ), True),
+    ("product", "ProductFilter", lambda: {"category": "Electronics", "min_price": 10, "max_price": 100}, False),
+    ("customer", "CustomerProductResponse", lambda: SimpleNamespace(
+        **PRODUCT, id=1, is_active=True, weight=0.7, dimensions="30x10x2", created_at=NOW, updated_at=NOW,
+    ), True),
+    ("notification", "NotificationCreate", lambda: {**NOTIFICATION, "user_id": 7}, False),
+    ("notification", "NotificationResponse", lambda: SimpleNamespace(
+        **NOTIFICATION, id=1, user_id=7, is_read=False, created_at=NOW, read_at=None,
+    ), True),
+    ("notification", "NotificationBatchRequest", lambda: {"ids": list(range(1, 101))}, False),
+]
+
+
+def load_schemas(revision: str = None) -> dict:
+    """Load each schema file (as of a git revision if given) as a module.
+
+    Files are executed by path rather than imported, since every service
+    has its own top-level ``schemas`` package. A file that fails to load
+    maps to the error instead.
+    """
+    modules = {}
+    for name, path in SCHEMA_FILES.items():
+        if revision:
+            source = subprocess.run(
+                ["git", "show", f"{revision}:{path}"], cwd=ROOT, capture_output=True, text=True, check=True
+            ).stdout
+        else:
+            with open(os.path.join(ROOT, path)) as f:
+                source = f.read()
+        module = types.ModuleType(f"bench_schemas_{name}_{revision or 'tree'}")
+        sys.modules[module.__name__] = module
+        try:
+            exec(compile(source, path, "exec"), module.__dict__)
+        except Exception as exc:
+            modules[name] = exc
+        else:
+            modules[name] = module
+    return modules
+
+
+def run(model, payloads, from_attributes: bool) -> float:
+    """Validate every payload once; return the elapsed seconds."""
+    validate = model.model_validate
+    start = time.perf_counter()
+    if from_attributes:
+        for payload in payloads:
+            validate(payload, from_attributes=True)
+    else:
+        for payload in payloads:
+            validate(payload)
+    return time.perf_counter() - start
+
+
+def bench(models, build, from_attributes: bool, count: int, repeat: int) -> list:
+    """Return the best validations per second of each model.
+
+    Runs of the models alternate, so drift in machine load hits them alike.
+    """
+    payloads = [build() for _ in range(count)]
+    best = [float("inf")] * len(models)
+    for _ in range(repeat):
+        for index, model in enumerate(models):
+            best[index] = min(best[index], run(model, payloads, from_attributes))
+    return [count / elapsed for elapsed in best]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000, help="Validations per run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per schema; the best is kept")
+    parser.add_argument("--baseline", metavar="REV", help="Also validate the schemas as of this git revision")
+    args = parser.parse_args()
+
+    current = load_schemas()
+    baseline = load_schemas(args.baseline) if args.baseline else None
+
+    header = f"{'schema':<26} {'current/s':>11}"
+    if baseline:
+        header += f" {'baseline/s':>11} {'speedup':>8}"
+    print(header)
+
+    for module_name, model_name, build, from_attributes in CASES:
+        models = [getattr(current[module_name], model_name)]
+        failed = baseline[module_name] if baseline and isinstance(baseline[module_name], Exception) else None
+        if baseline and not failed:
+            models.append(getattr(baseline[module_name], model_name))
+        rates = bench(models, build, from_attributes, args.count, args.repeat)
+        line = f"{model_name:<26} {rates[0]:11.0f}"
+        if failed:
+            line += f" {'n/a':>11}  ({type(failed).__name__}: {str(failed).splitlines()[0]})"
+        elif baseline:
+            line += f" {rates[1]:11.0f} {rates[0] / rates[1]:7.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Synthetic data for scale testing.
+
+Fills users, products, notifications, audit_logs and file_uploads with
+millions of rows shaped like production data: a few customers own most
+products and receive most notifications, categories and actions follow a
+Zipf distribution, and ``created_at`` spreads over a period with more rows
+recently and more during working hours. Postgres is loaded with COPY and
+other databases with batched inserts.
+
+The target tables must already exist (run the migrations first). Rows
+are appended after the current highest id; ``--truncate`` empties the
+tables first.
+
+Usage:
+    python -m benchmarks.datagen --scale 1
+    python -m benchmarks.datagen --tables notifications --rows notifications=5000000
+    DATABASE_URL=postgresql://... python -m benchmarks.datagen --scale 5 --truncate
+"""
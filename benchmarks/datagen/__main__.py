@@ -0,0 +1,161 @@
+"""Command line for the data generator; see the package docstring for usage."""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+from benchmarks.datagen.distributions import TimeSpread  # noqa: E402
+from benchmarks.datagen.tables import ROWS_PER_SCALE, TABLES, Context, generate, hash_password  # noqa: E402
+from benchmarks.datagen.writers import create_writer  # noqa: E402
+
+
+def parse_rows(values) -> Dict[str, int]:
+    rows = {}
+    for value in values or []:
+        table, _, count = value.partition("=")
+        if table not in ROWS_PER_SCALE or not count.isdigit():
+            raise argparse.ArgumentTypeError(f"Expected TABLE=COUNT with TABLE one of {', '.join(TABLES)}: {value}")
+        rows[table] = int(count)
+    return rows
+
+
+def run(args) -> int:
+    from sqlalchemy import create_engine
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    writer = create_writer(engine)
+    rows = {table: int(count * args.scale) for table, count in ROWS_PER_SCALE.items()}
+    rows.update(parse_rows(args.rows))
+    tables = [table for table in TABLES if table in (args.tables or TABLES)]
+
+    missing = [table for table in tables if not writer.has_table(table)]
+    for table in missing:
+        print(f"Skipping {table}: no such table", file=sys.stderr)
+    tables = [table for table in tables if table not in missing]
+    if args.truncate:
+        writer.truncate(tables)
+
+    now = datetime.now(timezone.utc)
+    ctx = Context(times=TimeSpread(args.days, now))
+    totals = {"rows": 0, "load": 0.0, "indexes": 0.0}
+    print(f"{'table':<15} {'rows':>12} {'load s':>8} {'rows/s':>10} {'indexes s':>10}")
+    try:
+        for table in tables:
+            start_id = writer.next_id(table)
+            if table == "users":
+                ctx.password_hash = hash_password()
+            elif ctx.owners is None:
+                _set_owners(ctx, writer, rows["users"], args.random_seed)
+            if table in ("audit_logs", "file_uploads") and not ctx.product_ids and writer.has_table("products"):
+                ctx.product_ids = range(1, writer.next_id("products"))
+
+            writer.prepare(table, now - timedelta(days=args.days + 1), now)
+            indexes = [] if args.keep_indexes else writer.drop_indexes(table)
+            columns = None
+            written = 0
+            start = time.perf_counter()
+            try:
+                batches = generate(
+                    ctx, table, start_id, rows[table],
+                    batch_size=args.batch_size,
+                    random_seed=args.random_seed,
+                    workers=args.workers,
+                )
+                for batch in batches:
+                    if columns is None:
+                        existing = set(writer.columns(table))
+                        columns = [column for column in batch if column in existing]
+                    written += writer.write(table, columns, batch)
+                writer.finish(table)
+            except BaseException:
+                writer.connection.rollback()
+                raise
+            finally:
+                loaded = time.perf_counter()
+                writer.create_indexes(indexes)
+            load_seconds, index_seconds = loaded - start, time.perf_counter() - loaded
+
+            if table == "users":
+                _set_owners(ctx, writer, rows["users"], args.random_seed)
+            elif table == "products":
+                ctx.product_ids = range(1, start_id + written)
+            elif table == "notifications" and writer.has_table("notification_counters"):
+                _rebuild_counters(writer)
+
+            totals["rows"] += written
+            totals["load"] += load_seconds
+            totals["indexes"] += index_seconds
+            _report(table, written, load_seconds, index_seconds)
+    finally:
+        writer.close()
+
+    _report("total", totals["rows"], totals["load"], totals["indexes"])
+    return 0
+
+
+def _report(table: str, rows: int, load_seconds: float, index_seconds: float) -> None:
+    """Print a table's row count and rate; the rate covers generating and loading, not indexing."""
+    rate = rows / load_seconds if load_seconds else 0.0
+    print(f"{table:<15} {rows:>12,} {load_seconds:>8.1f} {rate:>10,.0f} {index_seconds:>10.1f}")
+
+
+def _set_owners(ctx: Context, writer, user_count: int, random_seed: int) -> None:
+    """Own rows by the users in the database, or by made-up ids without a users table."""
+    if writer.has_table("users"):
+        ids = writer.ids("users")
+    else:
+        ids = list(range(1, user_count + 1))
+    if not ids:
+        raise SystemExit("No users to own the generated rows; generate users first")
+    # Shuffle so the most active users aren't simply the oldest
+    random.Random(random_seed).shuffle(ids)
+    ctx.set_owners(ids)
+
+
+def _rebuild_counters(writer) -> None:
+    """Recompute unread counts, as the notification service keeps them incrementally."""
+    writer.execute("DELETE FROM notification_counters")
+    writer.execute(
+        "INSERT INTO notification_counters (user_id, unread_count) "
+        "SELECT user_id, count(*) FROM notifications WHERE NOT is_read GROUP BY user_id"
+    )
+    writer.connection.commit()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.datagen", description="Generate synthetic data")
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="1 = 10k users, 100k products and file uploads, 1M notifications and audit logs",
+    )
+    parser.add_argument("--rows", action="append", metavar="TABLE=COUNT", help="Override a table's row count")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, help="Only generate these tables")
+    parser.add_argument("--days", type=float, default=365, help="Spread created_at over this many days")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per COPY or executemany")
+    parser.add_argument(
+        "--workers", type=int, default=max((os.cpu_count() or 1) - 1, 1),
+        help="Processes generating rows while the main one writes; 1 generates in-process",
+    )
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true", help="Empty the tables first")
+    parser.add_argument(
+        "--keep-indexes", action="store_true",
+        help="Update indexes row by row instead of rebuilding them; faster for small additions to big tables",
+    )
+    args = parser.parse_args()
+    try:
+        parse_rows(args.rows)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Random distributions that make generated data look like production data."""
+
+import math
+import random
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Relative activity per hour of the day (UTC), peaking in working hours
+HOURLY_WEIGHTS = [
+    2, 1, 1, 1, 1, 2, 4, 7, 10, 12, 12, 11,
+    10, 11, 12, 12, 11, 9, 7, 6, 5, 4, 3, 2,
+]
+
+
+class Zipf:
+    """Draw from a population where the k-th item has weight 1 / k ** s.
+
+    The order of the population is the popularity order, so shuffle it
+    first when popularity shouldn't follow it (e.g. user ids).
+    """
+
+    def __init__(self, population: Sequence[T], s: float = 1.1):
+        if not population:
+            raise ValueError("Zipf needs a non-empty population")
+        self.population = list(population)
+        self.cum_weights = list(accumulate(1 / (rank ** s) for rank in range(1, len(self.population) + 1)))
+
+    def sample(self, rng: random.Random, k: int) -> List[T]:
+        return rng.choices(self.population, cum_weights=self.cum_weights, k=k)
+
+
+class Weighted:
+    """Draw from a fixed set of values with given relative weights."""
+
+    def __init__(self, weights: dict):
+        self.population = list(weights)
+        self.cum_weights = list(accumulate(weights.values()))
+
+    def sample(self, rng: random.Random, k: int) -> List:
+        return rng.choices(self.population, cum_weights=self.cum_weights, k=k)
+
+
+class TimeSpread:
+    """Timestamps over the last ``days`` days, as UTC epoch seconds.
+
+    The rate grows linearly from zero at the start of the period to its
+    peak now, as for a growing product, and follows HOURLY_WEIGHTS within
+    each day.
+    """
+
+    def __init__(self, days: float, now: datetime = None):
+        self.days = days
+        self.now = (now or datetime.now(timezone.utc)).timestamp()
+        self._midnight = self.now - self.now % 86400
+        self._hours = Weighted(dict(enumerate(HOURLY_WEIGHTS)))
+        self._prefixes: Dict[int, str] = {}
+
+    def sample(self, rng: random.Random, k: int) -> List[float]:
+        random_ = rng.random
+        hours = self._hours.sample(rng, k)
+        midnight, now, days = self._midnight, self.now, self.days
+        values = []
+        for hour in hours:
+            # Inverse CDF of a density rising linearly towards now
+            value = midnight - int(days * (1 - math.sqrt(random_()))) * 86400 + (hour + random_()) * 3600
+            values.append(value if value <= now else value - 86400)
+        return values
+
+    def format(self, values: List[Optional[float]]) -> List[Optional[str]]:
+        """Render timestamps as ``YYYY-MM-DD HH:MM:SS.ffffff`` in UTC.
+
+        That's how SQLAlchemy stores datetimes in SQLite, and Postgres
+        reads it in a UTC session. Only the hour is formatted by datetime,
+        once per hour; doing it per value would take longer than drawing it.
+        """
+        prefixes = self._prefixes
+        formatted = []
+        for value in values:
+            if value is None:
+                formatted.append(None)
+                continue
+            hour, micros = divmod(int(value * 1_000_000), 3_600_000_000)
+            prefix = prefixes.get(hour)
+            if prefix is None:
+                prefix = prefixes[hour] = datetime.fromtimestamp(hour * 3600, timezone.utc).strftime("%Y-%m-%d %H:")
+            minute, micros = divmod(micros, 60_000_000)
+            second, micros = divmod(micros, 1_000_000)
+            formatted.append(f"{prefix}{minute:02d}:{second:02d}.{micros:06d}")
+        return formatted
+
+
+def lognormal(rng: random.Random, mu: float, sigma: float, k: int) -> List[float]:
+    """Draw k values whose logarithm is normally distributed, like prices and file sizes."""
+    draw = rng.lognormvariate
+    return [draw(mu, sigma) for _ in range(k)]
+
+
+def chance(rng: random.Random, p: float, k: int) -> List[bool]:
+    """Draw k booleans that are each true with probability p."""
+    random_ = rng.random
+    return [random_() < p for _ in range(k)]
@@ -0,0 +1,273 @@
+"""Row generators for each table.
+
+Each generator returns a batch as ``{column: [values]}``, so columns are
+drawn in bulk and a writer can drop the ones a database doesn't have.
+"""
+
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+from benchmarks.load.seed import BENCH_PASSWORD, BRANDS, CATEGORIES
+
+from .distributions import TimeSpread, Weighted, Zipf, chance, lognormal
+
+DATAGEN_EMAIL_DOMAIN = "datagen.alifrzngn.dev"
+
+Batch = Dict[str, List]
+
+# Rows per unit of --scale
+ROWS_PER_SCALE = {
+    "users": 10_000,
+    "products": 100_000,
+    "notifications": 1_000_000,
+    "audit_logs": 1_000_000,
+    "file_uploads": 100_000,
+}
+
+# Dependency order: owners are generated before what they own
+TABLES = list(ROWS_PER_SCALE)
+
+ADJECTIVES = ["Pro", "Lite", "Max", "Mini", "Plus", "Classic", "Ultra", "Eco", "Smart", "Compact"]
+
+NOTIFICATION_TYPES = {"info": 70, "success": 15, "warning": 10, "error": 5}
+NOTIFICATION_TEXTS = [
+    ("Order shipped", "Your order has been shipped and will arrive soon."),
+    ("Order delivered", "Your order has been delivered."),
+    ("Low stock", "A product you follow is running low on stock."),
+    ("Price drop", "A product on your wishlist is now cheaper."),
+    ("Password changed", "Your password was changed. Contact support if this wasn't you."),
+    ("Invoice available", "Your monthly invoice is ready to download."),
+    ("Welcome", "Welcome aboard! Complete your profile to get started."),
+    ("Payment failed", "We couldn't process your last payment."),
+]
+
+AUDIT_ACTIONS = ["read", "update", "login", "create", "export", "logout", "delete", "password_change"]
+AUDIT_RESOURCES = {"product": 50, "user": 20, "auth": 15, "file": 10, "notification": 5}
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 Version/17.4 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0",
+    "python-httpx/0.27.0",
+]
+
+CONTENT_TYPES = {
+    ("image/jpeg", ".jpg", 11.5): 45,
+    ("image/png", ".png", 11.0): 25,
+    ("application/pdf", ".pdf", 12.0): 20,
+    ("text/csv", ".csv", 10.0): 7,
+    ("video/mp4", ".mp4", 16.0): 3,
+}
+
+ROLE_CHOICE = Weighted({"customer": 97, "manager": 3})
+CATEGORY_CHOICE = Zipf(CATEGORIES)
+BRAND_CHOICE = Zipf(BRANDS)
+ADJECTIVE_CHOICE = Zipf(ADJECTIVES, s=0.5)
+NOTIFICATION_TYPE_CHOICE = Weighted(NOTIFICATION_TYPES)
+NOTIFICATION_TEXT_CHOICE = Zipf(NOTIFICATION_TEXTS)
+AUDIT_ACTION_CHOICE = Zipf(AUDIT_ACTIONS)
+AUDIT_RESOURCE_CHOICE = Weighted(AUDIT_RESOURCES)
+USER_AGENT_CHOICE = Zipf(USER_AGENTS)
+CONTENT_TYPE_CHOICE = Weighted(CONTENT_TYPES)
+
+
+@dataclass
+class Context:
+    """State shared by the generators of one run."""
+
+    times: TimeSpread
+    owners: Optional[Zipf] = None
+    product_ids: range = range(0)
+    password_hash: str = ""
+
+    def set_owners(self, user_ids: List[int]) -> None:
+        """Have the first users own and do the most."""
+        self.owners = Zipf(user_ids, s=0.8)
+
+
+def users(ctx: Context, ids: range, rng: random.Random) -> Batch:
+    """Mostly verified customers, a few managers; everyone shares BENCH_PASSWORD."""
+    n = len(ids)
+    created = ctx.times.sample(rng, n)
+    active = chance(rng, 0.97, n)
+    logged_in = chance(rng, 0.6, n)
+    return {
+        "id": list(ids),
+        "email": [f"user-{i}@{DATAGEN_EMAIL_DOMAIN}" for i in ids],
+        "username": [f"user-{i}" for i in ids],
+        "hashed_password": [ctx.password_hash] * n,
+        "full_name": [f"Generated User {i}" for i in ids],
+        "is_active": active,
+        "is_verified": chance(rng, 0.85, n),
+        "is_superuser": [False] * n,
+        "role": ROLE_CHOICE.sample(rng, n),
+        "created_at": ctx.times.format(created),
+        "last_login": ctx.times.format([
+            created_at + (ctx.times.now - created_at) * rng.random() if logged_in[j] else None
+            for j, created_at in enumerate(created)
+        ]),
+    }
+
+
+def products(ctx: Context, ids: range, rng: random.Random) -> Batch:
+    """Zipfian categories and brands; one in ten products has no owner."""
+    n = len(ids)
+    category = CATEGORY_CHOICE.sample(rng, n)
+    brand = BRAND_CHOICE.sample(rng, n)
+    prices = [round(price, 2) for price in lognormal(rng, 4, 1, n)]
+    owned = chance(rng, 0.9, n)
+    owners = ctx.owners.sample(rng, n)
+    return {
+        "id": list(ids),
+        "name": [f"{b} {c} {a} {i}" for b, c, a, i in zip(brand, category, ADJECTIVE_CHOICE.sample(rng, n), ids)],
+        "description": [f"Generated product {i}" for i in ids],
+        "sku": [f"DG-{i:09d}" for i in ids],
+        "price": prices,
+        "cost": [round(price * rng.uniform(0.4, 0.8), 2) for price in prices],
+        "quantity": [int(rng.expovariate(1 / 80)) for _ in ids],
+        "min_quantity": [10] * n,
+        "max_quantity": [1000] * n,
+        "is_active": chance(rng, 0.95, n),
+        "category": category,
+        "brand": brand,
+        "customer_id": [str(owner) if owned[j] else None for j, owner in enumerate(owners)],
+        "created_at": ctx.times.format(ctx.times.sample(rng, n)),
+    }
+
+
+def notifications(ctx: Context, ids: range, rng: random.Random) -> Batch:
+    """Active users get most notifications; older ones are more likely read."""
+    n = len(ids)
+    now = ctx.times.now
+    week_ago = now - 7 * 86400
+    created = ctx.times.sample(rng, n)
+    text = NOTIFICATION_TEXT_CHOICE.sample(rng, n)
+    is_read = [rng.random() < (0.9 if created_at < week_ago else 0.4) for created_at in created]
+    return {
+        "id": list(ids),
+        "user_id": ctx.owners.sample(rng, n),
+        "title": [title for title, _ in text],
+        "message": [message for _, message in text],
+        "type": NOTIFICATION_TYPE_CHOICE.sample(rng, n),
+        "is_read": is_read,
+        "created_at": ctx.times.format(created),
+        "read_at": ctx.times.format([
+            min(created_at + rng.expovariate(1 / 7200), now) if is_read[j] else None
+            for j, created_at in enumerate(created)
+        ]),
+    }
+
+
+def audit_logs(ctx: Context, ids: range, rng: random.Random) -> Batch:
+    """Zipfian actions by mostly active users, each from a handful of addresses."""
+    n = len(ids)
+    random_, getrandbits = rng.random, rng.getrandbits
+    # Products are the bulk of the resources; others get ids in a similar range
+    resource_ids = ctx.product_ids or range(1, 100_001)
+    users_ = ctx.owners.sample(rng, n)
+    action = AUDIT_ACTION_CHOICE.sample(rng, n)
+    resource = AUDIT_RESOURCE_CHOICE.sample(rng, n)
+    return {
+        "id": list(ids),
+        "user_id": [str(user_id) for user_id in users_],
+        "action": action,
+        "resource_type": resource,
+        "resource_id": [
+            str(resource_ids[int(random_() * len(resource_ids))]) if r != "auth" else None for r in resource
+        ],
+        "details": [f"{a} {r}" for a, r in zip(action, resource)],
+        # Formatted directly; json.dumps per row costs more than the rest of the row
+        "metadata": [f'{{"request_id": "{getrandbits(64):016x}"}}' for _ in ids],
+        # A user's address comes from a small, stable set
+        "ip_address": [f"10.{u % 256}.{(u >> 8) % 256}.{1 + getrandbits(2)}" for u in users_],
+        "user_agent": USER_AGENT_CHOICE.sample(rng, n),
+        "created_at": ctx.times.format(ctx.times.sample(rng, n)),
+    }
+
+
+def file_uploads(ctx: Context, ids: range, rng: random.Random) -> Batch:
+    """Mostly images and PDFs with log-normal sizes; a third belong to a product."""
+    n = len(ids)
+    kind = CONTENT_TYPE_CHOICE.sample(rng, n)
+    created = ctx.times.format(ctx.times.sample(rng, n))
+    names = [f"{rng.getrandbits(128):032x}{extension}" for _, extension, _ in kind]
+    attached = chance(rng, 0.33, n) if ctx.product_ids else [False] * n
+    return {
+        "id": list(ids),
+        "filename": names,
+        "original_filename": [f"upload-{i}{extension}" for i, (_, extension, _) in zip(ids, kind)],
+        "file_path": [f"uploads/{c[:4]}/{c[5:7]}/{name}" for c, name in zip(created, names)],
+        "file_size": [int(rng.lognormvariate(mu, 1)) + 1 for _, _, mu in kind],
+        "content_type": [content_type for content_type, _, _ in kind],
+        "user_id": [str(owner) for owner in ctx.owners.sample(rng, n)],
+        "resource_type": ["product" if a else None for a in attached],
+        "resource_id": [str(rng.choice(ctx.product_ids)) if a else None for a in attached],
+        "is_public": ["true" if public else "false" for public in chance(rng, 0.2, n)],
+        "created_at": created,
+    }
+
+
+GENERATORS: Dict[str, Callable[[Context, range, random.Random], Batch]] = {
+    "users": users,
+    "products": products,
+    "notifications": notifications,
+    "audit_logs": audit_logs,
+    "file_uploads": file_uploads,
+}
+
+
+def generate(
+    ctx: Context,
+    table: str,
+    start_id: int,
+    count: int,
+    batch_size: int = 50_000,
+    random_seed: int = 42,
+    workers: int = 1
+) -> Iterator[Batch]:
+    """Yield batches of rows with ids from start_id, in order.
+
+    Each batch draws from its own seeded generator, so the data doesn't
+    depend on the number of workers. With more than one, batches are
+    generated in worker processes while the caller writes earlier ones;
+    only a few are kept in flight to bound memory.
+    """
+    batches = [
+        (range(first, min(first + batch_size, start_id + count)), f"{random_seed}:{table}:{index}")
+        for index, first in enumerate(range(start_id, start_id + count, batch_size))
+    ]
+    if workers <= 1:
+        for ids, seed in batches:
+            yield GENERATORS[table](ctx, ids, random.Random(seed))
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(ctx,)) as pool:
+        pending = deque()
+        for ids, seed in batches:
+            pending.append(pool.submit(_generate_batch, table, ids, seed))
+            if len(pending) > workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+_worker_context: Optional[Context] = None
+
+
+def _init_worker(ctx: Context) -> None:
+    global _worker_context
+    _worker_context = ctx
+
+
+def _generate_batch(table: str, ids: range, seed: str) -> Batch:
+    return GENERATORS[table](_worker_context, ids, random.Random(seed))
+
+
+def hash_password(password: Optional[str] = None) -> str:
+    """Hash the shared password once; bcrypt per row would dominate the run."""
+    import bcrypt
+
+    return bcrypt.hashpw((password or BENCH_PASSWORD).encode(), bcrypt.gensalt(12)).decode()
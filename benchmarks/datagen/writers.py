@@ -0,0 +1,219 @@
+"""Bulk loading: COPY on Postgres, batched executemany elsewhere.
+
+Both go through the raw DB-API connection; SQLAlchemy's per-row
+parameter processing would cost more than generating the rows.
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import List, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+
+from .tables import Batch
+
+
+class Writer:
+    """Append generated batches to existing tables over one connection."""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.inspector = sa.inspect(engine)
+        self.connection = engine.raw_connection()
+
+    def has_table(self, table: str) -> bool:
+        return self.inspector.has_table(table)
+
+    def columns(self, table: str) -> List[str]:
+        return [column["name"] for column in self.inspector.get_columns(table)]
+
+    def scalar(self, sql: str):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql)
+            return cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+    def execute(self, sql: str) -> None:
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+    def next_id(self, table: str) -> int:
+        return (self.scalar(f"SELECT max(id) FROM {table}") or 0) + 1
+
+    def truncate(self, tables: List[str]) -> None:
+        for table in reversed(tables):
+            self.execute(f"DELETE FROM {table}")
+        self.connection.commit()
+
+    def prepare(self, table: str, start: datetime, end: datetime) -> None:
+        """Get a table ready for rows created between start and end."""
+
+    def secondary_indexes(self, table: str) -> List[Tuple[str, str]]:
+        """List (name, CREATE statement) of the indexes that can be rebuilt after loading."""
+        return []
+
+    def drop_indexes(self, table: str) -> List[Tuple[str, str]]:
+        """Drop the secondary indexes; building them once is faster than updating them per row."""
+        indexes = self.secondary_indexes(table)
+        for name, _ in indexes:
+            self.execute(f"DROP INDEX {name}")
+        self.connection.commit()
+        return indexes
+
+    def create_indexes(self, indexes: List[Tuple[str, str]]) -> None:
+        for _, statement in indexes:
+            self.execute(statement)
+        self.connection.commit()
+
+    def write(self, table: str, columns: List[str], batch: Batch) -> int:
+        raise NotImplementedError
+
+    def finish(self, table: str) -> None:
+        self.connection.commit()
+
+    def ids(self, table: str, column: str = "id") -> List[int]:
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SELECT {column} FROM {table}")
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class InsertWriter(Writer):
+    """Batched executemany with the driver's own placeholders."""
+
+    PLACEHOLDERS = {"qmark": "?", "format": "%s", "pyformat": "%s"}
+
+    def __init__(self, engine: Engine):
+        super().__init__(engine)
+        self.placeholder = self.PLACEHOLDERS.get(engine.dialect.paramstyle, "?")
+        self.sqlite = engine.dialect.name == "sqlite"
+        if self.sqlite:
+            # Durability doesn't matter for throwaway data; fsyncs dominate otherwise
+            self.execute("PRAGMA synchronous = OFF")
+            self.execute("PRAGMA cache_size = -262144")
+            # Index rebuilds sort in temporary storage
+            self.execute("PRAGMA temp_store = MEMORY")
+
+    def secondary_indexes(self, table: str) -> List[Tuple[str, str]]:
+        if not self.sqlite:
+            return []
+        cursor = self.connection.cursor()
+        try:
+            # Indexes backing PRIMARY KEY and UNIQUE constraints have no SQL
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            )
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def write(self, table: str, columns: List[str], batch: Batch) -> int:
+        values = [batch[column] for column in columns]
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join([self.placeholder] * len(columns))})"
+        )
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(sql, list(zip(*values)))
+        finally:
+            cursor.close()
+        return len(values[0])
+
+
+class PostgresCopyWriter(Writer):
+    """COPY ... FROM STDIN in CSV format, via psycopg2 or psycopg 3."""
+
+    def __init__(self, engine: Engine):
+        super().__init__(engine)
+        # Generated timestamps are UTC without an offset
+        self.execute("SET TIME ZONE 'UTC'")
+        self.connection.commit()
+
+    def truncate(self, tables: List[str]) -> None:
+        self.execute(f"TRUNCATE {', '.join(tables)}")
+        self.connection.commit()
+
+    def prepare(self, table: str, start: datetime, end: datetime) -> None:
+        # Imported here as backend.shared.audit connects to DATABASE_URL on import
+        from backend.shared.audit.partitions import add_months, month_start, partition_name
+
+        if table != "audit_logs" or not self.scalar(
+            "SELECT count(*) FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs')"
+        ):
+            return
+        # Rows outside every partition would fail the COPY
+        month = month_start(start.date())
+        while month <= end.date():
+            self.execute(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF audit_logs "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            )
+            month = add_months(month, 1)
+        self.connection.commit()
+
+    def secondary_indexes(self, table: str) -> List[Tuple[str, str]]:
+        cursor = self.connection.cursor()
+        try:
+            # Indexes on a partitioned table cascade to its partitions
+            cursor.execute(
+                """
+                SELECT index_class.relname, pg_get_indexdef(pg_index.indexrelid)
+                FROM pg_index
+                JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+                WHERE pg_index.indrelid = to_regclass(%s::text)
+                  AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = pg_index.indexrelid)
+                """,
+                (table,),
+            )
+            # A partitioned index's definition is ON ONLY the parent; without
+            # ONLY it's created on the partitions too
+            return [(name, statement.replace(" ON ONLY ", " ON ", 1)) for name, statement in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def write(self, table: str, columns: List[str], batch: Batch) -> int:
+        buffer = io.StringIO()
+        rows = list(zip(*(batch[column] for column in columns)))
+        # Unquoted empty fields are NULL in COPY's CSV format; None is written as one
+        csv.writer(buffer).writerows(rows)
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
+        cursor = self.connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+            else:
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+        finally:
+            cursor.close()
+        return len(rows)
+
+    def finish(self, table: str) -> None:
+        # Explicit ids don't advance the sequence
+        self.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT coalesce(max(id), 0) + 1 FROM {table}), false)"
+        )
+        super().finish(table)
+
+
+def create_writer(engine: Engine) -> Writer:
+    if engine.dialect.name == "postgresql":
+        return PostgresCopyWriter(engine)
+    return InsertWriter(engine)
@@ -0,0 +1,12 @@
+"""Load tests for the services.
+
+Seeds a scalable data set, drives a service's endpoints with concurrent
+requests, in-process or over HTTP, and compares throughput, latency
+percentiles and queries per request against a stored baseline.
+
+Usage:
+    python -m benchmarks.load seed --scale 1
+    python -m benchmarks.load run --service inventory --duration 10
+    python -m benchmarks.load run --all --save-baseline benchmarks/load/baseline.json
+    python -m benchmarks.load run --all --baseline benchmarks/load/baseline.json
+"""
@@ -0,0 +1,206 @@
+"""Command line for the load tests; see the package docstring for usage."""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+from benchmarks.load.scenarios import SERVICE_PORTS, scenarios_for  # noqa: E402
+
+SERVICES = ["inventory", "user", "crm", "notification"]
+
+
+def cmd_seed(args) -> None:
+    """Seed an already migrated database."""
+    from sqlalchemy import create_engine
+
+    from benchmarks.load.seed import seed
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    start = time.perf_counter()
+    counts = seed(engine, args.scale, args.random_seed)
+    print(f"Seeded {counts} in {time.perf_counter() - start:.1f}s")
+
+
+@contextmanager
+def serve_inventory() -> Iterator[str]:
+    """Run the inventory service on localhost for the CRM service to call."""
+    port = SERVICE_PORTS["inventory"] + 10000
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--app-dir", os.path.join("backend", "inventory-service"),
+            "--port", str(port), "--log-level", "warning",
+        ],
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{url}/health")
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def run_service(args, service: str) -> Dict[str, Dict[str, Any]]:
+    """Run a service's scenarios and summarize each."""
+    from backend.shared.config import settings
+    from backend.shared.database import engine
+    from benchmarks.load.report import summarize
+    from benchmarks.load.runner import http_client, in_process_client, load_service_app, run_scenario
+    from benchmarks.load.seed import load_fixtures, needs_seed, seed
+
+    base_url = args.base_url or (f"http://localhost:{SERVICE_PORTS[service]}" if args.http else None)
+    if base_url:
+        client_context = http_client(base_url, args.concurrency)
+    else:
+        app = load_service_app(service)
+        # Have QueryStatsMiddleware report query counts in Server-Timing
+        settings.debug = True
+        client_context = in_process_client(app)
+
+    summaries = {}
+    async with client_context as client:
+        if not base_url and needs_seed(engine):
+            print(f"Seeding {engine.url.get_backend_name()} at scale {args.scale}...", file=sys.stderr)
+            seed(engine, args.scale, args.random_seed)
+        fixtures = load_fixtures(engine)
+
+        for scenario in scenarios_for(service, args.scenario):
+            result = await run_scenario(
+                client, scenario, fixtures,
+                concurrency=args.concurrency,
+                duration=args.duration,
+                warmup=args.warmup,
+                random_seed=args.random_seed,
+            )
+            summaries[scenario.name] = summarize(result)
+    return summaries
+
+
+def run_all(args) -> Dict[str, Dict[str, Any]]:
+    """Run each service in its own process, as their packages clash."""
+    summaries = {}
+    for service in SERVICES:
+        with tempfile.NamedTemporaryFile(suffix=".json") as output:
+            command = [
+                sys.executable, "-m", "benchmarks.load", "run",
+                "--service", service,
+                "--output", output.name,
+                "--concurrency", str(args.concurrency),
+                "--duration", str(args.duration),
+                "--warmup", str(args.warmup),
+                "--scale", str(args.scale),
+                "--random-seed", str(args.random_seed),
+            ]
+            if args.http:
+                command.append("--http")
+            for name in args.scenario or []:
+                command += ["--scenario", name]
+            if subprocess.run(command).returncode != 0:
+                print(f"{service} benchmarks failed", file=sys.stderr)
+                continue
+            summaries.update(json.loads(output.read()))
+    return summaries
+
+
+def cmd_run(args) -> int:
+    from benchmarks.load.report import compare, format_table, load_baseline, save_baseline
+
+    # Fail before the run rather than after it
+    if args.baseline and not os.path.exists(args.baseline):
+        print(
+            f"No baseline at {args.baseline}; record one with --save-baseline (make bench-baseline)",
+            file=sys.stderr,
+        )
+        return 2
+
+    if args.all:
+        summaries = run_all(args)
+    elif args.service == "crm" and not (args.base_url or args.http or "INVENTORY_SERVICE_URL" in os.environ):
+        with serve_inventory() as inventory_url:
+            os.environ["INVENTORY_SERVICE_URL"] = inventory_url
+            summaries = asyncio.run(run_service(args, args.service))
+    else:
+        summaries = asyncio.run(run_service(args, args.service))
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(summaries, output)
+    if not args.all and args.output:
+        return 0
+
+    print(format_table(summaries))
+    settings = {
+        "scale": args.scale,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "target": "http" if args.http or args.base_url else "in-process",
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+    }
+    if args.save_baseline:
+        save_baseline(args.save_baseline, summaries, settings)
+        print(f"Saved baseline to {args.save_baseline}")
+    if args.baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline["settings"] != settings:
+            print(f"Warning: baseline was recorded with {baseline['settings']}", file=sys.stderr)
+        regressions = compare(summaries, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description="Load tests for the services")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Seed the database named by DATABASE_URL")
+    seed_parser.add_argument("--scale", type=float, default=1.0, help="1 = 1k users, 10k products, 50k notifications")
+    seed_parser.add_argument("--random-seed", type=int, default=42)
+    seed_parser.set_defaults(func=cmd_seed)
+
+    run_parser = commands.add_parser("run", help="Drive the services with concurrent requests")
+    target = run_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--service", choices=SERVICES)
+    target.add_argument("--all", action="store_true", help="Run every service, each in its own process")
+    run_parser.add_argument("--scenario", action="append", help="Only run these scenarios")
+    run_parser.add_argument("--base-url", help="Call a running service instead of loading it in-process")
+    run_parser.add_argument("--http", action="store_true", help="Call services running on their localhost ports")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario")
+    run_parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    run_parser.add_argument("--scale", type=float, default=1.0, help="Data set size when seeding in-process")
+    run_parser.add_argument("--random-seed", type=int, default=42)
+    run_parser.add_argument("--output", help="Write the summaries as JSON")
+    run_parser.add_argument("--save-baseline", help="Store the results as a baseline")
+    run_parser.add_argument("--baseline", help="Compare against a stored baseline; exit 1 on regressions")
+    run_parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed throughput and latency change")
+    run_parser.set_defaults(func=cmd_run)
+
+    args = parser.parse_args()
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
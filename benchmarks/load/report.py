@@ -0,0 +1,109 @@
+"""Summaries of load runs and comparison with a baseline."""
+
+import json
+import math
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .runner import ScenarioResult
+
+# Latency changes smaller than this are noise, whatever the percentage
+LATENCY_FLOOR_MS = 1.0
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def summarize(result: ScenarioResult) -> Dict[str, Any]:
+    """Reduce raw measurements to the numbers that are reported and compared."""
+    latencies = sorted(result.latencies)
+    requests = len(latencies)
+    return {
+        "service": result.service,
+        "concurrency": result.concurrency,
+        "requests": requests,
+        "errors": result.errors,
+        "error_rate": result.errors / requests if requests else 0.0,
+        "throughput": requests / result.duration if result.duration else 0.0,
+        "mean_ms": sum(latencies) / requests * 1000 if requests else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "queries_per_request": sum(result.queries) / len(result.queries) if result.queries else None,
+        "statuses": {str(status): count for status, count in result.statuses.items()},
+    }
+
+
+def format_table(summaries: Dict[str, Dict[str, Any]]) -> str:
+    """Render summaries as a fixed-width table."""
+    lines = [
+        f"{'scenario':<20} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'queries':>8}"
+    ]
+    for name, summary in summaries.items():
+        queries = summary["queries_per_request"]
+        lines.append(
+            f"{name:<20} {summary['throughput']:>9.1f} {summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} "
+            f"{summary['p99_ms']:>9.2f} {summary['error_rate']:>7.1%} "
+            f"{'-' if queries is None else f'{queries:.1f}':>8}"
+        )
+    return "\n".join(lines)
+
+
+def save_baseline(path: str, summaries: Dict[str, Dict[str, Any]], settings: Dict[str, Any]) -> None:
+    """Store summaries, with how they were produced, as the new baseline."""
+    Path(path).write_text(json.dumps({
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "machine": platform.node(),
+        "python": platform.python_version(),
+        "settings": settings,
+        "scenarios": summaries,
+    }, indent=2))
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def compare(
+    summaries: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.1
+) -> List[str]:
+    """List regressions against a baseline.
+
+    Throughput and latency may move by ``tolerance`` (a fraction) before
+    counting; queries per request are deterministic, so any increase is a
+    regression, as is an error rate more than a point higher.
+    """
+    regressions = []
+    for name, current in summaries.items():
+        previous: Optional[Dict[str, Any]] = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+
+        if current["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {current['throughput']:.1f} req/s, baseline {previous['throughput']:.1f}"
+            )
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if current[key] > previous[key] * (1 + tolerance) and current[key] - previous[key] > LATENCY_FLOOR_MS:
+                regressions.append(f"{name}: {key[:3]} {current[key]:.2f} ms, baseline {previous[key]:.2f} ms")
+        if (
+            current["queries_per_request"] is not None
+            and previous["queries_per_request"] is not None
+            and current["queries_per_request"] > previous["queries_per_request"] + 1e-9
+        ):
+            regressions.append(
+                f"{name}: {current['queries_per_request']:.1f} queries per request, "
+                f"baseline {previous['queries_per_request']:.1f}"
+            )
+        if current["error_rate"] > previous["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {current['error_rate']:.1%}, baseline {previous['error_rate']:.1%}")
+    return regressions
@@ -0,0 +1,131 @@
+"""Async load generator."""
+
+import asyncio
+import importlib
+import importlib.util
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List
+
+import httpx
+
+from .scenarios import Scenario
+from .seed import Fixtures
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+@dataclass
+class ScenarioResult:
+    """Raw measurements of one scenario."""
+
+    scenario: str
+    service: str
+    concurrency: int
+    duration: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+
+def load_service_app(service: str):
+    """Import a service's FastAPI app into this process.
+
+    Every service has top-level ``app``, ``models`` and ``services``
+    packages, so only one service can be loaded per process.
+    """
+    service_dir = os.path.join(ROOT, "backend", f"{service}-service")
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, service_dir)
+    package = f"{service}_service"
+    spec = importlib.util.spec_from_file_location(
+        package, os.path.join(service_dir, "__init__.py"), submodule_search_locations=[service_dir]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[package] = module
+    spec.loader.exec_module(module)
+    return importlib.import_module(f"{package}.main").app
+
+
+@asynccontextmanager
+async def in_process_client(app) -> AsyncIterator[httpx.AsyncClient]:
+    """Call an app directly through ASGI, running its lifespan around the client."""
+    async with app.router.lifespan_context(app):
+        # Unhandled exceptions become 500s, as behind a real server
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+            yield client
+
+
+@asynccontextmanager
+async def http_client(base_url: str, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Call a running service over HTTP with one pooled connection per worker."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        yield client
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    fixtures: Fixtures,
+    concurrency: int = 16,
+    duration: float = 10.0,
+    warmup: float = 2.0,
+    random_seed: int = 42
+) -> ScenarioResult:
+    """Keep ``concurrency`` requests in flight for ``warmup + duration`` seconds.
+
+    Each worker sends its next request as soon as the previous one returns
+    (a closed loop), so throughput is what the service sustains at that
+    concurrency. Requests started during the warm-up aren't recorded. The
+    query count comes from the ``Server-Timing`` header the services send
+    in debug mode.
+    """
+    result = ScenarioResult(scenario.name, scenario.service, concurrency)
+    start = time.perf_counter()
+    measure_from = start + warmup
+    end = measure_from + duration
+
+    async def worker(index: int) -> None:
+        rng = random.Random(random_seed + index)
+        while True:
+            request_start = time.perf_counter()
+            if request_start >= end:
+                return
+            request = scenario.build(rng, fixtures)
+            try:
+                response = await client.request(
+                    request.method,
+                    request.path,
+                    params=request.params,
+                    json=request.json,
+                    files=request.files,
+                    headers=request.headers,
+                )
+                status = response.status_code
+                match = _QUERIES_RE.search(response.headers.get("server-timing", ""))
+            except httpx.HTTPError:
+                status, match = "error", None
+            if request_start < measure_from:
+                continue
+
+            result.latencies.append(time.perf_counter() - request_start)
+            result.statuses[status] += 1
+            if status == "error" or status >= 400:
+                result.errors += 1
+            if match:
+                result.queries.append(int(match.group(1)))
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    result.duration = time.perf_counter() - measure_from
+    return result
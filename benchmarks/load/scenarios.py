@@ -0,0 +1,95 @@
+"""The endpoints under load."""
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from .seed import BENCH_PASSWORD, Fixtures
+
+SERVICE_PORTS = {"inventory": 8001, "crm": 8002, "user": 8003, "notification": 8004}
+
+UPLOAD_BODY = b"x" * 4096
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    params: Optional[Dict[str, Any]] = None
+    json: Optional[Dict[str, Any]] = None
+    files: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class Scenario:
+    """One endpoint, called with varying seeded data."""
+
+    name: str
+    service: str
+    build: Callable[[random.Random, Fixtures], Request]
+    description: str = ""
+
+
+@lru_cache(maxsize=None)
+def auth_headers(user_id: int, role: str = "customer") -> Dict[str, str]:
+    """Sign a token locally; the service must share JWT_SECRET_KEY."""
+    from backend.shared.auth import create_access_token
+
+    token = create_access_token({"sub": str(user_id), "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def items_list(rng: random.Random, fixtures: Fixtures) -> Request:
+    pages = max(len(fixtures.product_ids) // 20, 1)
+    return Request("GET", "/api/v1/items/", params={"page": rng.randint(1, min(pages, 50)), "size": 20})
+
+
+def item_detail(rng: random.Random, fixtures: Fixtures) -> Request:
+    return Request("GET", f"/api/v1/items/{rng.choice(fixtures.product_ids)}")
+
+
+def auth_login(rng: random.Random, fixtures: Fixtures) -> Request:
+    user_id = rng.choice(fixtures.customer_ids)
+    return Request("POST", "/api/v1/auth/login", json={"email": fixtures.emails[user_id], "password": BENCH_PASSWORD})
+
+
+def file_upload(rng: random.Random, fixtures: Fixtures) -> Request:
+    return Request(
+        "POST",
+        "/api/v1/files/upload",
+        files={"file": ("bench.txt", UPLOAD_BODY, "text/plain")},
+        headers=auth_headers(rng.choice(fixtures.customer_ids)),
+    )
+
+
+def my_items(rng: random.Random, fixtures: Fixtures) -> Request:
+    return Request("GET", "/api/v1/customers/my-items", headers=auth_headers(rng.choice(fixtures.customer_ids)))
+
+
+def notifications_list(rng: random.Random, fixtures: Fixtures) -> Request:
+    return Request(
+        "GET",
+        "/api/v1/notifications/",
+        params={"size": 20},
+        headers=auth_headers(rng.choice(fixtures.customer_ids)),
+    )
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("items_list", "inventory", items_list, "Paginated product listing"),
+    Scenario("item_detail", "inventory", item_detail, "Product by id"),
+    Scenario("auth_login", "user", auth_login, "Password login (bcrypt bound)"),
+    Scenario("file_upload", "user", file_upload, "4 KB multipart upload"),
+    Scenario("my_items", "crm", my_items, "Customer's products, fetched from inventory"),
+    Scenario("notifications_list", "notification", notifications_list, "First page of the inbox"),
+]
+
+
+def scenarios_for(service: str, names: Optional[List[str]] = None) -> List[Scenario]:
+    """Get a service's scenarios, optionally only those named."""
+    return [
+        scenario for scenario in SCENARIOS
+        if scenario.service == service and (not names or scenario.name in names)
+    ]
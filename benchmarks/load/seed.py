@@ -0,0 +1,231 @@
+"""Seed a benchmark data set, a scaled-up version of migration 0004's sample data."""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+import bcrypt
+import sqlalchemy as sa
+from sqlalchemy.engine import Engine
+
+BENCH_EMAIL_DOMAIN = "bench.alifrzngn.dev"
+BENCH_PASSWORD = "Benchmark123!"
+BENCH_SKU_PREFIX = "BENCH-"
+BENCH_NOTIFICATION_TITLE = "Benchmark notification"
+
+# Rows per unit of --scale
+USERS_PER_SCALE = 1_000
+PRODUCTS_PER_SCALE = 10_000
+NOTIFICATIONS_PER_SCALE = 50_000
+
+INSERT_BATCH_SIZE = 5_000
+
+CATEGORIES = ["Electronics", "Accessories", "Office", "Furniture", "Networking", "Storage", "Audio", "Gaming"]
+BRANDS = ["TechBrand", "OfficePro", "Acme", "Northwind", "Contoso", "Globex"]
+NOTIFICATION_TYPES = ["info", "success", "warning", "error"]
+
+users_table = sa.table(
+    "users",
+    sa.column("id", sa.Integer),
+    sa.column("email", sa.String),
+    sa.column("username", sa.String),
+    sa.column("hashed_password", sa.String),
+    sa.column("full_name", sa.String),
+    sa.column("is_active", sa.Boolean),
+    sa.column("is_verified", sa.Boolean),
+    sa.column("is_superuser", sa.Boolean),
+    sa.column("role", sa.String),
+)
+
+products_table = sa.table(
+    "products",
+    sa.column("id", sa.Integer),
+    sa.column("name", sa.String),
+    sa.column("description", sa.String),
+    sa.column("sku", sa.String),
+    sa.column("price", sa.Float),
+    sa.column("cost", sa.Float),
+    sa.column("quantity", sa.Integer),
+    sa.column("min_quantity", sa.Integer),
+    sa.column("max_quantity", sa.Integer),
+    sa.column("is_active", sa.Boolean),
+    sa.column("category", sa.String),
+    sa.column("brand", sa.String),
+    sa.column("customer_id", sa.String),
+)
+
+notifications_table = sa.table(
+    "notifications",
+    sa.column("id", sa.Integer),
+    sa.column("user_id", sa.Integer),
+    sa.column("title", sa.String),
+    sa.column("message", sa.String),
+    sa.column("type", sa.String),
+    sa.column("is_read", sa.Boolean),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+    sa.column("read_at", sa.DateTime(timezone=True)),
+)
+
+
+@dataclass
+class Fixtures:
+    """What the scenarios need to know about the seeded data."""
+
+    admin_id: int = 0
+    customer_ids: List[int] = field(default_factory=list)
+    emails: Dict[int, str] = field(default_factory=dict)
+    product_ids: List[int] = field(default_factory=list)
+
+
+def _insert(conn, table, rows: List[Dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        conn.execute(table.insert(), rows[start:start + INSERT_BATCH_SIZE])
+
+
+def _users(conn) -> Dict[int, str]:
+    rows = conn.execute(
+        sa.select(users_table.c.id, users_table.c.email)
+        .where(users_table.c.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+        .order_by(users_table.c.id)
+    )
+    return dict(rows.all())
+
+
+def reset(engine: Engine) -> None:
+    """Delete previously seeded benchmark rows, leaving other data alone."""
+    tables = set(sa.inspect(engine).get_table_names())
+    with engine.begin() as conn:
+        if "notifications" in tables:
+            conn.execute(
+                notifications_table.delete().where(notifications_table.c.title.like(f"{BENCH_NOTIFICATION_TITLE} %"))
+            )
+        if "products" in tables:
+            conn.execute(products_table.delete().where(products_table.c.sku.like(f"{BENCH_SKU_PREFIX}%")))
+        if "users" in tables:
+            conn.execute(users_table.delete().where(users_table.c.email.like(f"%@{BENCH_EMAIL_DOMAIN}")))
+
+
+def seed(engine: Engine, scale: float = 1.0, random_seed: int = 42) -> Dict[str, int]:
+    """Replace the benchmark rows with a fresh, deterministic data set.
+
+    Only tables that exist are seeded, so this works against one service's
+    SQLite file as well as the shared, migrated PostgreSQL database. Every
+    user shares BENCH_PASSWORD, hashed once.
+    """
+    rng = random.Random(random_seed)
+    tables = set(sa.inspect(engine).get_table_names())
+    counts = {}
+    reset(engine)
+
+    with engine.begin() as conn:
+        user_count = max(int(USERS_PER_SCALE * scale), 2)
+        if "users" in tables:
+            hashed_password = bcrypt.hashpw(BENCH_PASSWORD.encode(), bcrypt.gensalt(12)).decode()
+            _insert(conn, users_table, [
+                {
+                    "email": f"bench-user-{i}@{BENCH_EMAIL_DOMAIN}",
+                    "username": f"bench-user-{i}",
+                    "hashed_password": hashed_password,
+                    "full_name": f"Benchmark User {i}",
+                    "is_active": True,
+                    "is_verified": True,
+                    "is_superuser": i == 0,
+                    "role": "admin" if i == 0 else "customer",
+                }
+                for i in range(user_count)
+            ])
+            user_ids = list(_users(conn))
+            counts["users"] = len(user_ids)
+        else:
+            # Services without a users table still reference user ids
+            user_ids = list(range(1, user_count + 1))
+        customer_ids = user_ids[1:]
+
+        if "products" in tables:
+            product_count = int(PRODUCTS_PER_SCALE * scale)
+            rows = []
+            for i in range(product_count):
+                price = round(rng.lognormvariate(4, 1), 2)
+                rows.append({
+                    "name": f"{rng.choice(BRANDS)} {rng.choice(CATEGORIES)} {i}",
+                    "description": f"Benchmark product {i}",
+                    "sku": f"{BENCH_SKU_PREFIX}{i:08d}",
+                    "price": price,
+                    "cost": round(price * rng.uniform(0.4, 0.8), 2),
+                    "quantity": rng.randint(0, 500),
+                    "min_quantity": 10,
+                    "max_quantity": 1000,
+                    "is_active": rng.random() > 0.05,
+                    "category": rng.choice(CATEGORIES),
+                    "brand": rng.choice(BRANDS),
+                    "customer_id": str(rng.choice(customer_ids)),
+                })
+            _insert(conn, products_table, rows)
+            counts["products"] = product_count
+
+        if "notifications" in tables:
+            notification_count = int(NOTIFICATIONS_PER_SCALE * scale)
+            now = datetime.now(timezone.utc)
+            rows = []
+            for i in range(notification_count):
+                created_at = now - timedelta(seconds=rng.randint(0, 90 * 24 * 3600))
+                is_read = rng.random() < 0.7
+                rows.append({
+                    "user_id": rng.choice(customer_ids),
+                    "title": f"{BENCH_NOTIFICATION_TITLE} {i}",
+                    "message": "Your order has been shipped and will arrive soon.",
+                    "type": rng.choice(NOTIFICATION_TYPES),
+                    "is_read": is_read,
+                    "created_at": created_at,
+                    "read_at": created_at + timedelta(hours=1) if is_read else None,
+                })
+            _insert(conn, notifications_table, rows)
+            counts["notifications"] = notification_count
+
+    return counts
+
+
+def needs_seed(engine: Engine) -> bool:
+    """Check whether any seedable table lacks benchmark rows."""
+    tables = set(sa.inspect(engine).get_table_names())
+    checks = {
+        "users": users_table.c.email.like(f"%@{BENCH_EMAIL_DOMAIN}"),
+        "products": products_table.c.sku.like(f"{BENCH_SKU_PREFIX}%"),
+        "notifications": notifications_table.c.title.like(f"{BENCH_NOTIFICATION_TITLE} %"),
+    }
+    with engine.connect() as conn:
+        for table, criterion in checks.items():
+            if table in tables and conn.execute(sa.select(sa.literal(1)).where(criterion).limit(1)).first() is None:
+                return True
+    return False
+
+
+def load_fixtures(engine: Engine) -> Fixtures:
+    """Read back the ids of the seeded rows."""
+    tables = set(sa.inspect(engine).get_table_names())
+    fixtures = Fixtures()
+    with engine.connect() as conn:
+        if "users" in tables:
+            fixtures.emails = _users(conn)
+            if fixtures.emails:
+                user_ids = list(fixtures.emails)
+                fixtures.admin_id, fixtures.customer_ids = user_ids[0], user_ids[1:]
+        if "products" in tables:
+            fixtures.product_ids = conn.execute(
+                sa.select(products_table.c.id).where(products_table.c.sku.like(f"{BENCH_SKU_PREFIX}%"))
+            ).scalars().all()
+        if not fixtures.customer_ids:
+            # Without a users table, customers are whoever owns seeded rows
+            owners = set()
+            if "products" in tables:
+                owners.update(int(customer_id) for customer_id in conn.execute(
+                    sa.select(products_table.c.customer_id).where(products_table.c.sku.like(f"{BENCH_SKU_PREFIX}%"))
+                ).scalars())
+            if "notifications" in tables:
+                owners.update(conn.execute(
+                    sa.select(notifications_table.c.user_id)
+                    .where(notifications_table.c.title.like(f"{BENCH_NOTIFICATION_TITLE} %"))
+                ).scalars())
+            fixtures.customer_ids = sorted(owners)
+    return fixtures
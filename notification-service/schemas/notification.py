@@ -1,6 +1,6 @@
 """Notification schemas."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
@@ -10,7 +10,7 @@ class NotificationBase(BaseModel):
     
     title: str = Field(..., min_length=1, max_length=255)
     message: str = Field(..., min_length=1)
-    type: str = Field(default="info", regex="^(info|success|warning|error)$")
+    type: str = Field(default="info", pattern="^(info|success|warning|error)$")
 
 
 class NotificationCreate(NotificationBase):
@@ -19,12 +19,29 @@ class NotificationCreate(NotificationBase):
     user_id: int = Field(..., gt=0)
 
 
+class SystemNotificationCreate(NotificationBase):
+    """Schema for creating a notification for every user."""
+
+
 class NotificationUpdate(BaseModel):
     """Schema for updating a notification."""
     
     is_read: Optional[bool] = None
 
 
+class NotificationBatchRequest(BaseModel):
+    """Schema for acting on several notifications at once."""
+    
+    ids: list[int] = Field(..., min_length=1, max_length=1000)
+
+
+class NotificationPurgeRequest(BaseModel):
+    """Schema for removing notifications older than a date."""
+    
+    before: datetime
+    archive: bool = False
+
+
 class NotificationResponse(NotificationBase):
     """Schema for notification response."""
     
@@ -34,18 +51,18 @@ class NotificationResponse(NotificationBase):
     created_at: datetime
     read_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class NotificationListResponse(BaseModel):
     """Schema for notification list response."""
     
     items: list[NotificationResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class NotificationFilters(BaseModel):
@@ -54,5 +71,7 @@ class NotificationFilters(BaseModel):
     user_id: Optional[int] = None
     type: Optional[str] = None
     is_read: Optional[bool] = None
+    since: Optional[datetime] = None
+    cursor: Optional[str] = None
     page: int = Field(1, ge=1)
     size: int = Field(10, ge=1, le=100)